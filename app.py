@@ -4,6 +4,10 @@ import plotly.graph_objects as go
 import plotly.express as px
 import math
 from eng_module import beams
+from eng_module import checks
+from eng_module import beam_cache
+from eng_module import beam_solver
+from eng_module import influence
 
 
 st.header("Design checks of a simply supported SFRC-RC beam")
@@ -38,7 +42,8 @@ lfactor = st.sidebar.number_input("Live load factor", value=1.6)
 tab1, tab2, tab3, tab4 = st.tabs(["Moment-Curvature", "Beam Analysis", "Moment Check", "Shear Check"])
 
 with tab1:
-    Mphi = SFRC.momentcurvatureSFRC(fc,daggmax, fy, As, rhof, Vf, df, lf, b, h, d)
+    Mphi = SFRC.momentcurvatureSFRC(fc,daggmax, fy, As, rhof, Vf, df, lf, b, d, h)
+    Mphi_curve = SFRC.momentcurvature_curve(fc,daggmax, fy, As, rhof, Vf, df, lf, b, d, h)
 
     st.subheader("Results of calculation")
     st.write(f"The cracking moment is {Mphi[0][0]:.2f} kNm and the curvature at cracking is {Mphi[1][0]:.3e}.")
@@ -46,7 +51,9 @@ with tab1:
     st.write(f"The ultimate moment is {Mphi[0][2]:.2f} kNm the curvature at ultimate is {Mphi[1][2]:.3e}.")
 
     st.subheader("Moment-curvature plot")
-    fig = go.Figure(data=[go.Scatter(x=[0,Mphi[1][0],Mphi[1][1], Mphi[1][2] ], y=[0, Mphi[0][0], Mphi[0][1], Mphi[0][2]])])
+    fig = go.Figure(data=[go.Scatter(x=Mphi_curve["phi"], y=Mphi_curve["M"], mode="lines", name="Moment-curvature"),
+                          go.Scatter(x=[Mphi[1][0],Mphi[1][1], Mphi[1][2]], y=[Mphi[0][0], Mphi[0][1], Mphi[0][2]], 
+                                     mode="markers", name="Cracking, yielding and ultimate")])
     fig.data[0].marker.color = 'Red'
     fig.layout.title.text = "Moment-curvature diagram of SFRC-RC beam"
     fig.layout.width = 900
@@ -93,22 +100,33 @@ with tab2:
     'Case': 'Dead'},
     ]}
 
-    beam_model = beams.build_beam(beam_dict)
-    beam_model.analyze(check_statics=True)   
+    # Dead load results are in N and Nmm, live load results in kN and kNmm
+    # The results are read from the disk cache when the beam was solved before
+    beam_results = beam_cache.solve_beam(beam_dict, {"Factored": {"Dead": dfactor/1000, "Live": lfactor}},
+                                         n_points=1000, cache=beam_cache.BeamCache(".beam_cache"))
 
     # beam_model.Members['SFRC-RC beam'].plot_shear(Direction="Fy", combo_name="Dead", n_points=100)
     # beam_model.Members['SFRC-RC beam'].plot_moment(Direction="Mz", combo_name="Dead", n_points=100)
     # beam_model.Members['SFRC-RC beam'].plot_shear(Direction="Fy", combo_name="Live", n_points=100)
     # beam_model.Members['SFRC-RC beam'].plot_moment(Direction="Mz", combo_name="Live", n_points=100)
 
-    shearres = beams.extract_arrays_all_combos(beam_model, "shear", "Fy", 300)
+    shearres = beam_results.arrays["shear"]
     shearfactored = 1/1000*dfactor*shearres["Dead"][0][1] + lfactor*shearres["Live"][0][1]
-    designshear = max(abs(shearfactored))
     xes = shearres[list(shearres.keys())[0]]
     x_values = xes[0][0]
-    momentres = beams.extract_arrays_all_combos(beam_model, "moment", "Mz", 300)
+    momentres = beam_results.arrays["moment"]
     momentfactored = 1/1000*(1/1000*dfactor*momentres["Dead"][0][1] + lfactor*momentres["Live"][0][1])
-    designmoment = max(abs(momentfactored))
+
+    # The design forces are the exact extrema, also under the point load and at the supports
+    # The factorized stiffness matrix is kept between reruns, and only factorized again when the geometry changes
+    if "beam_analysis" not in st.session_state:
+        st.session_state["beam_analysis"] = beam_solver.BeamAnalysis(beam_dict)
+    solution = st.session_state["beam_analysis"].solve(beam_dict, {"Factored": {"Dead": dfactor/1000, "Live": lfactor}})
+    shear_extrema = solution.extrema("shear")
+    moment_extrema = solution.extrema("moment")
+    idx = shear_extrema.combos.index("Factored")
+    designshear = max(abs(shear_extrema.max[idx]), abs(shear_extrema.min[idx]))
+    designmoment = 1/1000*max(abs(moment_extrema.max[idx]), abs(moment_extrema.min[idx]))
 
     st.subheader("Factored shear diagram")
     fig = go.Figure(data=[go.Scatter(x=x_values, y=shearfactored)])
@@ -146,6 +164,12 @@ with tab2:
 
     st.write("This structural analysis is done with PyNite.")
 
+    st.subheader("Critical position of the point load")
+    # Moment envelope of the factored point load moving over the beam (sagging moments are negative)
+    envelope = influence.moving_load(beam_dict, [-lfactor*load])
+    idx = envelope.min["moment"].argmin()
+    st.write(f"When the factored point load moves along the beam, the largest moment it causes is {-envelope.min['moment'][idx]/1000:.2f} kNm at x = {envelope.sections[idx]:.0f} mm, with the load at {envelope.min_position['moment'][idx]:.0f} mm.")
+
                        
     with tab3:   
         st.subheader("Results of Bending Moment Check")
@@ -199,6 +223,40 @@ with tab2:
         else:
             st.write("Sorry, something has gone wrong here!")
 
+        st.subheader("Shear capacity along the beam")
+        section = SFRC.SFRCSection(fc= fc, daggmax= daggmax, 
+                                   fy = fy, As= As, phibar = phibar, ns = ns, 
+                                   rhof = rhof, Vf = Vf, df = df, lf = lf, 
+                                   b = b, d = d, h = h)
+        diagram = checks.shear_capacity_diagram(beam_results, section, 
+                                                combos=["Factored"], moment_scale=1/1000)
+        fig = go.Figure(data=[go.Scatter(x=diagram.x, y=abs(diagram.V[0]), name="Factored shear demand"),
+                              go.Scatter(x=diagram.x, y=diagram.VCSDT[0], name="Shear capacity")])
+        fig.layout.title.text = "Shear capacity and demand along the SFRC-RC beam"
+        fig.layout.width = 900
+        fig.layout.height = 600
+        fig.layout.xaxis.title = "x (mm)"
+        fig.layout.yaxis.title = "Shear (kN)"
+        fig.update_xaxes(zeroline=True, zerolinewidth=2, zerolinecolor='LightGray', range=[0, None])
+        fig.update_yaxes(zeroline=True, zerolinewidth=2, zerolinecolor='LightGray', range=[0, None])
+        fig.update_layout(
+            plot_bgcolor='white',
+            xaxis_showgrid=True, xaxis_gridcolor='rgb(245, 245, 245)',
+            yaxis_showgrid=True, yaxis_gridcolor='rgb(245, 245, 245)')
+        st.plotly_chart(fig)
+        st.write("The capacity is only shown where the beam is cracked in flexure and the critical shear displacement theory applies.")
+        if diagram.min_ratio == float("inf"):
+            st.write("No point of the beam can be checked with the critical shear displacement theory.")
+        elif diagram.min_ratio >= 1:
+            st.write(f"The smallest capacity/demand ratio is {diagram.min_ratio:.2f} at x = {diagram.min_ratio_x:.0f} mm. The SFRC-RC beam fulfills the requirements for shear where it could be checked.")
+        else:
+            st.write(f"The smallest capacity/demand ratio is {diagram.min_ratio:.2f} at x = {diagram.min_ratio_x:.0f} mm. The SFRC-RC beam does not fulfill the requirements for shear along its length.")
+        if diagram.max_unchecked_V > 0:
+            regions = ", ".join(f"{start:.0f} - {end:.0f} mm" for start, end in diagram.unchecked_regions())
+            st.warning(f"The shear is NOT checked at x = {regions}, where the section is not (or hardly) cracked in flexure, or has failed in flexure. "
+                       f"The shear demand there is up to {diagram.max_unchecked_V:.2f} kN (at x = {diagram.max_unchecked_V_x:.0f} mm), "
+                       f"so these regions have to be checked separately.")
+
         st.subheader("Reference")
         st.write("Lantsoght, E. O. L. (2023). Theoretical model of shear capacity of steel fiber reinforced concrete beams. Engineering Structures. Vol. 280")
 
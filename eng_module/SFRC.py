@@ -1,4 +1,8 @@
 import math
+from dataclasses import dataclass
+from functools import cached_property
+import numpy as np
+import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
@@ -216,4 +220,532 @@ def shearcap (fc: float, daggmax: float,
 
     VCSDT=Vc+VF+Vai+Vd
 
-    return [VCSDT, Vd, Vc, Vai, VF]
\ No newline at end of file
+    return [VCSDT, Vd, Vc, Vai, VF]
+
+
+# Limits and values of the RILEM flexural tensile strength table used in
+# momentcurvatureSFRC, so that the table can be looked up for arrays of fc
+FFCTMFL_LIMITS = np.array([20.5, 25.5, 30.5, 35.5, 40.5, 45.5])
+FFCTMFL_VALUES = np.array([3.7, 4.3, 4.8, 5.3, 5.8, 6.3, 6.8])
+
+MPHI_RESULTS = ["Mcr", "My", "Mult", "phicr", "phiy", "phiult", 
+                "lambdar1", "om", "k1", "k2y", "k3u", "ecr"]
+MPHI_DTYPE = np.dtype([(name, np.float64) for name in MPHI_RESULTS])
+
+
+@dataclass(slots=True)
+class MomentCurvatureResult:
+    """
+    A data type to hold the result of momentcurvatureSFRC for one cross-section.
+    The nested list form of momentcurvatureSFRC is available with to_list.
+    """
+    Mcr: float
+    My: float
+    Mult: float
+    phicr: float
+    phiy: float
+    phiult: float
+    lambdar1: float
+    om: float
+    k1: float
+    k2y: float
+    k3u: float
+    ecr: float
+
+    @classmethod
+    def from_list(cls, Mphi: list) -> "MomentCurvatureResult":
+        """
+        Returns the result for the nested list returned by momentcurvatureSFRC
+        """
+        [[Mcr, My, Mult], [phicr, phiy, phiult], [lambdar1, om], [k1, k2y, k3u], [ecr]] = Mphi
+        return cls(Mcr, My, Mult, phicr, phiy, phiult, lambdar1, om, k1, k2y, k3u, ecr)
+
+    @classmethod
+    def from_record(cls, record: np.ndarray) -> "MomentCurvatureResult":
+        """
+        Returns the result for one element of a MPHI_DTYPE array
+        """
+        return cls(*[float(record[name]) for name in MPHI_RESULTS])
+
+    def to_list(self) -> list:
+        """
+        Returns the result in the nested list form of momentcurvatureSFRC
+        """
+        return [[self.Mcr, self.My, self.Mult], [self.phicr, self.phiy, self.phiult],
+                [self.lambdar1, self.om], [self.k1, self.k2y, self.k3u], [self.ecr]]
+
+
+def _mphi_constants (fc, fy, As, rhof, Vf, df, lf, b, d, h) -> dict[str, np.ndarray]:
+    """
+    Returns the material and cross-sectional constants of the Mobasher/RILEM
+    moment-curvature model as arrays, with the same expressions as 
+    momentcurvatureSFRC
+    """
+    fc, fy, As, rhof, Vf, df, lf, b, d, h = np.broadcast_arrays(
+        *[np.asarray(value, dtype=float) for value in (fc, fy, As, rhof, Vf, df, lf, b, d, h)])
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        #General properties
+        Ec = 57000/12 * fc**(1/2) #MPa, Young's modulus of the concrete
+        ecy = fc / Ec
+        ecu = 0.0035
+        Es = 200000 #MPa
+        rhog = As/(b*h)
+        esy = fy/Es
+
+        # Properties of the steel fibers
+        F = Vf*lf/df*rhof
+        Eten = 9500*fc**(1/3)
+
+        # Determination of tensile strenght of SFRC
+        ffctmfl = FFCTMFL_VALUES[np.searchsorted(FFCTMFL_LIMITS, fc, side="right")]
+        sigma1 = 0.7*ffctmfl*(1.6-d/1000)
+
+        #Determination of size effect factor
+        kh = np.where(h/10 > 12.5, np.where(h/10 < 60, 1-0.6*(h/10-12.5)/47.5, 0.4), 1.)
+
+        #Input for M-phi calculations
+        fcuf = fc/0.82
+        fr4 = 0.63*np.sqrt(fcuf)+0.288*F*np.sqrt(fcuf)+0.052*F
+        sigma2 = 0.45*kh*ffctmfl
+        sigma3 = 0.37*fr4*kh
+        sigmap = 1/2*(sigma2+sigma3)
+
+        ecr = sigma1/Eten
+
+        lambdacu = ecu/ecr
+        mu = sigmap/sigma1
+        om = ecy/ecr
+        alpha = d/h
+        kappa = esy/ecr
+
+        #cracking moment and curvature
+        Mcr = 1/6*b*d**2*Eten*ecr/1000000 #kNm
+        k1 = (18*rhog*alpha+1)/(18*rhog+2)
+        n = Es/Eten
+        elr1 = k1*h/(h-k1*h)*ecr
+        lambdar1 = elr1/ecr
+        phicr = 2*ecr/h
+
+    return {"esy": esy, "rhog": rhog, "ecr": ecr, "lambdacu": lambdacu, "mu": mu, 
+            "om": om, "alpha": alpha, "kappa": kappa, "Mcr": Mcr, "k1": k1, 
+            "n": n, "lambdar1": lambdar1, "phicr": phicr}
+
+
+# Modular ratio of the steel to the concrete in the steel terms of momentcurvatureSFRC
+# (the unyielded neutral axis uses Es/Eten instead)
+STEEL_RATIO = 9
+
+
+def _mphi_cracked (lam, c: dict, continuous: bool = False) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the moment, curvature and neutral-axis factor of the cracked section
+    with elastic concrete in compression, at the normalized compressive strain 
+    'lam' (lambda = ec/ecr). 'c' are the constants from _mphi_constants.
+    The steel is taken as yielded when the steel strain of the yielded solution
+    exceeds esy, as in momentcurvatureSFRC.
+    With 'continuous', the unyielded neutral axis uses the modular ratio 
+    STEEL_RATIO of all other steel terms, so that both solutions meet at yield, 
+    and the steel is yielded when the strain of the unyielded solution exceeds esy.
+    """
+    rhog, alpha, kappa, mu = c["rhog"], c["alpha"], c["kappa"], c["mu"]
+    n = STEEL_RATIO if continuous else c["n"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        B1y = lam**2+2*mu*(lam+1)-1
+        B2y = mu-9*rhog*lam
+        B3y = 9*rhog*(rhog*9*lam**2-2*mu*lam)+mu**2
+        B4y = 2*lam*(9*rhog*kappa+mu)
+        k21y = lam/B1y*(B2y+np.sqrt(B3y+2*alpha*rhog*n*B1y))
+        C5y = 2*lam**3+3*mu*(lam**2-1)+2
+        C6y = 6*lam**2*(9*lam*rhog-mu)
+        C7y = 3*lam**2*(mu-36*rhog*alpha*lam)
+        C8y = 54*rhog*alpha**2*lam**3
+        C9y = -6*lam**2*(9*rhog*kappa+mu)
+        C10y = 3*lam**2*(18*rhog*alpha*kappa+mu)
+        M21 = 1/(lam**2*k21y)*(C5y*k21y**3+C6y*k21y**2+C7y*k21y+C8y)*c["Mcr"]
+        phi21 = lam/(2*k21y)
+        k22y = B4y/B1y
+        M22 = 1/lam**2*(C5y*k22y**2+C9y*k22y+C10y)*c["Mcr"]
+        phi22 = lam/(2*k22y)
+        es2 = (alpha-k22y)/k22y*lam*c["ecr"]
+        if continuous:
+            es2 = (alpha-k21y)/k21y*lam*c["ecr"]
+    steel_yielded = es2 > c["esy"]
+    M = np.where(steel_yielded, M22, M21)
+    k = np.where(steel_yielded, k22y, k21y)
+    phi = np.where(steel_yielded, phi22, phi21)*c["phicr"]
+    return M, phi, k
+
+
+# Normalized compressive yield strain of the concrete used by momentcurvatureSFRC 
+# for the ultimate state (compression zone in the plastic range)
+OMEGA = 10
+
+
+def _mphi_plastic (lam, c: dict, continuous: bool = False) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the moment, curvature and neutral-axis factor of the cracked section
+    with plastic concrete in compression, at the normalized compressive strain 
+    'lam' (lambda = ec/ecr). 'c' are the constants from _mphi_constants.
+    The steel is taken as yielded when the steel strain of the yielded solution
+    exceeds esy, as in momentcurvatureSFRC.
+    With 'continuous', the unyielded neutral axis is solved as in _mphi_cracked 
+    (modular ratio STEEL_RATIO and the full discriminant, so that it meets the 
+    elastic solution at lambda = OMEGA), and the steel is yielded when the 
+    strain of the unyielded solution exceeds esy.
+    """
+    rhog, alpha, kappa, mu = c["rhog"], c["alpha"], c["kappa"], c["mu"]
+    n = STEEL_RATIO if continuous else c["n"]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        B2u = mu-9*rhog*lam
+        B3u = 9*rhog*(rhog*9*lam**2-2*mu*lam)
+        if continuous:
+            B3u = B3u+mu**2
+        B4u = 2*lam*(9*rhog*kappa+mu)
+        B5u = 2*OMEGA*lam-OMEGA**2-1+2*mu*(lam+1)
+        C6u = 6*lam**2*(9*lam*rhog-mu)
+        C7u = 3*lam**2*(mu-36*rhog*alpha*lam)
+        C8u = 54*rhog*alpha**2*lam**3
+        C9u = -6*lam**2*(9*rhog*kappa+mu)
+        C10u = 3*lam**2*(18*rhog*alpha*kappa+mu)
+        C11u = 3*OMEGA*lam**2+3*mu*(lam**2-1)-OMEGA**3+2
+        k31 = lam/B5u*(B2u+np.sqrt(B3u+2*alpha*rhog*n*B5u))
+        k32 = B4u/B5u
+        M31 = 1/(lam**2*k31)*(C11u*k31**3+C6u*k31**2+C7u*k31+C8u)*c["Mcr"]
+        phi31 = lam/(2*k31)
+        M32 = 1/lam**2*(C11u*k32**2+C9u*k32+C10u)*c["Mcr"]
+        phi32 = lam/(2*k32)
+        es3 = (alpha-k32)/k32*lam*c["ecr"]
+        if continuous:
+            es3 = (alpha-k31)/k31*lam*c["ecr"]
+    steel_yielded = es3 > c["esy"]
+    M = np.where(steel_yielded, M32, M31)
+    k = np.where(steel_yielded, k32, k31)
+    phi = np.where(steel_yielded, phi32, phi31)*c["phicr"]
+    return M, phi, k
+
+
+def momentcurvatureSFRC_batch (fc, daggmax, fy, As, rhof, Vf, df, lf, 
+                               b, d, h) -> np.ndarray:
+    """
+    This function is the vectorized version of momentcurvatureSFRC. 
+    All inputs can be floats or NumPy arrays that broadcast against each other, 
+    and the moments, curvatures and neutral-axis factors of all cross-sections
+    are calculated in a single call.
+    The branches of momentcurvatureSFRC (the table for ffctmfl, the size effect 
+    factor kh and the selection between the yielding and ultimate regimes) are 
+    evaluated as masked array operations, so that the results are the same as 
+    the results of the scalar function.
+    Returns a structured array of MPHI_DTYPE (with a field for each of the results 
+    in MPHI_RESULTS) in the shape of the broadcast inputs, which can be sliced, 
+    saved with np.save and read back with memory mapping without copying.
+    Cross-sections for which the scalar function would fail (square root 
+    of a negative number) get NaN as result.
+    """
+    c = _mphi_constants(fc, fy, As, rhof, Vf, df, lf, b, d, h)
+    My, phiy, k2y = _mphi_cracked(c["om"], c)
+    Mult, phiult, k3u = _mphi_plastic(c["lambdacu"], c)
+
+    values = [c["Mcr"], My, Mult, c["phicr"], phiy, phiult, 
+              c["lambdar1"], c["om"], c["k1"], k2y, k3u, c["ecr"]]
+    return _structured(MPHI_DTYPE, values)
+
+
+def _structured(dtype: np.dtype, values: list[np.ndarray]) -> np.ndarray:
+    """
+    Returns a structured array of 'dtype' with the fields filled with 'values'
+    """
+    values = np.broadcast_arrays(*values)
+    results = np.empty(values[0].shape, dtype=dtype)
+    for name, value in zip(dtype.names, values):
+        results[name] = value
+    return results
+
+
+def _yield_lambda (c: dict) -> float:
+    """
+    Returns the normalized compressive strain at which the steel yields, for the 
+    continuous solutions of _mphi_cracked and _mphi_plastic (the strain at which 
+    the neutral axis of the yielded solution gives a steel strain of esy).
+    'c' are the constants from _mphi_constants.
+    Returns infinity when the steel does not yield.
+    """
+    alpha, kappa, mu = c["alpha"], c["kappa"], c["mu"]
+    a = 2*(9*c["rhog"]*kappa+mu)/alpha
+    lam = (a-2*mu)/2+math.sqrt(((a-2*mu)/2)**2-(2*mu-1-a*kappa))
+    if lam > OMEGA:
+        if 2*OMEGA+2*mu-a <= 0:
+            return math.inf
+        lam = (a*kappa+OMEGA**2+1-2*mu)/(2*OMEGA+2*mu-a)
+    return lam
+
+
+def momentcurvature_curve (fc: float, daggmax: float, 
+                           fy: int, As: int, 
+                           rhof: float, Vf: float, df: float, lf: float,
+                           b: int, d: int, h: int, n_points: int = 300) -> dict[str, np.ndarray]:
+    """
+    Returns the full moment-curvature curve of a SFRC-RC hybrid cross-section,
+    with the same material model as momentcurvatureSFRC (Mobasher et al. 2015, 
+    RILEM TC 162-TDF 2003). The compressive strain at the top fiber is stepped 
+    from cracking to ecu in about 'n_points' increments, and all increments are 
+    evaluated at once as arrays.
+    The curve is linear up to cracking, at the cracked solution for lambdar1 
+    (neutral-axis factor k1), which is a little above the gross-section Mcr and 
+    phicr of momentcurvatureSFRC. After cracking the concrete in compression is 
+    elastic up to OMEGA*ecr and plastic after that, and the steel yields at the 
+    strain of _yield_lambda, which is a point of the curve. Unlike 
+    momentcurvatureSFRC, the unyielded and yielded solutions meet at yield (see 
+    _mphi_cracked with 'continuous'), so the curvature increases and the moment 
+    has no jumps along the curve. The curve passes through the ultimate point 
+    of momentcurvatureSFRC when the steel has yielded there, and through the 
+    yield point when also the concrete yield strain is at most OMEGA*ecr.
+    Returns a dictionary with the curvatures "phi" (1/mm), moments "M" (kNm),
+    neutral-axis factors "k" and normalized compressive strains "lambda".
+    """
+    c = _mphi_constants(fc, fy, As, rhof, Vf, df, lf, b, d, h)
+    c = {key: float(value) for key, value in c.items()}
+    lam = np.linspace(c["lambdar1"], c["lambdacu"], max(n_points - 1, 2))
+    lam = np.union1d(lam, [c["om"], OMEGA, _yield_lambda(c)])
+    lam = lam[lam <= c["lambdacu"]]
+    plastic = lam > OMEGA
+
+    M = np.empty_like(lam)
+    phi = np.empty_like(lam)
+    k = np.empty_like(lam)
+    M[~plastic], phi[~plastic], k[~plastic] = _mphi_cracked(lam[~plastic], c, continuous=True)
+    M[plastic], phi[plastic], k[plastic] = _mphi_plastic(lam[plastic], c, continuous=True)
+
+    return {"phi": np.concatenate([[0.], phi]),
+            "M": np.concatenate([[0.], M]),
+            "k": np.concatenate([[c["k1"]], k]),
+            "lambda": np.concatenate([[0.], lam])}
+
+
+def momentcurvatureSFRC_table (data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Runs momentcurvatureSFRC_batch on a DataFrame (or any mapping) with the columns 
+    fc, daggmax, fy, As, rhof, Vf, df, lf, b, d and h, and returns a DataFrame 
+    with one column for each of the results in MPHI_RESULTS. 
+    When 'data' is a DataFrame, its index is kept.
+    """
+    inputs = ["fc", "daggmax", "fy", "As", "rhof", "Vf", "df", "lf", "b", "d", "h"]
+    results = momentcurvatureSFRC_batch(*[np.asarray(data[key]) for key in inputs])
+    return pd.DataFrame(results, index=getattr(data, "index", None))
+
+
+
+SHEAR_RESULTS = ["VCSDT", "Vd", "Vc", "Vai", "VF"]
+# The aggregate interlock of shearcap has 1/(wb - 0.01) in it, which blows up as the
+# crack width wb (mm) goes to 0.01 mm. The capacity is only used where the 0.01 mm
+# offset changes that term by at most WB_OFFSET_TOLERANCE (wb/(wb - 0.01) <= 1.1),
+# which is a crack width of at least WB_MIN = 0.11 mm.
+WB_OFFSET_TOLERANCE = 0.1
+WB_MIN = 0.01*(1+WB_OFFSET_TOLERANCE)/WB_OFFSET_TOLERANCE
+SHEAR_DTYPE = np.dtype([(name, np.float64) for name in SHEAR_RESULTS])
+
+
+@dataclass(slots=True)
+class ShearResult:
+    """
+    A data type to hold the result of shearcap for one cross-section and demand.
+    The list form of shearcap is available with to_list.
+    """
+    VCSDT: float
+    Vd: float
+    Vc: float
+    Vai: float
+    VF: float
+
+    @classmethod
+    def from_list(cls, shear: list) -> "ShearResult":
+        """
+        Returns the result for the list returned by shearcap
+        """
+        return cls(*shear)
+
+    @classmethod
+    def from_record(cls, record: np.ndarray) -> "ShearResult":
+        """
+        Returns the result for one element of a SHEAR_DTYPE array
+        """
+        return cls(*[float(record[name]) for name in SHEAR_RESULTS])
+
+    def to_list(self) -> list:
+        """
+        Returns the result in the list form of shearcap
+        """
+        return [self.VCSDT, self.Vd, self.Vc, self.Vai, self.VF]
+
+
+def _crack_width(daggmax, As, phibar, Vf, df, lf, b, d, h, M, Mphi: np.ndarray) -> tuple:
+    """
+    Returns the height of the compression zone zc, the crack spacing sm and the
+    crack width at the bottom wb (mm) of shearcap for the moments 'M', as arrays
+    """
+    Mcr = Mphi["Mcr"]
+    My = Mphi["My"]
+    Mult = Mphi["Mult"]
+    k1 = Mphi["k1"]
+    k2y = Mphi["k2y"]
+    k3u = Mphi["k3u"]
+    lambdar1 = Mphi["lambdar1"]
+    om = Mphi["om"]
+    ecr = Mphi["ecr"]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rho = As/(b*d)
+        uncracked = M <= Mcr
+        cracked = ~uncracked & (M <= My)
+        kcsm = np.where(uncracked, k1, 
+                        np.where(cracked, (k2y-k1)/(My-Mcr)*(M-Mcr)+k1, 
+                                 (k3u-k2y)/(Mult-My)*(M-My)+k2y))
+        lambdaM = np.where(uncracked, M/Mcr*lambdar1, 
+                           np.where(cracked, (om-lambdar1)/(My-Mcr)*(M-Mcr)+lambdar1, 
+                                    (lambdar1-om)/(My-Mult)*(M-My)+om))
+        zc = kcsm*h
+
+        sb = np.minimum(15*phibar, 0.5*np.sqrt(np.pi*phibar)**2/rho)
+        kf = np.maximum(lf/(50*df), 1)
+        smi = rho/phibar+kf*0.5*Vf/df
+        kc3 = 1-np.minimum(Vf, 0.015)/0.015*(1-1/kf)
+        sm = 2*(1.5*daggmax+sb/10)*kc3+0.4*0.125/smi
+        etavg = ((h-zc)/(2*zc))*lambdaM*ecr
+        wb = sm*etavg*(1.7+3.4*Vf*lf/df)
+    return zc, sm, wb
+
+
+def shearcap_applicable (fc, daggmax, fy, As, phibar, ns, rhof, Vf, df, lf, 
+                         b, d, h, M, Mphi: np.ndarray = None, wb_min: float = WB_MIN) -> np.ndarray:
+    """
+    Returns True where shearcap_batch gives a usable shear capacity for the
+    moments 'M' (kNm): the section has to be cracked in flexure (M > Mcr) but not
+    failed in flexure (M <= Mult, above which the compression zone of the crack
+    width goes negative), and the crack width wb has to be at least 'wb_min' 
+    (mm). The aggregate interlock term
+    has 1/(wb - 0.01) in it, so for narrower cracks the capacity is dominated by 
+    the singularity and goes to plus or minus infinity (see WB_MIN). 
+    This is the one test of the range of the CSDT model: the shear checks, the 
+    design, the surrogate, the validation and the reliability analysis all use it.
+    The inputs are those of shearcap_batch.
+    """
+    if Mphi is None:
+        Mphi = momentcurvatureSFRC_batch(fc, daggmax, fy, As, rhof, Vf, df, lf, b, d, h)
+    daggmax, As, phibar, Vf, df, lf, b, d, h, M = [
+        np.asarray(value, dtype=float) for value in (daggmax, As, phibar, Vf, df, lf, b, d, h, M)]
+    _, _, wb = _crack_width(daggmax, As, phibar, Vf, df, lf, b, d, h, M, Mphi)
+    return (M > Mphi["Mcr"]) & (M <= Mphi["Mult"]) & (wb >= wb_min)
+
+
+def shearcap_batch (fc, daggmax, fy, As, phibar, ns, rhof, Vf, df, lf, 
+                    b, d, h, V, M, Mphi: np.ndarray = None) -> np.ndarray:
+    """
+    This function is the vectorized version of shearcap. All inputs can be floats 
+    or NumPy arrays that broadcast against each other.
+    'Mphi' is the result of momentcurvatureSFRC_batch for the cross-sections. When
+    it is not given, it is calculated here. Passing it in avoids redoing the
+    sectional analysis when only V and M change.
+    Returns a structured array of SHEAR_DTYPE (with a field for each of the results
+    in SHEAR_RESULTS) in the shape of the broadcast inputs.
+    """
+    if Mphi is None:
+        Mphi = momentcurvatureSFRC_batch(fc, daggmax, fy, As, rhof, Vf, df, lf, b, d, h)
+    fc, daggmax, As, phibar, ns, rhof, Vf, df, lf, b, d, h, V, M = [
+        np.asarray(value, dtype=float) 
+        for value in (fc, daggmax, As, phibar, ns, rhof, Vf, df, lf, b, d, h, V, M)]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rho = As/(b*d)
+        F = Vf*lf/df*rhof
+
+        #contribution of dowel action
+        bn = b-ns*phibar
+        bn = np.where(bn <= 0, b-ns/2*phibar, bn)
+        Vd = 1.64*bn*phibar*fc**(1/3)*1/1000 #in kN
+
+        # aspects of sectional analysis and the crack width
+        zc, sm, wb = _crack_width(daggmax, As, phibar, Vf, df, lf, b, d, h, M, Mphi)
+        z = d-1/3*zc
+
+        #contribution of concrete in compression zone
+        Vc = 2/3*zc/z*V
+
+        #contribution from aggregate interlock
+        D = np.minimum(25*d/(30610*phibar)+0.0022, 0.025) #mm
+        Vai = np.maximum(fc, 60)**0.56*sm*b*0.03/(wb-0.01)*(-978*D**2+85*D-0.27)*1/1000 
+
+        #contribution of the fibers
+        VF = 0.41*0.68*np.sqrt(fc)*np.minimum(1, F)*b*(d-zc)*1/1000
+
+        VCSDT = Vc+VF+Vai+Vd
+
+    return _structured(SHEAR_DTYPE, [VCSDT, Vd, Vc, Vai, VF])
+
+
+@dataclass(frozen=True)
+class SFRCSection:
+    """
+    A data type to describe a SFRC-RC cross-section without stirrups.
+    The moment-curvature analysis of the section (moments, k-factors, 
+    lambda values and ecr) is done the first time it is needed and is then 
+    kept, so that the shear capacity can be evaluated for many (V, M) 
+    demand pairs without redoing the sectional analysis.
+
+    Assumptions:
+        - Units are N and mm for the inputs, kN and kNm for the demands
+    """
+    fc: float
+    daggmax: float
+    fy: float
+    As: float
+    phibar: float
+    ns: int
+    rhof: float
+    Vf: float
+    df: float
+    lf: float
+    b: float
+    d: float
+    h: float
+
+    @cached_property
+    def Mphi(self) -> np.ndarray:
+        """
+        Returns the results of momentcurvatureSFRC_batch for this section
+        """
+        return momentcurvatureSFRC_batch(self.fc, self.daggmax, self.fy, self.As, 
+                                         self.rhof, self.Vf, self.df, self.lf, 
+                                         self.b, self.d, self.h)
+
+    def momentcurvature(self) -> MomentCurvatureResult:
+        """
+        Returns the moment-curvature results of this section
+        """
+        return MomentCurvatureResult.from_record(self.Mphi)
+
+    def momentcurvature_curve(self, n_points: int = 300) -> dict[str, np.ndarray]:
+        """
+        Returns the full moment-curvature curve of this section, 
+        see momentcurvature_curve
+        """
+        return momentcurvature_curve(self.fc, self.daggmax, self.fy, self.As, 
+                                     self.rhof, self.Vf, self.df, self.lf, 
+                                     self.b, self.d, self.h, n_points=n_points)
+
+    def shearcap(self, V, M) -> np.ndarray:
+        """
+        Returns the shear capacity and its contributions (see SHEAR_RESULTS)
+        for the demand pairs 'V' and 'M', which can be floats or arrays
+        """
+        return shearcap_batch(self.fc, self.daggmax, self.fy, self.As, self.phibar, 
+                              self.ns, self.rhof, self.Vf, self.df, self.lf, 
+                              self.b, self.d, self.h, V, M, Mphi=self.Mphi)
+
+    def shearcap_applicable(self, M) -> np.ndarray:
+        """
+        Returns True for the moments 'M' for which the shear capacity can be
+        used, see shearcap_applicable
+        """
+        return shearcap_applicable(self.fc, self.daggmax, self.fy, self.As, self.phibar, 
+                                   self.ns, self.rhof, self.Vf, self.df, self.lf, 
+                                   self.b, self.d, self.h, M, Mphi=self.Mphi)
@@ -0,0 +1,142 @@
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import islice
+from pathlib import Path
+from typing import Optional, Iterator
+import os
+import time
+import numpy as np
+import pandas as pd
+from eng_module import beams
+from eng_module import sweeps
+
+SUMMARY_RESULTS = ["shear", "moment", "deflection"]
+
+
+def beam_sources(path: str, pattern: str = "beam_*.txt") -> Iterator[tuple[str, dict]]:
+    """
+    Yields the file name and the structured beam data of each beam at 'path'.
+    A directory is scanned for the files matching 'pattern', each with one beam
+    in the format of beams.load_beam_model, and any other file is read as a file
+    with many beams (see beams.read_beams). The beams are read one at a time.
+    """
+    path = Path(path)
+    if path.is_dir():
+        for filename in sorted(path.glob(pattern)):
+            yield filename.name, beams.get_structured_beam_data(beams.read_beam_file(filename))
+    else:
+        for beam_data in beams.read_beams(path):
+            yield path.name, beam_data
+
+
+def summarize_beam(beam_data: dict, add_combos: Optional[str] = None, n_points: int = 100) -> pd.DataFrame:
+    """
+    Returns a table with the maximum and minimum shear, moment and deflection of
+    the beam described by 'beam_data' for each load combo: the load cases, and
+    the combos of 'add_combos' (see beams.add_load_combos).
+    The column "governs" lists the extremes over all combos that the combo governs,
+    leaving out the extremes that are zero for all combos.
+    The load cases of the beam are matched to the load types of the combos
+    with beams.case_load_types.
+    """
+    beam_model = beams.build_beam(beam_data)
+    if add_combos is not None:
+        beams.add_load_combos(beam_model, add_combos)
+    beam_model.analyze_linear(check_statics=False)
+    result_arrays = beams.extract_results(
+        beam_model, n_points, {result: beams.RESULT_DIRECTIONS[result] for result in SUMMARY_RESULTS})
+
+    summary = pd.DataFrame({"beam": beam_data['Name'], "combo": result_arrays.combos})
+    governs = [[] for _ in result_arrays.combos]
+    for result in SUMMARY_RESULTS:
+        # (combo, member, point) to (combo, point over all members)
+        values = result_arrays.result(result).reshape(len(result_arrays.combos), -1)
+        summary[f"max_{result}"] = values.max(axis=1)
+        summary[f"min_{result}"] = values.min(axis=1)
+        if summary[f"max_{result}"].max() > 0:
+            governs[int(np.argmax(summary[f"max_{result}"]))].append(f"max {result}")
+        if summary[f"min_{result}"].min() < 0:
+            governs[int(np.argmin(summary[f"min_{result}"]))].append(f"min {result}")
+    summary["governs"] = ["; ".join(extremes) for extremes in governs]
+    return summary
+
+
+def _init_worker() -> None:
+    """
+    Loads PyNite and the solver in a new worker, so that the first beam of each
+    worker does not pay for it
+    """
+    summarize_beam({'Name': "M0", 'L': 1000., 'E': 1., 'Iz': 1., 'Iy': 1., 'A': 1., 'J': 1.,
+                    'nu': 0.3, 'rho': 1., 'Supports': {0.: "P", 1000.: "R"},
+                    'Loads': [{'Type': "Point", 'Direction': "Fy", 'Magnitude': -1.,
+                               'Location': 500., 'Case': "D"}]}, n_points=2)
+
+
+def _run_batch(batch: list[tuple[str, dict]], add_combos: Optional[str], n_points: int) -> pd.DataFrame:
+    """
+    Returns the summary of each beam of 'batch' (file name, beam data) in one table
+    """
+    summaries = []
+    for source, beam_data in batch:
+        try:
+            summary = summarize_beam(beam_data, add_combos, n_points)
+        except Exception as error:
+            raise RuntimeError(f"{source}, beam '{beam_data['Name']}': {error}") from error
+        summary.insert(0, "source", source)
+        summaries.append(summary)
+    return pd.concat(summaries, ignore_index=True)
+
+
+def run_beam_batch(path: str, output: str, add_combos: Optional[str] = None,
+                   n_points: int = 100, batch_size: int = 10,
+                   max_workers: Optional[int] = None, max_tasks_per_child: Optional[int] = 50,
+                   verbose: bool = False) -> sweeps.SweepStats:
+    """
+    Builds and solves all beams at 'path' (see beam_sources) and writes the
+    summary of each beam (see summarize_beam) to 'output', in the same way as
+    sweeps.run_sweep: 'output' ending in ".csv" gets the rows appended, any other
+    'output' is used as a directory with one Parquet file per batch.
+    The beams are read as they are needed and solved in batches of 'batch_size'
+    on a pool of 'max_workers' processes (max_workers=1 runs in this process).
+    Every worker loads PyNite once when it starts and is replaced after
+    'max_tasks_per_child' batches, which caps the memory it can build up.
+    Each batch is written as soon as it is done, so the rows are not in the
+    order of the beams. With 'verbose', the throughput is printed per batch.
+    The stats count the beams.
+    """
+    output = Path(output)
+    if output.exists():
+        raise FileExistsError(f"{output} already exists")
+    sources = beam_sources(path)
+    batches = iter(lambda: list(islice(sources, batch_size)), [])
+
+    n_evaluated = 0
+    start_time = time.perf_counter()
+
+    def write(batch_id, n_beams, summary):
+        nonlocal n_evaluated
+        sweeps.append_results(summary, output, batch_id)
+        n_evaluated += n_beams
+        if verbose:
+            elapsed = time.perf_counter() - start_time
+            print(f"batch {batch_id}: {n_evaluated} beams done, {n_evaluated/elapsed:.1f} beams/s")
+
+    if max_workers == 1:
+        for batch_id, batch in enumerate(batches):
+            write(batch_id, len(batch), _run_batch(batch, add_combos, n_points))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                                 max_tasks_per_child=max_tasks_per_child) as executor:
+            max_pending = 2 * (max_workers or os.cpu_count() or 1)
+            pending = {}
+            for batch_id, batch in enumerate(batches):
+                if len(pending) >= max_pending:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        write(*pending.pop(future), future.result())
+                future = executor.submit(_run_batch, batch, add_combos, n_points)
+                pending[future] = (batch_id, len(batch))
+            for future in wait(pending).done:
+                write(*pending[future], future.result())
+
+    return sweeps.SweepStats(n_total=n_evaluated, n_evaluated=n_evaluated, n_skipped=0,
+                             elapsed=time.perf_counter() - start_time)
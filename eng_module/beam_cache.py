@@ -0,0 +1,179 @@
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+import copy
+import hashlib
+import json
+import os
+import numpy as np
+from eng_module import beams
+
+# Increase when the stored results change, so that old cache files are not used
+CACHE_VERSION = 1
+RESULT_DIRECTIONS = {"shear": "Fy", "moment": "Mz", "deflection": "dy"}
+
+
+@dataclass
+class BeamResults:
+    """
+    A data type to hold the extracted results of a solved beam model.
+    'arrays' has the same layout as beams.extract_arrays_all_combos for each
+    result type in RESULT_DIRECTIONS: {result_type: {combo: [array per member]}},
+    and 'member_x' has the global X-coordinate of the i-node of each member.
+    """
+    combos: list[str]
+    member_x: np.ndarray
+    arrays: dict[str, dict[str, list[np.ndarray]]]
+
+    def member_results(self, result_type: str, direction: str,
+                       combos: Optional[list[str]] = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the x-coordinates and the results of 'result_type' for all members,
+        with the results in the shape (combo, point), as checks.member_results
+        """
+        if RESULT_DIRECTIONS.get(result_type) != direction:
+            raise KeyError(f"Only the {RESULT_DIRECTIONS} results are stored, not {result_type} in {direction}")
+        if combos is None:
+            combos = self.combos
+        result_arrays = self.arrays[result_type]
+        x = np.concatenate([x_start + result_array[0]
+                            for x_start, result_array in zip(self.member_x, result_arrays[combos[0]])])
+        results = np.array([np.concatenate([result_array[1] for result_array in result_arrays[combo]])
+                            for combo in combos])
+        return x, results
+
+
+def _canonical(value):
+    """
+    Returns 'value' in a form that serializes to the same JSON for equal beam data:
+    dicts become sorted lists of pairs and all numbers become floats
+    """
+    if isinstance(value, dict):
+        return sorted([_canonical(key), _canonical(item)] for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return [_canonical(item) for item in value]
+    if isinstance(value, (bool, np.bool_)):
+        return bool(value)
+    if isinstance(value, (int, float, np.integer, np.floating)):
+        return repr(float(value))
+    return str(value)
+
+
+def beam_hash(beam_data: dict, combos: Optional[dict[str, dict[str, float]]] = None,
+              n_points: int = 300) -> str:
+    """
+    Returns a hash of the content of 'beam_data' (the input of beams.build_beam),
+    the extra load 'combos' and 'n_points'. Beams with the same geometry, supports,
+    loads and combos get the same hash, whatever the order of their keys, and
+    whether the numbers are ints or floats.
+    The 'Nodes' added to 'beam_data' by build_beam are not part of the hash.
+    """
+    data = {key: value for key, value in beam_data.items() if key != "Nodes"}
+    content = json.dumps([CACHE_VERSION, _canonical(data), _canonical(combos or {}), n_points])
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class BeamCache:
+    """
+    A disk cache of BeamResults in 'directory', with one compressed NumPy file
+    per beam. When the files take more than 'max_bytes', the least recently
+    used files are removed.
+    """
+    def __init__(self, directory: str, max_bytes: int = 100_000_000):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _filename(self, key: str) -> Path:
+        return self.directory / f"{key}.npz"
+
+    def get(self, key: str) -> Optional[BeamResults]:
+        """
+        Returns the results stored under 'key', or None when they are not in the cache
+        """
+        filename = self._filename(key)
+        try:
+            with np.load(filename) as data:
+                combos = [str(combo) for combo in data["combos"]]
+                member_x = data["member_x"]
+                arrays = {result_type: {combo: [data[f"{result_type}_{combo_idx}_{member_idx}"]
+                                                for member_idx in range(len(member_x))]
+                                        for combo_idx, combo in enumerate(combos)}
+                          for result_type in RESULT_DIRECTIONS}
+        except (FileNotFoundError, OSError, KeyError, ValueError):
+            return None
+        # The modification time is used as the time of last use for the eviction
+        os.utime(filename)
+        return BeamResults(combos=combos, member_x=member_x, arrays=arrays)
+
+    def put(self, key: str, results: BeamResults) -> None:
+        """
+        Stores 'results' under 'key' and removes the least recently used files
+        when the cache is larger than max_bytes
+        """
+        arrays = {f"{result_type}_{combo_idx}_{member_idx}": result_array
+                  for result_type in RESULT_DIRECTIONS
+                  for combo_idx, combo in enumerate(results.combos)
+                  for member_idx, result_array in enumerate(results.arrays[result_type][combo])}
+        temp = self.directory / f".{key}.npz.tmp"
+        with open(temp, "wb") as file:
+            np.savez_compressed(file, combos=np.array(results.combos), member_x=results.member_x, **arrays)
+        os.replace(temp, self._filename(key))
+        self.evict()
+
+    def size(self) -> int:
+        """
+        Returns the number of bytes used by the cache files
+        """
+        return sum(filename.stat().st_size for filename in self.directory.glob("*.npz"))
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used files until the cache fits in max_bytes
+        """
+        files = sorted(self.directory.glob("*.npz"), key=lambda filename: filename.stat().st_mtime)
+        total = sum(filename.stat().st_size for filename in files)
+        for filename in files:
+            if total <= self.max_bytes:
+                break
+            total -= filename.stat().st_size
+            filename.unlink(missing_ok=True)
+
+    def clear(self) -> None:
+        """
+        Removes all files from the cache
+        """
+        for filename in self.directory.glob("*.npz"):
+            filename.unlink(missing_ok=True)
+
+
+def solve_beam(beam_data: dict, combos: Optional[dict[str, dict[str, float]]] = None,
+               n_points: int = 300, cache: Optional[BeamCache] = None) -> BeamResults:
+    """
+    Returns the shear, moment and deflection results at 'n_points' along each member
+    of the beam described by 'beam_data' (the input of beams.build_beam), for the
+    load cases and the extra load 'combos' ({combo name: factors}).
+    When the beam is in the 'cache', the results are read from disk without
+    building or analysing the PyNite model. Otherwise the model is solved and
+    the results are stored in the cache.
+    """
+    key = beam_hash(beam_data, combos, n_points)
+    if cache is not None:
+        results = cache.get(key)
+        if results is not None:
+            return results
+
+    # build_beam adds the nodes to its input
+    beam_model = beams.build_beam(copy.deepcopy(beam_data))
+    for combo_name, factors in (combos or {}).items():
+        beam_model.add_load_combo(combo_name, factors)
+    beam_model.analyze()
+    results = BeamResults(
+        combos=list(beam_model.LoadCombos.keys()),
+        member_x=np.array([member.i_node.X for member in beam_model.Members.values()]),
+        arrays={result_type: beams.extract_arrays_all_combos(beam_model, result_type, direction, n_points)
+                for result_type, direction in RESULT_DIRECTIONS.items()},
+    )
+    if cache is not None:
+        cache.put(key, results)
+    return results
@@ -0,0 +1,497 @@
+from dataclasses import dataclass
+from typing import Optional
+import time
+import numpy as np
+from scipy.linalg import cholesky_banded, cho_solve_banded, LinAlgError
+
+# Degrees of freedom per node: the deflection w and the rotation theta = dw/dx
+DOF_PER_NODE = 2
+# Upper bandwidth of the stiffness matrix of a line of beam elements
+BANDWIDTH = 2 * DOF_PER_NODE - 1
+SUPPORT_DOFS = {"P": (True, False), "R": (True, False), "F": (True, True)}
+RESULT_TYPES = ["shear", "moment", "axial", "torque", "deflection"]
+GAUSS_X, GAUSS_W = np.polynomial.legendre.leggauss(3)
+# Polynomial degree of each result between two load discontinuities, for linearly varying loads
+RESULT_DEGREES = {"shear": 2, "moment": 3, "rotation": 4, "deflection": 5}
+
+
+@dataclass
+class BeamLoads:
+    """
+    A data type to hold the loads of a beam as arrays, with for every load the
+    index of its load case in 'cases'.
+    Point forces 'P' (upwards positive) act at 'point_x', couples 'C'
+    (counterclockwise positive) at 'couple_x' and linearly varying distributed
+    loads from 'w1' at 'dist_a' to 'w2' at 'dist_b'.
+    """
+    cases: list[str]
+    point_x: np.ndarray
+    P: np.ndarray
+    point_case: np.ndarray
+    couple_x: np.ndarray
+    C: np.ndarray
+    couple_case: np.ndarray
+    dist_a: np.ndarray
+    dist_b: np.ndarray
+    w1: np.ndarray
+    w2: np.ndarray
+    dist_case: np.ndarray
+
+    @classmethod
+    def from_beam_data(cls, beam_data: dict) -> "BeamLoads":
+        """
+        Returns the loads in 'beam_data' (the input of beams.build_beam). The load
+        cases are in the order in which they first appear, as in build_beam.
+        Point loads can be in the "Fy" or "Mz" direction, distributed loads in "Fy".
+        A distributed load with its end before its start is reversed, and one
+        with a length of zero raises a ValueError.
+        """
+        cases = []
+        points, couples, dists = [], [], []
+        for load in beam_data['Loads']:
+            if load['Case'] not in cases:
+                cases.append(load['Case'])
+            case = cases.index(load['Case'])
+            if load['Type'] == "Point" and load['Direction'] == "Fy":
+                points.append((load['Location'], load['Magnitude'], case))
+            elif load['Type'] == "Point" and load['Direction'] == "Mz":
+                couples.append((load['Location'], load['Magnitude'], case))
+            elif load['Type'] == "Dist" and load['Direction'] == "Fy":
+                start, end = load['Start Location'], load['End Location']
+                w1, w2 = load['Start Magnitude'], load['End Magnitude']
+                if end == start:
+                    raise ValueError(f"The distributed load at {start} has a length of zero")
+                if end < start:
+                    # A load given from right to left
+                    start, end, w1, w2 = end, start, w2, w1
+                dists.append((start, end, w1, w2, case))
+            else:
+                raise ValueError(f"The beam solver does not support {load['Type']} loads in {load['Direction']}")
+        points = np.array(points, dtype=float).reshape(-1, 3)
+        couples = np.array(couples, dtype=float).reshape(-1, 3)
+        dists = np.array(dists, dtype=float).reshape(-1, 5)
+        return cls(
+            cases=cases,
+            point_x=points[:, 0], P=points[:, 1], point_case=points[:, 2].astype(int),
+            couple_x=couples[:, 0], C=couples[:, 1], couple_case=couples[:, 2].astype(int),
+            dist_a=dists[:, 0], dist_b=dists[:, 1], w1=dists[:, 2], w2=dists[:, 3],
+            dist_case=dists[:, 4].astype(int),
+        )
+
+
+def support_nodes(beam_data: dict) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the x-coordinates of the nodes of the beam (the ends and the supports)
+    and a boolean array with the restrained degrees of freedom of each node.
+    Raises a ValueError for a support outside the beam.
+    """
+    supports = {float(x): support for x, support in beam_data['Supports'].items()}
+    for x in supports:
+        if not 0 <= x <= beam_data['L']:
+            raise ValueError(f"The support at {x} is outside the beam (0 to {beam_data['L']})")
+    nodes = np.unique([0., float(beam_data['L'])] + list(supports.keys()))
+    restrained = np.zeros((len(nodes), DOF_PER_NODE), dtype=bool)
+    for x, support in supports.items():
+        restrained[np.searchsorted(nodes, x)] = SUPPORT_DOFS[support]
+    return nodes, restrained.ravel()
+
+
+def element_stiffness(EI: float, lengths: np.ndarray) -> np.ndarray:
+    """
+    Returns the stiffness matrices (element, 4, 4) of Euler-Bernoulli beam
+    elements of 'lengths', for the degrees of freedom (w_i, theta_i, w_j, theta_j)
+    """
+    l = lengths[:, None, None]
+    k = np.array([[12, 6, -12, 6],
+                  [6, 4, -6, 2],
+                  [-12, -6, 12, -6],
+                  [6, 2, -6, 4]], dtype=float)
+    # Scale the rows and columns of the rotations by the element length
+    scale = np.ones((len(lengths), 4))
+    scale[:, 1::2] = lengths[:, None]
+    return EI / l**3 * k * scale[:, :, None] * scale[:, None, :]
+
+
+def banded_stiffness(element_k: np.ndarray, restrained: np.ndarray) -> np.ndarray:
+    """
+    Returns the global stiffness matrix in the upper banded form of
+    scipy.linalg.cholesky_banded, with the rows and columns of the 'restrained'
+    degrees of freedom replaced by those of the identity matrix
+    """
+    n_dof = len(restrained)
+    ab = np.zeros((BANDWIDTH + 1, n_dof))
+    first_dof = DOF_PER_NODE * np.arange(len(element_k))
+    for i in range(4):
+        for j in range(i, 4):
+            np.add.at(ab, (BANDWIDTH + i - j, first_dof + j), element_k[:, i, j])
+    for dof in np.flatnonzero(restrained):
+        for offset in range(BANDWIDTH + 1):
+            if dof + offset < n_dof:
+                ab[BANDWIDTH - offset, dof + offset] = 0.
+            ab[BANDWIDTH - offset, dof] = 0.
+        ab[BANDWIDTH, dof] = 1.
+    return ab
+
+
+def factorize(ab: np.ndarray, rtol: float = 1e-10) -> np.ndarray:
+    """
+    Returns the Cholesky factor of the banded stiffness matrix 'ab'.
+    Raises a LinAlgError when a pivot is smaller than 'rtol' times the diagonal
+    of the stiffness matrix, which means that the beam is a mechanism.
+    """
+    factor = cholesky_banded(ab)
+    if np.any(factor[BANDWIDTH]**2 < rtol * ab[BANDWIDTH]):
+        raise LinAlgError("The stiffness matrix is singular")
+    return factor
+
+
+def _hermite(s: np.ndarray, l: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the Hermite shape functions (load, 4) and their derivatives
+    at the positions 's' in elements of length 'l'
+    """
+    xi = s / l
+    N = np.stack([1 - 3*xi**2 + 2*xi**3, l*(xi - 2*xi**2 + xi**3), 3*xi**2 - 2*xi**3, l*(-xi**2 + xi**3)], axis=-1)
+    dN = np.stack([(-6*xi + 6*xi**2)/l, 1 - 4*xi + 3*xi**2, (6*xi - 6*xi**2)/l, -2*xi + 3*xi**2], axis=-1)
+    return N, dN
+
+
+def nodal_loads(nodes: np.ndarray, loads: BeamLoads) -> np.ndarray:
+    """
+    Returns the work-equivalent nodal loads (degree of freedom, case) of 'loads'
+    """
+    n_cases = len(loads.cases)
+    f = np.zeros((DOF_PER_NODE * len(nodes), n_cases))
+    lengths = np.diff(nodes)
+
+    def add(x, values, case, derivative):
+        element = np.clip(np.searchsorted(nodes, x, side="right") - 1, 0, len(lengths) - 1)
+        N, dN = _hermite(x - nodes[element], lengths[element])
+        shape = dN if derivative else N
+        for i in range(4):
+            np.add.at(f, (DOF_PER_NODE * element + i, case), values * shape[:, i])
+
+    # The distributed loads are split at the nodes and integrated with a
+    # 3-point Gauss rule, which is exact for a linear load on a cubic shape function
+    x, values, cases = [loads.point_x], [loads.P], [loads.point_case]
+    for a, b, w1, w2, case in zip(loads.dist_a, loads.dist_b, loads.w1, loads.w2, loads.dist_case):
+        bounds = np.unique(np.clip(np.concatenate([[a, b], nodes]), a, b))
+        start, end = bounds[:-1, None], bounds[1:, None]
+        gauss_x = ((start + end) + (end - start) * GAUSS_X) / 2
+        q = w1 + (w2 - w1) * (gauss_x - a) / (b - a)
+        x.append(gauss_x.ravel())
+        values.append((q * GAUSS_W * (end - start) / 2).ravel())
+        cases.append(np.full(gauss_x.size, case))
+    add(np.concatenate(x), np.concatenate(values), np.concatenate(cases), derivative=False)
+    add(loads.couple_x, loads.C, loads.couple_case, derivative=True)
+    return f
+
+
+def _ramp_effects(x: np.ndarray, a: np.ndarray, c0: np.ndarray, c1: np.ndarray) -> np.ndarray:
+    """
+    Returns V, M, EI*theta and EI*w (4, load, point) of the loads c0 + c1*(x - a)
+    that start at 'a' and continue to the end of the beam
+    """
+    s = np.maximum(x[None, :] - a[:, None], 0.)
+    c0 = c0[:, None]
+    c1 = c1[:, None]
+    return np.stack([c0*s + c1*s**2/2, c0*s**2/2 + c1*s**3/6,
+                     c0*s**3/6 + c1*s**4/24, c0*s**4/24 + c1*s**5/120])
+
+
+def _point_effects(x: np.ndarray, a: np.ndarray, P: np.ndarray, C: np.ndarray, L: float) -> np.ndarray:
+    """
+    Returns V, M, EI*theta and EI*w (4, load, point) of the point forces 'P'
+    and couples 'C' at 'a'. As in PyNite, the shear at 'a' includes the load,
+    except at the end of the beam.
+    """
+    applied = (x[None, :] >= a[:, None]) & (a[:, None] < L)
+    s = np.where(applied, x[None, :] - a[:, None], 0.)
+    P = P[:, None]
+    C = C[:, None]
+    return np.stack([P*applied, P*s - C*applied, P*s**2/2 - C*s, P*s**3/6 - C*s**2/2])
+
+
+@dataclass
+class Extrema:
+    """
+    A data type to hold the exact maximum and minimum of a result for each
+    load combo in 'combos', with their locations
+    """
+    combos: list[str]
+    max: np.ndarray
+    x_max: np.ndarray
+    min: np.ndarray
+    x_min: np.ndarray
+
+
+@dataclass
+class BeamSolution:
+    """
+    A data type to hold the solution of a beam for each load case: the reaction
+    forces 'R' and moments 'R_M' (case, support node) at 'support_x', and the
+    deflection 'w0' and rotation 'theta0' at x = 0.
+    The results anywhere along the beam follow from equilibrium, as the sum of the
+    effects of the loads and the reactions, so they are exact for all x.
+    'combos' has the factor on each load case of every load combo.
+    """
+    L: float
+    EI: float
+    loads: BeamLoads
+    combos: dict[str, dict[str, float]]
+    support_x: np.ndarray
+    R: np.ndarray
+    R_M: np.ndarray
+    w0: np.ndarray
+    theta0: np.ndarray
+
+    def case_results(self, x: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Returns the shear, moment, rotation and deflection (case, point) at 'x'
+        for each load case, with the sign conventions of PyNite (moment Mz,
+        deflection dy)
+        """
+        x = np.asarray(x, dtype=float)
+        loads = self.loads
+        n_cases = len(loads.cases)
+        effects = np.zeros((4, n_cases, len(x)))
+
+        def add(load_effects, case):
+            for idx in range(4):
+                np.add.at(effects[idx], case, load_effects[idx])
+
+        add(_point_effects(x, loads.point_x, loads.P, np.zeros_like(loads.P), self.L), loads.point_case)
+        add(_point_effects(x, loads.couple_x, np.zeros_like(loads.C), loads.C, self.L), loads.couple_case)
+        slope = (loads.w2 - loads.w1) / (loads.dist_b - loads.dist_a)
+        add(_ramp_effects(x, loads.dist_a, loads.w1, slope) - _ramp_effects(x, loads.dist_b, loads.w2, slope),
+            loads.dist_case)
+        # The reactions act as point forces and couples at the supports, for all cases
+        reactions = np.stack([self.R, self.R_M], axis=-1).reshape(n_cases, -1)
+        unit = np.tile([[1., 0.], [0., 1.]], (len(self.support_x), 1))
+        support_effects = _point_effects(x, np.repeat(self.support_x, 2), unit[:, 0], unit[:, 1], self.L)
+        effects += np.einsum("cs,rsp->rcp", reactions, support_effects)
+
+        V, M_sagging, EI_theta, EI_w = effects
+        theta = self.theta0[:, None] + EI_theta / self.EI
+        w = self.w0[:, None] + self.theta0[:, None] * x + EI_w / self.EI
+        return {"shear": V, "moment": -M_sagging, "rotation": theta, "deflection": w}
+
+    def combo_matrix(self) -> np.ndarray:
+        """
+        Returns the factors (combo, case) of the load combos
+        """
+        return np.array([[factors.get(case, 0.) for case in self.loads.cases]
+                         for factors in self.combos.values()]).reshape(len(self.combos), len(self.loads.cases))
+
+    def combo_results(self, x: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Returns the shear, moment, rotation and deflection (combo, point) at 'x'
+        for each load combo, by superposition of the load case results
+        """
+        factors = self.combo_matrix()
+        return {name: factors @ values for name, values in self.case_results(x).items()}
+
+    def breakpoints(self) -> np.ndarray:
+        """
+        Returns the sorted x-coordinates of the ends, the supports and the
+        discontinuities of the loads, between which all results are polynomials
+        """
+        loads = self.loads
+        x = np.concatenate([[0., self.L], self.support_x, loads.point_x, loads.couple_x,
+                            loads.dist_a, loads.dist_b])
+        return np.unique(x[(x >= 0) & (x <= self.L)])
+
+    def extrema(self, result_type: str) -> Extrema:
+        """
+        Returns the exact maximum and minimum of 'result_type' ("shear", "moment",
+        "rotation" or "deflection") for every load combo.
+        Between two breakpoints the result is a polynomial of RESULT_DEGREES, which is
+        fitted exactly from as many points, so that its peaks follow from the roots
+        of its derivative (for the moment: the points of zero shear). The candidates
+        are these peaks and the breakpoints, with the values just left of them for
+        the jumps of the shear and moment.
+        """
+        deg = RESULT_DEGREES[result_type]
+        bounds = self.breakpoints()
+        left, right = bounds[:-1], bounds[1:]
+        # Chebyshev points inside each segment, away from the jumps at the breakpoints
+        t = np.cos(np.pi * (np.arange(deg + 1) + 0.5) / (deg + 1))
+        x = ((left + right) / 2 + (right - left) / 2 * t[:, None])
+        values = self.combo_results(x.ravel())[result_type].reshape(len(self.combos), deg + 1, len(left))
+        coefs = np.polynomial.polynomial.polyfit(t, values.transpose(1, 0, 2).reshape(deg + 1, -1), deg)
+
+        candidates = [bounds, np.nextafter(bounds[1:], -np.inf)]
+        for column in range(coefs.shape[1]):
+            roots = np.polynomial.polynomial.polyroots(np.polynomial.polynomial.polyder(coefs[:, column]))
+            roots = roots.real[(np.abs(roots.imag) < 1e-9) & (np.abs(roots.real) <= 1)]
+            segment = column % len(left)
+            candidates.append((left[segment] + right[segment]) / 2 + (right[segment] - left[segment]) / 2 * roots)
+        x = np.unique(np.concatenate(candidates))
+        values = self.combo_results(x)[result_type]
+        max_idx = values.argmax(axis=1)
+        min_idx = values.argmin(axis=1)
+        combo_idx = np.arange(len(self.combos))
+        return Extrema(
+            combos=list(self.combos.keys()),
+            max=values[combo_idx, max_idx],
+            x_max=x[max_idx],
+            min=values[combo_idx, min_idx],
+            x_min=x[min_idx],
+        )
+
+    def sample_points(self, n_points: int = 50) -> np.ndarray:
+        """
+        Returns sorted x-coordinates for plotting the results: 'n_points' uniformly
+        spaced, the breakpoints (and just left of them, to show the jumps) and
+        the locations of the extrema of the shear, moment and deflection of all
+        load combos
+        """
+        bounds = self.breakpoints()
+        x = [np.linspace(0, self.L, n_points), bounds, np.nextafter(bounds[1:], -np.inf)]
+        for result_type in ["shear", "moment", "deflection"]:
+            extrema = self.extrema(result_type)
+            x.extend([extrema.x_max, extrema.x_min])
+        return np.unique(np.concatenate(x))
+
+    def extract_arrays_all_combos(self, result_type: str, direction: str, n_points: int) -> dict[str, list[np.ndarray]]:
+        """
+        Returns the results of 'result_type' for all load combos at 'n_points', in
+        the same form as beams.extract_arrays_all_combos for the solved PyNite model
+        of the beam. The shear is in "Fy", the moment in "Mz" and the deflection in
+        "dy". There are no axial or torsional loads, so the axial force and torque are 0.
+        """
+        if result_type not in RESULT_TYPES:
+            raise ValueError(f"The result type should be one of {RESULT_TYPES}, not {result_type}")
+        x = np.linspace(0, self.L, n_points)
+        if result_type in ["axial", "torque"]:
+            values = np.zeros((len(self.combos), n_points))
+        else:
+            values = self.combo_results(x)[result_type]
+        return {combo: [np.array([x, value])] for combo, value in zip(self.combos, values)}
+
+
+def geometry_fingerprint(beam_data: dict) -> tuple:
+    """
+    Returns the data of 'beam_data' that the stiffness matrix depends on: the
+    length, the bending stiffness and the supports
+    """
+    return (float(beam_data['L']), float(beam_data['E']), float(beam_data['Iz']),
+            tuple(sorted((float(x), support) for x, support in beam_data['Supports'].items())))
+
+
+class BeamAnalysis:
+    """
+    A handle on the factorized stiffness matrix of a beam, to solve new loads
+    with a back-substitution only. The handle keeps the geometry fingerprint
+    of the beam, and factorizes the stiffness matrix again when a beam with
+    another length, stiffness or supports is solved.
+    'n_factorizations' counts the factorizations.
+    """
+    def __init__(self, beam_data: dict):
+        self.n_factorizations = 0
+        self.fingerprint = None
+        self._factorize(beam_data)
+
+    def _factorize(self, beam_data: dict) -> None:
+        self.L = float(beam_data['L'])
+        self.EI = beam_data['E'] * beam_data['Iz']
+        self.nodes, self.restrained = support_nodes(beam_data)
+        self.element_k = element_stiffness(self.EI, np.diff(self.nodes))
+        try:
+            self.factor = factorize(banded_stiffness(self.element_k, self.restrained))
+        except LinAlgError:
+            raise ValueError(f"The beam with supports {beam_data['Supports']} is unstable")
+        self.fingerprint = geometry_fingerprint(beam_data)
+        self.n_factorizations += 1
+
+    def solve(self, beam_data: dict, combos: Optional[dict[str, dict[str, float]]] = None,
+              loads: Optional[BeamLoads] = None) -> BeamSolution:
+        """
+        Returns the solution of the beam described by 'beam_data' for its loads (or
+        for 'loads', when given), with the load combos of solve_beam. The stiffness
+        matrix is only factorized again when the geometry of 'beam_data' changed.
+        """
+        if geometry_fingerprint(beam_data) != self.fingerprint:
+            self._factorize(beam_data)
+        if loads is None:
+            loads = BeamLoads.from_beam_data(beam_data)
+        f = nodal_loads(self.nodes, loads)
+        u = cho_solve_banded((self.factor, False), np.where(self.restrained[:, None], 0., f))
+
+        # Reactions: the nodal forces K*u minus the applied nodal loads, at the restrained dofs
+        element_dofs = DOF_PER_NODE * np.arange(len(self.element_k))[:, None] + np.arange(4)
+        element_forces = np.einsum("eij,jec->eic", self.element_k, u[element_dofs.T])
+        forces = np.zeros_like(u)
+        np.add.at(forces, element_dofs, element_forces)
+        forces = np.where(self.restrained[:, None], forces - f, 0.)
+
+        all_combos = {case: {case: 1.0} for case in loads.cases}
+        all_combos.update(combos or {})
+        return BeamSolution(
+            L=self.L,
+            EI=self.EI,
+            loads=loads,
+            combos=all_combos,
+            support_x=self.nodes,
+            R=forces[0::DOF_PER_NODE].T,
+            R_M=forces[1::DOF_PER_NODE].T,
+            w0=u[0],
+            theta0=u[1],
+        )
+
+
+def solve_beam(beam_data: dict, combos: Optional[dict[str, dict[str, float]]] = None,
+               loads: Optional[BeamLoads] = None) -> BeamSolution:
+    """
+    Returns the solution of the beam described by 'beam_data' (the input of
+    beams.build_beam), with a load combo with factor 1 for every load case, as
+    build_beam, and the extra 'combos' ({combo name: factors}).
+    When 'loads' is given, it is used instead of the loads in 'beam_data'.
+    The beam is modelled with 2D Euler-Bernoulli elements between the supports,
+    and the banded stiffness matrix is solved with a Cholesky factorization for
+    all load cases at once. Use a BeamAnalysis to solve more loads on the same beam.
+    Raises a ValueError when a support is outside the beam or the supports do
+    not make the beam stable.
+    """
+    return BeamAnalysis(beam_data).solve(beam_data, combos, loads)
+
+
+def cross_check(beam_data: dict, n_points: int = 100, repeat: int = 3) -> dict[str, float]:
+    """
+    Returns the largest difference between the shear, moment and deflection of
+    solve_beam and of the PyNite model of beams.build_beam, relative to the largest
+    absolute value of each result, and the best time of 'repeat' runs of both
+    (including the extraction of the results at 'n_points')
+    """
+    import copy
+    from eng_module import beams
+
+    directions = {"shear": "Fy", "moment": "Mz", "deflection": "dy"}
+
+    def run_native():
+        solution = solve_beam(beam_data)
+        return {result_type: solution.extract_arrays_all_combos(result_type, direction, n_points)
+                for result_type, direction in directions.items()}
+
+    def run_pynite():
+        beam_model = beams.build_beam(copy.deepcopy(beam_data))
+        beam_model.analyze()
+        return {result_type: beams.extract_arrays_all_combos(beam_model, result_type, direction, n_points)
+                for result_type, direction in directions.items()}
+
+    report = {}
+    for name, run in [("native", run_native), ("pynite", run_pynite)]:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = run()
+            timings.append(time.perf_counter() - start)
+        report[f"{name}_time"] = min(timings)
+        report[name] = results
+    for result_type in directions:
+        native = np.array([arrays[0][1] for arrays in report["native"][result_type].values()])
+        pynite = np.array([arrays[0][1] for arrays in report["pynite"][result_type].values()])
+        report[f"{result_type}_error"] = float(np.max(np.abs(native - pynite)) / max(np.max(np.abs(pynite)), 1e-300))
+    del report["native"], report["pynite"]
+    report["speedup"] = report["pynite_time"] / report["native_time"]
+    return report
@@ -1,9 +1,15 @@
 import math
+from dataclasses import dataclass
+import numpy as np
 from PyNite import FEModel3D
 from eng_module import utils 
-from typing import Optional
+from typing import Optional, Iterator
 from eng_module import load_factors
 
+# First line of every beam in a file with more than one beam
+BEAM_HEADER = "BEAM:"
+SUPPORT_TYPES = ["P", "R", "F"]
+
 def calc_shear_modulus(nu: float, E:float)-> float:
     """
     Returns the shear modulus calculated for a material based 
@@ -121,27 +127,67 @@ def get_spans(beamlength: float, cant_sup: float) -> tuple[float, float]:
     return b , a  
 
 
-def load_beam_model (filename: str, add_combos: Optional[str] = None) -> FEModel3D:
+def load_beam_model (filename: str, add_combos: Optional[str] = None, prune_combos: bool = False) -> FEModel3D:
     """
     converts a text file of beam data into a beam model
     NOTE:
     this function assumes that the data in the beam file 
     describes a simply supported beam with a cantilever on one side 
     and a single UDL loading it in the gravity direction.
+    'add_combos' is a design code of load_factors.COMBO_CODES, see add_load_combos.
     """
     input = read_beam_file(filename)
     beam_input = get_structured_beam_data(input)
     beam_model = build_beam(beam_input)
     if add_combos is not None:
-        if add_combos == "ACI_31819":
-            load_combos = load_factors.ACI_31819_COMBOS()
-        else:
-            raise ValueError(f"So far, this only works for ACI_31819 as input")
-        for combo_name, combo_factors in load_combos.items():
-            beam_model.add_load_combo(combo_name, combo_factors)
+        add_load_combos(beam_model, add_combos, prune_combos)
     return beam_model
 
 
+# Load types (see load_factors.LOAD_TYPES) of the load case names of beam files that
+# do not name their cases after the load types, such as the "Live" of UDL lines
+CASE_LOAD_TYPES = {"Dead": "D", "Live": "L", "Roof live": "Lr", "Snow": "S", 
+                   "Wind": "W", "Rain": "R", "Earthquake": "E"}
+
+
+def case_load_types(load_cases: list[str], load_types: list[str]) -> dict[str, str]:
+    """
+    Returns the load type of each of 'load_cases': the case name itself when it
+    is one of 'load_types', or else its load type in CASE_LOAD_TYPES.
+    Raises a ValueError when a case does not match any of 'load_types'.
+    """
+    case_types = {}
+    for case in load_cases:
+        load_type = case if case in load_types else CASE_LOAD_TYPES.get(case)
+        if load_type not in load_types:
+            raise ValueError(f"The load case '{case}' does not match any of the load types {load_types}; "
+                             f"name the case after the load type or use one of {list(CASE_LOAD_TYPES)}")
+        case_types[case] = load_type
+    return case_types
+
+
+def add_load_combos(beam_model: FEModel3D, add_combos: str, prune_combos: bool = False) -> None:
+    """
+    Adds the load combos of the design code 'add_combos' (one of
+    load_factors.COMBO_CODES) to 'beam_model'. Each load case of the model gets
+    the factor of its load type (see case_load_types), and a ValueError is raised
+    when a case has no load type of the code. Combos without any of the load
+    types of the model are not added. With 'prune_combos', only the combos that
+    can govern for the load types of the model are added.
+    """
+    load_combos = load_factors.load_combos(add_combos)
+    load_types = [load_type for load_type in load_factors.LOAD_TYPES
+                  if any(load_type in factors for factors in load_combos.values())]
+    case_types = case_load_types(beam_model.LoadCases, load_types)
+    if prune_combos:
+        load_combos = load_factors.load_combos(add_combos, {load_type: 0 for load_type in case_types.values()})
+    for combo_name, combo_factors in load_combos.items():
+        factors = {case: combo_factors[load_type] for case, load_type in case_types.items()
+                   if load_type in combo_factors}
+        if factors:
+            beam_model.add_load_combo(combo_name, factors)
+
+
 def separate_data(data: list[str]) -> list[list[str]]:
     """
     The functions purpose is to split up each 
@@ -186,8 +232,17 @@ def get_structured_beam_data(listinput: list[list[str]]) -> dict:
     structured_data.update({'Name': str(listinput[0]).strip("[").strip("]").strip("'")})
     structured_data.update(parse_beam_attributes(floatattributes))
     structured_data.update({"Supports":parse_supports(listinput[2])})
-    structured_data.update({"Loads":parse_loads(convert_to_numeric(listinput[3:]))}) 
+    structured_data.update({"Loads":parse_loads(full_length_udls(convert_to_numeric(listinput[3:]), structured_data['L']))}) 
     return structured_data    
+
+
+def full_length_udls(loads: list[list[str|float]], beamlength: float) -> list[list[str|float]]:
+    """
+    Returns 'loads' with the load lines that only have a magnitude 'w' 
+    written out as a UDL over the whole beam: [w, 0, beamlength]
+    """
+    return [[load[0], 0., beamlength] if len(load) == 1 and not isinstance(load[0], str) else load
+            for load in loads]
         
 
 
@@ -407,22 +462,21 @@ def build_beam(beam_data: dict) -> FEModel3D:
 
 
 def parse_supports(supports: list[str]) -> dict[float, str]:
+    """
+    Returns a dictionary with the support coordinates and types ("P", "R" or "F")
+    for a list of strings "coordinate:type". A coordinate without a type is a
+    pinned support.
+    """
     dict_sup = {}
     for support in supports:
         support = utils.str_to_float(support)
         if isinstance(support, float):
-            coo = support
-            print(coo)
-            type = "P"
-            print(type)
-            dict_sup.update({coo: type})
-        elif isinstance(support, str):
+            dict_sup.update({support: "P"})
+        else:
             split = support.split(":")
             coo = utils.str_to_float(split[0])
-            type = split[1]
+            type = split[1].strip()
             dict_sup.update({coo: type})  
-        else:
-            print("input type is not suitable")
     return dict_sup
 
 
@@ -471,13 +525,7 @@ def parse_loads(loads: list[list[str|float]]) -> list[dict]:
                 dict_loads.update({"Type": type, "Start Magnitude": start_mag, "End Magnitude": end_mag, "Start Location": start_load,
                                         "End Location": end_load, "Case": casetype})
         else:
-            print("Type of loading is not defined")
-            start_mag = load[0]
-            print(start_mag)
-            start_load = load[1]
-            end_load = load[2]
-            dict_loads.update({"Type": type, "Start Magnitude": start_mag, "End Magnitude": start_mag, "Start Location": start_load,
-                                "End Location": end_load, "Case": "L"})
+            raise ValueError(f"Type of loading is not defined for {load}")
             
         parsed_loads.append(dict_loads)
     return parsed_loads  
@@ -531,4 +579,181 @@ def extract_arrays_all_combos(solved_beam_model = FEModel3D, result_type = str,
     return result_arrays
 
 
+RESULT_DIRECTIONS = {"shear": "Fy", "moment": "Mz", "axial": None, "torque": None, "deflection": "dy"}
+
 
+@dataclass
+class ResultArrays:
+    """
+    A data type to hold the analysis results of all members for all load combos
+    in one array 'values' of shape (result, combo, member, point), labelled by
+    'result_types', 'combos' and 'members'. 'x' has the local x-coordinates
+    (member, point) that are shared by all results and combos.
+    """
+    result_types: list[str]
+    combos: list[str]
+    members: list[str]
+    x: np.ndarray
+    values: np.ndarray
+
+    def result(self, result_type: str, combo: Optional[str] = None) -> np.ndarray:
+        """
+        Returns the values of 'result_type' (combo, member, point), or
+        (member, point) for a single 'combo'
+        """
+        values = self.values[self.result_types.index(result_type)]
+        if combo is None:
+            return values
+        return values[self.combos.index(combo)]
+
+
+def extract_results(solved_beam_model: FEModel3D, n_points: int,
+                    result_directions: dict[str, Optional[str]] = RESULT_DIRECTIONS,
+                    combos: Optional[list[str]] = None) -> ResultArrays:
+    """
+    Returns the results in 'result_directions' ({result type: direction}, with
+    the result types of extract_arrays_all_combos) for all members of
+    'solved_beam_model' and all 'combos' (default: all load combos), extracted
+    in one pass over the members into a single preallocated array
+    """
+    if combos is None:
+        combos = list(solved_beam_model.LoadCombos.keys())
+    members = list(solved_beam_model.Members.values())
+    result_types = list(result_directions.keys())
+    values = np.empty((len(result_types), len(combos), len(members), n_points))
+    x = np.empty((len(members), n_points))
+    for member_idx, member in enumerate(members):
+        for combo_idx, combo_name in enumerate(combos):
+            for result_idx, (result_type, direction) in enumerate(result_directions.items()):
+                if result_type == "shear":
+                    result_array = member.shear_array(direction, n_points, combo_name)
+                elif result_type == "moment":
+                    result_array = member.moment_array(direction, n_points, combo_name)
+                elif result_type == "axial":
+                    result_array = member.axial_array(n_points, combo_name)
+                elif result_type == "torque":
+                    result_array = member.torque_array(n_points, combo_name)
+                elif result_type == "deflection":
+                    result_array = member.deflection_array(direction, n_points, combo_name)
+                else:
+                    raise ValueError(f"The result type should be one of {list(RESULT_DIRECTIONS)}, not {result_type}")
+                values[result_idx, combo_idx, member_idx] = result_array[1]
+        x[member_idx] = result_array[0]
+    return ResultArrays(
+        result_types=result_types,
+        combos=combos,
+        members=[member.name for member in members],
+        x=x,
+        values=values,
+    )
+
+
+def iter_beam_records(filename: str) -> Iterator[tuple[str, list[tuple[int, list[str]]]]]:
+    """
+    Yields the name and the lines of each beam in the file at 'filename', one
+    beam at a time. Each beam starts with a line "BEAM: name", followed by the
+    lines of the one-beam format (attributes, supports and loads). The lines are
+    split in stripped cells and come with their line numbers.
+    Empty lines and lines starting with "#" are skipped.
+    """
+    name = None
+    rows = []
+    with open(filename, "r") as file:
+        for line_no, line in enumerate(file, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            if line.upper().startswith(BEAM_HEADER):
+                if name is not None:
+                    yield name, rows
+                name = line[len(BEAM_HEADER):].strip()
+                rows = []
+            elif name is None:
+                raise ValueError(f"{filename}, line {line_no}: expected '{BEAM_HEADER} name' before the beam data")
+            else:
+                rows.append((line_no, [cell.strip() for cell in line.split(",")]))
+    if name is not None:
+        yield name, rows
+
+
+def _to_floats(cells: list[str], location: str) -> list[float]:
+    """
+    Returns the numeric 'cells' as floats
+    """
+    try:
+        return [float(cell) for cell in cells]
+    except ValueError:
+        raise ValueError(f"{location}: expected numbers, got {cells}")
+
+
+def parse_beam_record(name: str, rows: list[tuple[int, list[str]]], filename: str = "") -> dict:
+    """
+    Returns the structured beam data (as get_structured_beam_data) for one beam
+    record of iter_beam_records. Raises a ValueError with the file name and line
+    number of the first line that cannot be parsed.
+    """
+    if len(rows) < 2:
+        line_no = rows[-1][0] if rows else "end"
+        raise ValueError(f"{filename}, line {line_no}: beam '{name}' needs a line with attributes and a line with supports")
+    line_no, attributes = rows[0]
+    beam_data = {'Name': name}
+    beam_data.update(parse_beam_attributes(_to_floats(attributes, f"{filename}, line {line_no}")))
+
+    line_no, supports = rows[1]
+    try:
+        beam_data['Supports'] = parse_supports(supports)
+    except IndexError:
+        raise ValueError(f"{filename}, line {line_no}: supports should be 'coordinate' or 'coordinate:type'")
+    for coo, support_type in beam_data['Supports'].items():
+        if not isinstance(coo, float) or support_type not in SUPPORT_TYPES:
+            raise ValueError(f"{filename}, line {line_no}: support {coo}:{support_type} should be a coordinate with a type in {SUPPORT_TYPES}")
+
+    loads = []
+    for line_no, cells in rows[2:]:
+        location = f"{filename}, line {line_no}"
+        load_type, _, direction = cells[0].partition(":")
+        load_type = load_type.upper()
+        if load_type == "POINT" and len(cells) == 4 and direction:
+            load = [f"POINT:{direction}"] + _to_floats(cells[1:3], location) + [cells[3]]
+        elif load_type == "DIST" and len(cells) == 6 and direction:
+            load = [f"DIST:{direction}"] + _to_floats(cells[1:5], location) + [cells[5]]
+        elif len(cells) in [1, 3] and load_type not in ["POINT", "DIST"]:
+            load = full_length_udls([_to_floats(cells, location)], beam_data['L'])[0]
+        else:
+            raise ValueError(f"{location}: a load should be 'POINT:dir, P, x, case:name', "
+                             f"'DIST:dir, w1, w2, x1, x2, case:name', 'w, x1, x2' or 'w', got {cells}")
+        if isinstance(load[-1], str) and ":" not in load[-1]:
+            raise ValueError(f"{location}: the load case should be given as 'case:name', got {load[-1]}")
+        loads.append(load)
+    beam_data['Loads'] = parse_loads(loads)
+    return beam_data
+
+
+def read_beams(filename: str) -> Iterator[dict]:
+    """
+    Yields the structured beam data of each beam in the file at 'filename'
+    (see iter_beam_records), so that files with any number of beams are read
+    with the memory of one beam
+    """
+    for name, rows in iter_beam_records(filename):
+        yield parse_beam_record(name, rows, filename)
+
+
+def write_beams(beams_data: list[dict], filename: str) -> None:
+    """
+    Writes the structured beam data of 'beams_data' to one file at 'filename',
+    in the format read by read_beams
+    """
+    with open(filename, "w") as file:
+        for beam_data in beams_data:
+            file.write(f"{BEAM_HEADER} {beam_data['Name']}\n")
+            attributes = [beam_data[key] for key in ["L", "E", "Iz", "Iy", "A", "J", "nu", "rho"]]
+            file.write(", ".join(repr(float(value)) for value in attributes) + "\n")
+            file.write(", ".join(f"{float(coo)!r}:{support}" for coo, support in beam_data['Supports'].items()) + "\n")
+            for load in beam_data['Loads']:
+                if load['Type'] == "Point":
+                    values = [load['Magnitude'], load['Location']]
+                else:
+                    values = [load['Start Magnitude'], load['End Magnitude'], load['Start Location'], load['End Location']]
+                cells = [f"{load['Type'].upper()}:{load['Direction']}"] + [repr(float(value)) for value in values]
+                file.write(", ".join(cells + [f"case:{load['Case']}"]) + "\n")
@@ -0,0 +1,128 @@
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from PyNite import FEModel3D
+from eng_module import beams
+from eng_module import beam_cache
+from eng_module import SFRC
+
+
+@dataclass
+class ShearCapacityDiagram:
+    """
+    A data type to hold the shear capacity along the length of a beam.
+    'V', 'M' and 'VCSDT' have the shape (combo, point), with the combos
+    in the order of 'combos' and the points at the coordinates in 'x'.
+    The capacity/demand ratio is VCSDT/|V|, and its minimum over all checked
+    points is given in 'min_ratio' with its location and load combo (infinite
+    when no point with shear is checked).
+    At points where the section is not cracked in flexure (|M| <= Mcr), the
+    crack is too narrow for the critical shear displacement theory, or the
+    section has failed in flexure (|M| > Mult, see SFRC.shearcap_applicable),
+    the shear is not checked: 'checked' is False and VCSDT and the ratio are NaN
+    there. These are often the zones with high shear and low moment next to the
+    supports, which have to be checked in another way.
+    'max_unchecked_V' is the largest |V| at an unchecked point, with its location
+    and load combo (0, NaN and None when all points are checked).
+    """
+    x: np.ndarray
+    combos: list[str]
+    V: np.ndarray
+    M: np.ndarray
+    VCSDT: np.ndarray
+    ratio: np.ndarray
+    min_ratio: float
+    min_ratio_x: float
+    min_ratio_combo: str
+    checked: np.ndarray
+    max_unchecked_V: float
+    max_unchecked_V_x: float
+    max_unchecked_V_combo: Optional[str]
+
+    def unchecked_regions(self) -> list[tuple[float, float]]:
+        """
+        Returns the (start, end) of each stretch of the beam where the shear is
+        not checked for at least one combo at a point with shear
+        """
+        unchecked = (~self.checked & (np.abs(self.V) > 0)).any(axis=0)
+        # The points where a stretch starts and ends
+        edges = np.diff(np.concatenate([[0], unchecked.astype(int), [0]]))
+        starts = np.flatnonzero(edges == 1)
+        ends = np.flatnonzero(edges == -1) - 1
+        return [(float(self.x[start]), float(self.x[end])) for start, end in zip(starts, ends)]
+
+
+def member_results(solved_beam_model: FEModel3D, result_type: str, direction: str,
+                   n_points: int, combos: Optional[list[str]] = None) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns the x-coordinates and the results of 'result_type' in 'direction'
+    for all members of 'solved_beam_model', with the members placed one after
+    the other along the global X-axis.
+    The results have the shape (combo, point).
+    """
+    result_arrays = beams.extract_arrays_all_combos(solved_beam_model, result_type, direction, n_points)
+    if combos is None:
+        combos = list(result_arrays.keys())
+    members = list(solved_beam_model.Members.values())
+    x = np.concatenate([member.i_node.X + result_array[0]
+                        for member, result_array in zip(members, result_arrays[combos[0]])])
+    results = np.array([np.concatenate([result_array[1] for result_array in result_arrays[combo]])
+                        for combo in combos])
+    return x, results
+
+
+def shear_capacity_diagram(solved_beam_model: FEModel3D | beam_cache.BeamResults, section: SFRC.SFRCSection,
+                           n_points: int = 1000, combos: Optional[list[str]] = None,
+                           shear_direction: str = "Fy", moment_direction: str = "Mz",
+                           shear_scale: float = 1., moment_scale: float = 1.) -> ShearCapacityDiagram:
+    """
+    Returns the shear capacity VCSDT(x) of 'section' at 'n_points' along every
+    member of 'solved_beam_model', for every load combo in 'combos' (default: all
+    combos of the model), using the actual V-M pair at each point.
+    'shear_scale' and 'moment_scale' convert the analysis results to kN and kNm.
+    The sectional analysis of 'section' is done once, and the capacity of all
+    points of all combos is evaluated in one vectorized call.
+    'solved_beam_model' can also be the BeamResults of beam_cache.solve_beam, which
+    already have their number of points.
+    """
+    if not isinstance(solved_beam_model, FEModel3D):
+        x, V = solved_beam_model.member_results("shear", shear_direction, combos)
+        _, M = solved_beam_model.member_results("moment", moment_direction, combos)
+        combos = combos or solved_beam_model.combos
+    else:
+        if combos is None:
+            combos = list(solved_beam_model.LoadCombos.keys())
+        x, V = member_results(solved_beam_model, "shear", shear_direction, n_points, combos)
+        _, M = member_results(solved_beam_model, "moment", moment_direction, n_points, combos)
+    V = V * shear_scale
+    M = M * moment_scale
+
+    checked = section.shearcap_applicable(M=np.abs(M))
+    VCSDT = np.where(checked, section.shearcap(V=np.abs(V), M=np.abs(M))["VCSDT"], np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ratio = np.where(checked, np.where(np.abs(V) > 0, VCSDT / np.abs(V), np.inf), np.nan)
+    if np.isnan(ratio).all():
+        combo_idx, point_idx = 0, 0
+        min_ratio = np.inf
+    else:
+        combo_idx, point_idx = np.unravel_index(np.nanargmin(ratio), ratio.shape)
+        min_ratio = float(ratio[combo_idx, point_idx])
+    unchecked_V = np.where(checked, 0., np.abs(V))
+    unchecked_idx = np.unravel_index(np.argmax(unchecked_V), unchecked_V.shape)
+    max_unchecked_V = float(unchecked_V[unchecked_idx])
+
+    return ShearCapacityDiagram(
+        x=x,
+        combos=combos,
+        V=V,
+        M=M,
+        VCSDT=VCSDT,
+        ratio=ratio,
+        min_ratio=min_ratio,
+        min_ratio_x=float(x[point_idx]),
+        min_ratio_combo=combos[combo_idx],
+        checked=checked,
+        max_unchecked_V=max_unchecked_V,
+        max_unchecked_V_x=float(x[unchecked_idx[1]]) if max_unchecked_V > 0 else np.nan,
+        max_unchecked_V_combo=combos[unchecked_idx[0]] if max_unchecked_V > 0 else None,
+    )
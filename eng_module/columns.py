@@ -2,6 +2,8 @@ from dataclasses import dataclass
 import math 
 from typing import Optional
 import csv
+import numpy as np
+import pandas as pd
 from eng_module import utils 
 from eng_module import load_factors
 
@@ -22,24 +24,21 @@ class Column:
     ky: float
     
     def critical_buckling_load(self, axis: str) -> float:
-       try:
-           if axis == "x":
-                BL = euler_buckling_load(self.h, self.E, self.Ix, self.kx)
-
-           elif axis == "y":
-                BL = euler_buckling_load(self.h, self.E, self.Iy, self.ky)
-       except ValueError:
-            print("The axis should be x or y")
-       return BL
+        if axis == "x":
+            BL = euler_buckling_load(self.h, self.E, self.Ix, self.kx)
+        elif axis == "y":
+            BL = euler_buckling_load(self.h, self.E, self.Iy, self.ky)
+        else:
+            raise ValueError(f"The axis should be x or y, not {axis}")
+        return BL
     
     def radius_of_gyration(self, axis:str) -> float:
-        try:
-            if axis == "x":
-                gr = radius_of_gyration(self.A, self.Ix)
-            elif axis =="y":
-               gr = radius_of_gyration(self.A, self.Iy)
-        except ValueError:
-            print("The axis should be x or y")
+        if axis == "x":
+            gr = radius_of_gyration(self.A, self.Ix)
+        elif axis =="y":
+            gr = radius_of_gyration(self.A, self.Iy)
+        else:
+            raise ValueError(f"The axis should be x or y, not {axis}")
         return gr         
     
 
@@ -90,19 +89,84 @@ class SteelColumn(Column):
         Po = (self.fy * self.A)/1000
         if Po/Pex <= 2.25:
             Pnx = Po * (0.658**(Po/Pex))
-        elif Po/Pex > 2.25:
+        else:
             Pnx = 0.877 * Pex
-        else: 
-            print("calculation not correct for x-axis")
         if Po/Pey <= 2.25:
             Pny = Po * (0.658**(Po/Pey))
-        elif Po/Pey > 2.25:
+        else:
             Pny = 0.877 * Pey
-        else: 
-            print("calculation not correct for y-axis") 
         return self.phic * min(Pnx, Pny)
 
 
+@dataclass
+class ColumnBatch:
+    """
+    A data type to hold many steel columns as arrays with one value per column,
+    so that the capacities of all columns are calculated at once with the same
+    formulas as SteelColumn
+    """
+    h: np.ndarray
+    E: np.ndarray
+    A: np.ndarray
+    Ix: np.ndarray
+    Iy: np.ndarray
+    kx: np.ndarray
+    ky: np.ndarray
+    fy: np.ndarray
+    phic: np.ndarray
+    tags: Optional[list[str]] = None
+
+    def __post_init__(self):
+        (self.h, self.E, self.A, self.Ix, self.Iy, self.kx, self.ky, self.fy, self.phic) = [
+            np.array(values, dtype=float) for values in np.broadcast_arrays(
+                self.h, self.E, self.A, self.Ix, self.Iy, self.kx, self.ky, self.fy, self.phic)]
+
+    @classmethod
+    def from_columns(cls, steel_columns: list[SteelColumn]) -> "ColumnBatch":
+        """
+        Returns a ColumnBatch with the data of 'steel_columns'
+        """
+        return cls(**{field: [getattr(column, field) for column in steel_columns]
+                      for field in ["h", "E", "A", "Ix", "Iy", "kx", "ky", "fy", "phic"]},
+                   tags=[column.tag for column in steel_columns])
+
+    def __len__(self) -> int:
+        return len(self.h)
+
+    def critical_buckling_load(self, axis: str) -> np.ndarray:
+        if axis == "x":
+            return np.pi**2 * self.E * self.Ix / (self.kx*self.h)**2
+        elif axis == "y":
+            return np.pi**2 * self.E * self.Iy / (self.ky*self.h)**2
+        raise ValueError(f"The axis should be x or y, not {axis}")
+
+    def radius_of_gyration(self, axis: str) -> np.ndarray:
+        if axis == "x":
+            return np.sqrt(self.Ix/self.A)
+        elif axis == "y":
+            return np.sqrt(self.Iy/self.A)
+        raise ValueError(f"The axis should be x or y, not {axis}")
+
+    def factored_crushing_load(self) -> np.ndarray:
+        """
+        returns the crushing load in kN
+        """
+        Po = (self.fy * self.A)/1000
+        return self.phic * Po
+
+    def factored_compressive_resistance(self) -> np.ndarray:
+        """
+        per AASHTO chapter 6
+        """
+        Po = (self.fy * self.A)/1000
+        Pn = []
+        for axis in ["x", "y"]:
+            Pe = 0.001 * self.critical_buckling_load(axis)
+            ratio = Po/Pe
+            Pn.append(np.where(ratio <= 2.25, Po * (0.658**ratio), 0.877 * Pe))
+        return self.phic * np.minimum(*Pn)
+
+
 
 
 def csv_record_to_steelcolumn(record: list[str], **kwargs) -> SteelColumn:
@@ -160,6 +224,19 @@ def calculate_factored_csv_load(record: list[str])->float:
     return load_factors.max_factored_load(loads, load_factors.ACI_31819_COMBOS())
 
 
+def factored_column_loads(dead_loads: np.ndarray, live_loads: np.ndarray) -> np.ndarray:
+    """
+    Returns the maximum factored load in kN of the ACI 318-19 combos for the
+    'dead_loads' and 'live_loads' (in N) of many columns, as one matrix product
+    of the loads (column, load type) and the load factors (see
+    load_factors.combine_loads)
+    """
+    loads = np.zeros((len(dead_loads), len(load_factors.LOAD_TYPES)))
+    loads[:, load_factors.LOAD_TYPES.index("D")] = dead_loads
+    loads[:, load_factors.LOAD_TYPES.index("L")] = live_loads
+    return load_factors.combine_loads(loads, load_factors.ACI_31819_COMBOS()).max / 1000
+
+
 def run_all_columns(filename: str, **kwargs) -> list[SteelColumn]:
     """
     This function will read the data in the CSV file and will return a list 
@@ -169,10 +246,15 @@ def run_all_columns(filename: str, **kwargs) -> list[SteelColumn]:
     """
     csv_data = utils.read_csv_file(filename)
     csv_data.pop(0)
-    sc_list = convert_csv_data_to_steelcolumns(csv_data)
+    sc_list = convert_csv_data_to_steelcolumns(csv_data, **kwargs)
 
-    for idx, row in enumerate(csv_data):
-        fl =  calculate_factored_csv_load(row)/1000
+    factored_loads = factored_column_loads(
+        [utils.str_to_float(row[9]) for row in csv_data],
+        [utils.str_to_float(row[10]) for row in csv_data],
+    )
+
+    for idx, fl in enumerate(factored_loads):
+        fl = float(fl)
         sc_list[idx].factored_load = fl
         cap = sc_list[idx].factored_compressive_resistance()
         UC = fl/cap
@@ -199,6 +281,35 @@ def export_steelcolumn_results(SteelColumns: list[SteelColumn], export_filename:
             writer.writerow([tag, factored_load, demand_capacity_ratio])
 
 
+def run_all_columns_streaming(filename: str, export_filename: str, chunk_size: int = 100000,
+                              **kwargs) -> int:
+    """
+    Does run_all_columns and export_steelcolumn_results for the CSV file at
+    'filename' without holding all columns in memory: the file is read in chunks
+    of 'chunk_size' rows, the factored loads and demand/capacity ratios of each
+    chunk are calculated as arrays (see ColumnBatch), and the rows of the chunk
+    are appended to 'export_filename' before the next chunk is read.
+    'kwargs' are the attributes of SteelColumn that are not in the file (phic).
+    Returns the number of columns.
+    """
+    n_columns = 0
+    with open(export_filename, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(["Tag", "Factored Load (kN)", "Demand Capacity Ratio (-)"])
+        for chunk in pd.read_csv(filename, chunksize=chunk_size, dtype={0: str}, skipinitialspace=True):
+            data = chunk.to_numpy()
+            batch = ColumnBatch(
+                A=data[:, 1], h=data[:, 2], Ix=data[:, 3], Iy=data[:, 4], fy=data[:, 5],
+                E=data[:, 6], kx=data[:, 7], ky=data[:, 8],
+                phic=kwargs.get("phic", SteelColumn.phic),
+            )
+            factored_loads = factored_column_loads(data[:, 9].astype(float), data[:, 10].astype(float))
+            demand_capacity_ratios = factored_loads / batch.factored_compressive_resistance()
+            writer.writerows(zip(data[:, 0], factored_loads.tolist(), demand_capacity_ratios.tolist()))
+            n_columns += len(chunk)
+    return n_columns
+
+
 
 
     
@@ -0,0 +1,103 @@
+from dataclasses import dataclass
+from functools import lru_cache
+import numpy as np
+from scipy.optimize import brentq
+from eng_module import SFRC
+
+DESIGN_PARAMETERS = ["As", "Vf", "h"]
+
+
+@dataclass
+class DesignResult:
+    """
+    A data type to report the smallest value of a design parameter
+    for which Mult >= Md and VCSDT >= Vd
+    """
+    parameter: str
+    value: float
+    Mult: float
+    VCSDT: float
+    n_evaluations: int
+
+
+def section_with(section: dict, parameter: str, value: float) -> dict:
+    """
+    Returns a copy of 'section' (the inputs of shearcap without V and M) with
+    'parameter' set to 'value'. When the height h changes, the effective depth d
+    changes with it, so that the cover h - d stays the same.
+    """
+    new_section = dict(section)
+    new_section[parameter] = value
+    if parameter == "h":
+        new_section["d"] = value - (section["h"] - section["d"])
+    return new_section
+
+
+def capacities(section: dict, Md: float, Vd: float) -> tuple[float, float]:
+    """
+    Returns the ultimate moment Mult (kNm) and the shear capacity VCSDT (kN)
+    of 'section' for the design moment 'Md' and design shear 'Vd'.
+    Sections that the sectional analysis cannot solve get NaN, and so does
+    VCSDT when the CSDT does not apply at 'Md' (see SFRC.shearcap_applicable),
+    which minimum_design treats as not satisfying the checks.
+    """
+    Mphi = SFRC.momentcurvatureSFRC_batch(section["fc"], section["daggmax"], section["fy"], section["As"],
+                                          section["rhof"], section["Vf"], section["df"], section["lf"],
+                                          section["b"], section["d"], section["h"])
+    VCSDT = SFRC.shearcap_batch(**section, V=Vd, M=Md, Mphi=Mphi)["VCSDT"]
+    applicable = SFRC.shearcap_applicable(**section, M=Md, Mphi=Mphi)
+    return float(Mphi["Mult"]), float(np.where(applicable, VCSDT, np.nan))
+
+
+def minimum_design(section: dict, parameter: str, Md: float, Vd: float,
+                   lower: float, upper: float, n_bracket: int = 8,
+                   xtol: float = 1e-3) -> DesignResult:
+    """
+    Returns the smallest value of 'parameter' ("As", "Vf" or "h") between 'lower'
+    and 'upper' for which the section satisfies Mult >= Md and VCSDT >= Vd.
+    The range is first scanned at 'n_bracket' points to find the first value
+    that satisfies both checks, and the value is then refined with Brent's
+    method to 'xtol' (relative to the range). The evaluations are memoized,
+    so every value of the parameter is only analysed once.
+    Values for which the CSDT does not apply at 'Md' do not satisfy the shear
+    check, so the design is never taken from outside the range of the model.
+    Raises a ValueError when no value up to 'upper' satisfies the checks.
+    """
+    if parameter not in DESIGN_PARAMETERS:
+        raise ValueError(f"The design parameter should be one of {DESIGN_PARAMETERS}, not {parameter}")
+
+    @lru_cache(maxsize=None)
+    def evaluate(value: float) -> tuple[float, float]:
+        return capacities(section_with(section, parameter, value), Md, Vd)
+
+    def margin(value: float) -> float:
+        Mult, VCSDT = evaluate(value)
+        margin = np.minimum(Mult / Md, VCSDT / Vd) - 1
+        return float(margin) if np.isfinite(margin) else -1.
+
+    values = np.linspace(lower, upper, n_bracket)
+    margins = [margin(value) for value in values]
+    satisfied = [idx for idx, value in enumerate(margins) if value >= 0]
+    if not satisfied:
+        raise ValueError(f"The checks are not satisfied for {parameter} up to {upper} "
+                         f"(or the CSDT does not apply at Md = {Md})")
+    idx = satisfied[0]
+    if idx == 0:
+        value = float(lower)
+    else:
+        value = brentq(margin, values[idx - 1], values[idx], xtol=xtol * (upper - lower))
+        # brentq can end just below the root: step over it, and take the end
+        # of the bracket (which satisfies the checks) if that is not enough
+        if margin(value) < 0:
+            value = min(value + xtol * (upper - lower), values[idx])
+            if margin(value) < 0:
+                value = values[idx]
+        value = float(value)
+    Mult, VCSDT = evaluate(value)
+    return DesignResult(
+        parameter=parameter,
+        value=value,
+        Mult=Mult,
+        VCSDT=VCSDT,
+        n_evaluations=evaluate.cache_info().currsize,
+    )
@@ -0,0 +1,131 @@
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+from eng_module import beam_solver
+
+INFLUENCE_RESULTS = ["shear", "moment", "deflection", "reactions"]
+
+
+@dataclass
+class InfluenceLines:
+    """
+    A data type to hold the influence lines of a beam: the shear, moment and
+    deflection at 'sections' (section, position) and the vertical reactions
+    at 'support_x' (support, position) for a unit point load in the
+    Fy-direction (upwards) at each of 'positions'
+    """
+    sections: np.ndarray
+    positions: np.ndarray
+    support_x: np.ndarray
+    shear: np.ndarray
+    moment: np.ndarray
+    deflection: np.ndarray
+    reactions: np.ndarray
+
+
+@dataclass
+class MovingLoadEnvelope:
+    """
+    A data type to hold the envelope of a moving load train. For each result of
+    INFLUENCE_RESULTS, 'max' and 'min' have the extreme values at each section
+    (for "reactions": at each support), and 'max_position' and 'min_position'
+    the position of the first axle that causes them.
+    """
+    sections: np.ndarray
+    support_x: np.ndarray
+    max: dict[str, np.ndarray]
+    min: dict[str, np.ndarray]
+    max_position: dict[str, np.ndarray]
+    min_position: dict[str, np.ndarray]
+
+
+def unit_loads(positions: np.ndarray) -> beam_solver.BeamLoads:
+    """
+    Returns a unit point load in the Fy-direction at each of 'positions',
+    each in its own load case
+    """
+    positions = np.asarray(positions, dtype=float)
+    n_loads = len(positions)
+    empty = np.zeros(0)
+    no_case = np.zeros(0, dtype=int)
+    return beam_solver.BeamLoads(
+        cases=[str(idx) for idx in range(n_loads)],
+        point_x=positions, P=np.ones(n_loads), point_case=np.arange(n_loads),
+        couple_x=empty, C=empty, couple_case=no_case,
+        dist_a=empty, dist_b=empty, w1=empty, w2=empty, dist_case=no_case,
+    )
+
+
+def influence_lines(beam_data: dict, sections: np.ndarray, positions: np.ndarray) -> InfluenceLines:
+    """
+    Returns the influence lines at 'sections' of the beam described by 'beam_data'
+    (the input of beams.build_beam, of which the loads are not used) for unit
+    loads at 'positions'. The stiffness matrix is factorized once and all
+    positions are solved together as one multi-column right-hand side.
+    """
+    sections = np.asarray(sections, dtype=float)
+    positions = np.asarray(positions, dtype=float)
+    solution = beam_solver.solve_beam(beam_data, loads=unit_loads(positions))
+    results = solution.case_results(sections)
+    supports = np.isin(solution.support_x, [float(x) for x in beam_data['Supports']])
+    return InfluenceLines(
+        sections=sections,
+        positions=positions,
+        support_x=solution.support_x[supports],
+        shear=results["shear"].T,
+        moment=results["moment"].T,
+        deflection=results["deflection"].T,
+        reactions=solution.R[:, supports].T,
+    )
+
+
+def moving_load(beam_data: dict, axle_loads: list[float], axle_offsets: list[float] = (0.,),
+                sections: Optional[np.ndarray] = None, step: Optional[float] = None) -> MovingLoadEnvelope:
+    """
+    Returns the envelope of the load train with 'axle_loads' (in the Fy-direction,
+    so downwards loads are negative) at 'axle_offsets' from the first axle, moving
+    over the beam described by 'beam_data'. The first axle moves in steps of 'step'
+    (default: L/200) over all positions where an axle is on the beam, and the
+    positions that place an axle at (or just past) a section or a support are
+    added, as these are where the influence lines peak.
+    The influence lines are calculated once for all axle positions, and the
+    effects of all positions of the train follow from one vectorized sum.
+    'sections' defaults to 101 points along the beam.
+    """
+    L = float(beam_data['L'])
+    axle_loads = np.asarray(axle_loads, dtype=float)
+    axle_offsets = np.asarray(axle_offsets, dtype=float)
+    if sections is None:
+        sections = np.linspace(0, L, 101)
+    sections = np.asarray(sections, dtype=float)
+    if step is None:
+        step = L / 200
+
+    start = -axle_offsets.max()
+    stop = L - axle_offsets.min()
+    peaks = np.concatenate([sections, [float(x) for x in beam_data['Supports']], [0., L]])
+    # Just right of the peaks as well, for the jump in the influence line of the shear
+    peaks = np.concatenate([peaks, np.nextafter(peaks, np.inf)])
+    lead = np.concatenate([np.arange(start, stop + step, step),
+                           (peaks[:, None] - axle_offsets[None, :]).ravel()])
+    lead = np.unique(lead[(lead >= start) & (lead <= stop)])
+
+    # Position of every axle (axle, lead position), and which of them are on the beam
+    axle_x = lead[None, :] + axle_offsets[:, None]
+    on_beam = (axle_x >= 0) & (axle_x <= L)
+    positions = np.unique(axle_x[on_beam])
+    lines = influence_lines(beam_data, sections, positions)
+    axle_idx = np.searchsorted(positions, np.where(on_beam, axle_x, positions[0]))
+
+    envelope = MovingLoadEnvelope(sections=sections, support_x=lines.support_x,
+                                  max={}, min={}, max_position={}, min_position={})
+    for result in INFLUENCE_RESULTS:
+        line = getattr(lines, result)
+        effects = np.zeros((line.shape[0], len(lead)))
+        for P, idx, axle_on_beam in zip(axle_loads, axle_idx, on_beam):
+            effects += P * np.where(axle_on_beam, line[:, idx], 0.)
+        envelope.max[result] = effects.max(axis=1)
+        envelope.min[result] = effects.min(axis=1)
+        envelope.max_position[result] = lead[effects.argmax(axis=1)]
+        envelope.min_position[result] = lead[effects.argmin(axis=1)]
+    return envelope
@@ -1,20 +1,20 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+from typing import Optional
+import numpy as np
+from scipy.optimize import linprog
+
+# The load types of factor_load, in the order of the columns of the load arrays
+LOAD_TYPES = ["D", "L", "Lr", "S", "W", "R", "E"]
+
+
 def ACI_31819_COMBOS():
-    ACI_31819_COMBOS = {
-    "LC1": {"D": 1.4},
-    "LC2a": {"D": 1.2, "L": 1.6, "Lr":0.5},
-    "LC2b": {"D": 1.2, "L": 1.6, "S":0.5},
-    "LC2c": {"D": 1.2, "L": 1.6, "R":0.5},
-    "LC3a": {"D":1.2, "Lr": 1.6, "L":1.0},
-    "LC3b": {"D":1.2, "S": 1.6, "L":1.0},
-    "LC3c": {"D":1.2, "R": 1.6, "L":1.0},
-    "LC3d": {"D":1.2, "Lr": 1.6, "W":1.0},
-    "LC3e": {"D":1.2, "S": 1.6, "W":1.0},
-    "LC3f": {"D":1.2, "R": 1.6, "W":1.0},
-    "LC4": {"D": 1.2, "E": 1.0, "L": 1.0, "S":0.2},
-    "LC5": {"D": 0.9, "W": 1.0},
-    "LC6": {"D": 0.9, "E": 1.0}
-            }
-    return ACI_31819_COMBOS
+    """
+    Returns the load combos of ACI 318-19 Table 5.3.1
+    """
+    return load_combos("ACI_31819")
+
 
 def factor_load(
         D_load: float = 0., D: float = 0.,
@@ -24,21 +24,82 @@ def factor_load(
         W_load: float = 0., W: float=0.,
         R_load: float = 0., R: float=0.,
         E_load: float = 0., E: float=0.,):
-    factored_load = D_load*D + L_load*L + Lr_load*Lr + S_load*S+ W_load*W 
-    + R_load*R + E_load*E 
+    factored_load = (D_load*D + L_load*L + Lr_load*Lr + S_load*S+ W_load*W 
+                     + R_load*R + E_load*E)
     return factored_load
 
 
+def factor_matrix(load_combos: dict, load_types: list[str] = LOAD_TYPES) -> np.ndarray:
+    """
+    Returns the load factors (combo, load type) of 'load_combos' for the
+    'load_types'. Load types that are not in a combo get a factor 0.
+    """
+    factors = np.zeros((len(load_combos), len(load_types)))
+    for combo_idx, (combo_name, load_combo) in enumerate(load_combos.items()):
+        for load_type, factor in load_combo.items():
+            if load_type not in load_types:
+                raise ValueError(f"Load type {load_type} of combo {combo_name} should be one of {load_types}")
+            factors[combo_idx, load_types.index(load_type)] = factor
+    return factors
+
+
+def load_array(loads: dict, load_types: list[str] = LOAD_TYPES) -> np.ndarray:
+    """
+    Returns the loads (load type) of 'loads', a dict with the keyword arguments
+    of factor_load ("D_load", "L_load", ...) or with the load types as keys.
+    The values may also be arrays with one load per item, which gives the loads
+    (item, load type).
+    """
+    loads = {load_type.removesuffix("_load"): load for load_type, load in loads.items()}
+    unknown = set(loads) - set(load_types)
+    if unknown:
+        raise ValueError(f"Load types {sorted(unknown)} should be one of {load_types}")
+    n_items = np.broadcast(*loads.values()).shape if loads else ()
+    return np.stack([np.broadcast_to(np.asarray(loads.get(load_type, 0.), dtype=float), n_items)
+                     for load_type in load_types], axis=-1)
+
+
+@dataclass
+class CombinedLoads:
+    """
+    A data type to hold the factored loads (item, combo) of the load 'combos' and,
+    for each item, the maximum and minimum factored load and the index in 'combos'
+    of the combo that governs them
+    """
+    combos: list[str]
+    factored: np.ndarray
+    max: np.ndarray
+    min: np.ndarray
+    max_combo: np.ndarray
+    min_combo: np.ndarray
+
+
+def combine_loads(loads: np.ndarray, load_combos: dict, load_types: list[str] = LOAD_TYPES) -> CombinedLoads:
+    """
+    Returns the factored loads of 'loads' (item, load type), with the load types in
+    the order of 'load_types', for all 'load_combos', as one matrix product with the
+    factor matrix (combo, load type).
+    A single item (load type) gives the results for that item without the item axis.
+    """
+    factored = np.asarray(loads, dtype=float) @ factor_matrix(load_combos, load_types).T
+    max_combo = factored.argmax(axis=-1)
+    min_combo = factored.argmin(axis=-1)
+    return CombinedLoads(
+        combos=list(load_combos.keys()),
+        factored=factored,
+        max=np.take_along_axis(factored, max_combo[..., None], axis=-1)[..., 0],
+        min=np.take_along_axis(factored, min_combo[..., None], axis=-1)[..., 0],
+        max_combo=max_combo,
+        min_combo=min_combo,
+    )
+
+
 def max_factored_load(loads: dict, load_combos: dict) -> float:
     """
     Returns the maximum factored load from "loads" based 
     on the combination in 'load_combos'
     """
-    factored_loads = []
-    for load_combo in load_combos.values():
-        factored_load = factor_load(**loads, **load_combo)
-        factored_loads.append(factored_load)
-    return max(factored_loads)  
+    return float(combine_loads(load_array(loads), load_combos).max)
 
 
 def min_factored_load(loads: dict, load_combos: dict) -> float:
@@ -46,12 +107,113 @@ def min_factored_load(loads: dict, load_combos: dict) -> float:
     Returns the minimum factored load from "loads" based 
     on the combination in 'load_combos'
     """
-    factored_loads = []
-    for load_combo in load_combos.values():
-        factored_load = factor_load(**loads, **load_combo)
-        factored_loads.append(factored_load)
-    return min(factored_loads)  
+    return float(combine_loads(load_array(loads), load_combos).min)
+
+
+
+@dataclass
+class Envelope:
+    """
+    A data type to hold the envelope of the results of a set of load combos:
+    the maximum and minimum value at each point 'x' over all combos, and the
+    name of the combo that governs them. The points of all members follow each
+    other, and 'member' has the index of the member of each point.
+    """
+    x: np.ndarray
+    member: np.ndarray
+    max: np.ndarray
+    min: np.ndarray
+    max_combo: np.ndarray
+    min_combo: np.ndarray
+
+
+def _stack_members(result_array: list) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Returns the x-coordinates, member indices and values of the points of all
+    members in 'result_array' (a list with an array [x, values] per member)
+    """
+    x = np.concatenate([member_array[0] for member_array in result_array])
+    values = np.concatenate([member_array[1] for member_array in result_array])
+    member = np.repeat(np.arange(len(result_array)), [len(member_array[0]) for member_array in result_array])
+    return x, member, values
+
 
+def envelope(results_arrays: dict) -> Envelope:
+    """
+    Returns the envelope of 'results_arrays' (as returned by
+    beams.extract_arrays_all_combos) over all combos and members. The values of
+    all combos are stacked in one array (combo, point) and reduced at once.
+    """
+    combos = np.array(list(results_arrays.keys()))
+    x, member, _ = _stack_members(next(iter(results_arrays.values())))
+    values = np.stack([_stack_members(result_array)[2] for result_array in results_arrays.values()])
+    max_idx = values.argmax(axis=0)
+    min_idx = values.argmin(axis=0)
+    points = np.arange(values.shape[1])
+    return Envelope(
+        x=x,
+        member=member,
+        max=values[max_idx, points],
+        min=values[min_idx, points],
+        max_combo=combos[max_idx],
+        min_combo=combos[min_idx],
+    )
+
+
+class EnvelopeAccumulator:
+    """
+    Builds the envelope of load combos that are added one at a time, for
+    example while they are solved, so that the results of all combos never
+    have to be in memory at once
+    """
+
+    def __init__(self):
+        self.x = None
+        self.member = None
+        self.max = None
+        self.min = None
+        self.max_combo = None
+        self.min_combo = None
+        self.combos = []
+
+    def add(self, combo_name: str, result_array: list) -> None:
+        """
+        Adds the results of the combo 'combo_name' (a list with an array
+        [x, values] per member, as the values of beams.extract_arrays_all_combos)
+        """
+        x, member, values = _stack_members(result_array)
+        combo_idx = len(self.combos)
+        self.combos.append(combo_name)
+        if self.max is None:
+            self.x, self.member = x, member
+            self.max, self.min = values.copy(), values.copy()
+            self.max_combo = np.zeros(len(values), dtype=int)
+            self.min_combo = np.zeros(len(values), dtype=int)
+            return
+        if len(values) != len(self.max):
+            raise ValueError(f"Combo {combo_name} has {len(values)} points, the previous combos have {len(self.max)}")
+        higher = values > self.max
+        lower = values < self.min
+        self.max[higher] = values[higher]
+        self.min[lower] = values[lower]
+        self.max_combo[higher] = combo_idx
+        self.min_combo[lower] = combo_idx
+
+    def envelope(self) -> Envelope:
+        """
+        Returns the envelope of the combos that have been added
+        """
+        if self.max is None:
+            raise ValueError("No combos have been added to the envelope")
+        combos = np.array(self.combos)
+        return Envelope(
+            x=self.x,
+            member=self.member,
+            max=self.max.copy(),
+            min=self.min.copy(),
+            max_combo=combos[self.max_combo],
+            min_combo=combos[self.min_combo],
+        )
 
 
 def envelope_max(results_arrays: dict) -> list[list[float], list[float]]:
@@ -59,32 +221,183 @@ def envelope_max(results_arrays: dict) -> list[list[float], list[float]]:
     The first sublist will be the untouched x-coordinate array from the input 
     but the second sublist will be represent an array of the maximum value across 
     all load combinations for each coordinate step.
+    The points of all members follow each other (see envelope).
     """
-    x_values = results_arrays[list(results_arrays.keys())[0]][0][0]
-    max_values = [float('-inf')] * len(x_values)
-
-    for idx, result_array in enumerate(results_arrays.values()):
-        for i in range(0,len(max_values)):
-            valuearray = results_arrays[list(results_arrays.keys())[idx]][0][1]
-            if valuearray[i] > max_values[i]:
-                max_values[i] = valuearray[i]
-
-    return [x_values, max_values]  
+    results_envelope = envelope(results_arrays)
+    return [results_envelope.x, results_envelope.max]
 
 
 def envelope_min(results_arrays: dict) -> list[list[float], list[float]]:
     """
     The first sublist will be the untouched x-coordinate array from the input 
-    but the second sublist will be represent an array of the maximum value across 
+    but the second sublist will be represent an array of the minimum value across 
     all load combinations for each coordinate step.
+    The points of all members follow each other (see envelope).
+    """
+    results_envelope = envelope(results_arrays)
+    return [results_envelope.x, results_envelope.min]
+
+
+# The generators of the load combos of each design code, see register_combos
+COMBO_CODES = {}
+
+# Combination factors of EN 1990 Table A1.1 (category A buildings for "L")
+PSI_0 = {"L": 0.7, "Lr": 0.0, "S": 0.5, "W": 0.6}
+PSI_2 = {"L": 0.3, "Lr": 0.0, "S": 0.0, "W": 0.0}
+
+
+def register_combos(code: str):
+    """
+    Returns a decorator that registers a function without arguments that
+    generates the load combos ({combo name: {load type: factor}}) of 'code'.
+    The combos are only generated when they are first needed (see load_combos).
     """
-    x_values = results_arrays[list(results_arrays.keys())[0]][0][0]
-    min_values = [float('inf')] * len(x_values)
+    def register(generate_combos):
+        COMBO_CODES[code] = generate_combos
+        return generate_combos
+    return register
 
-    for idx, result_array in enumerate(results_arrays.values()):
-        for i in range(0,len(min_values)):
-            valuearray = results_arrays[list(results_arrays.keys())[idx]][0][1]
-            if valuearray[i] < min_values[i]:
-                min_values[i] = valuearray[i]
 
-    return [x_values, min_values]  
+@register_combos("ACI_31819")
+def _aci_31819_combos() -> dict:
+    return {
+    "LC1": {"D": 1.4},
+    "LC2a": {"D": 1.2, "L": 1.6, "Lr":0.5},
+    "LC2b": {"D": 1.2, "L": 1.6, "S":0.5},
+    "LC2c": {"D": 1.2, "L": 1.6, "R":0.5},
+    "LC3a": {"D":1.2, "Lr": 1.6, "L":1.0},
+    "LC3b": {"D":1.2, "S": 1.6, "L":1.0},
+    "LC3c": {"D":1.2, "R": 1.6, "L":1.0},
+    "LC3d": {"D":1.2, "Lr": 1.6, "W":1.0},
+    "LC3e": {"D":1.2, "S": 1.6, "W":1.0},
+    "LC3f": {"D":1.2, "R": 1.6, "W":1.0},
+    "LC4": {"D": 1.2, "E": 1.0, "L": 1.0, "S":0.2},
+    "LC5": {"D": 0.9, "W": 1.0},
+    "LC6": {"D": 0.9, "E": 1.0}
+            }
+
+
+@register_combos("ASCE7_16")
+def _asce7_16_combos() -> dict:
+    """
+    The strength design combos of ASCE 7-16 2.3.1, with the wind and the
+    seismic load in both directions
+    """
+    combos = {"1": {"D": 1.4}}
+    for roof in ["Lr", "S", "R"]:
+        combos[f"2 {roof}"] = {"D": 1.2, "L": 1.6, roof: 0.5}
+        combos[f"3 {roof} L"] = {"D": 1.2, roof: 1.6, "L": 1.0}
+    for sign, direction in [(1., "+"), (-1., "-")]:
+        for roof in ["Lr", "S", "R"]:
+            combos[f"3 {roof} {direction}W"] = {"D": 1.2, roof: 1.6, "W": 0.5 * sign}
+            combos[f"4 {roof} {direction}W"] = {"D": 1.2, "W": 1.0 * sign, "L": 1.0, roof: 0.5}
+        combos[f"5 {direction}W"] = {"D": 0.9, "W": 1.0 * sign}
+        combos[f"6 {direction}E"] = {"D": 1.2, "E": 1.0 * sign, "L": 1.0, "S": 0.2}
+        combos[f"7 {direction}E"] = {"D": 0.9, "E": 1.0 * sign}
+    return combos
+
+
+@register_combos("EN1990")
+def _en1990_combos() -> dict:
+    """
+    The ULS (STR) combos of EN 1990 6.10 with each variable action leading in
+    turn and any set of the others as accompanying actions (psi_0 * 1.5, or
+    absent when favourable), for the unfavourable (1.35) and favourable (1.0)
+    permanent action, and the seismic combos of 6.12b. The wind and the
+    seismic action act in both directions.
+    """
+    actions = [("L", "L", 1.), ("Lr", "Lr", 1.), ("S", "S", 1.), ("W", "+W", 1.), ("W", "-W", -1.)]
+    combos = {}
+    for gamma_G, permanent in [(1.35, "Gsup"), (1.0, "Ginf")]:
+        combos[f"6.10 {permanent}"] = {"D": gamma_G}
+        for leading, leading_name, leading_sign in actions:
+            others = [action for action in actions if action[0] != leading and PSI_0[action[0]] > 0]
+            for n_accompanying in range(len(others) + 1):
+                for accompanying in combinations(others, n_accompanying):
+                    if len({load_type for load_type, _, _ in accompanying}) < n_accompanying:
+                        continue
+                    name = " + ".join([f"6.10 {permanent}", leading_name]
+                                      + [f"psi0 {action_name}" for _, action_name, _ in accompanying])
+                    combos[name] = {"D": gamma_G, leading: 1.5 * leading_sign}
+                    for load_type, _, sign in accompanying:
+                        combos[name][load_type] = round(1.5 * PSI_0[load_type], 4) * sign
+    for sign, direction in [(1., "+"), (-1., "-")]:
+        combos[f"6.12b {direction}E"] = {"D": 1.0, "E": 1.0 * sign, "L": PSI_2["L"]}
+    return combos
+
+
+@lru_cache(maxsize=None)
+def _generated_combos(code: str) -> dict:
+    if code not in COMBO_CODES:
+        raise ValueError(f"The load combos of {code} are not known, use one of {list(COMBO_CODES)}")
+    return COMBO_CODES[code]()
+
+
+@lru_cache(maxsize=None)
+def _pruned_combos(code: str, load_signs: tuple) -> dict:
+    return prune_combos(_generated_combos(code), dict(load_signs))
+
+
+def load_combos(code: str, load_signs: Optional[dict[str, int]] = None) -> dict:
+    """
+    Returns the load combos ({combo name: {load type: factor}}) of the design
+    'code' (one of COMBO_CODES). With 'load_signs', only the combos that can
+    govern for the loads present are returned (see prune_combos).
+    The combos of each code, and of each set of load signs, are generated once.
+    """
+    if load_signs is None:
+        combos = _generated_combos(code)
+    else:
+        combos = _pruned_combos(code, tuple(sorted(load_signs.items())))
+    return {combo_name: dict(factors) for combo_name, factors in combos.items()}
+
+
+def _is_dominated(factors: np.ndarray, idx: int, signs: np.ndarray, sense: int) -> bool:
+    """
+    Returns True if a convex combination of the other 'factors' (combo, load type)
+    gives an effect at least as large as combo 'idx' ('sense' 1, for the maximum)
+    or at least as small ('sense' -1, for the minimum) for any effects that have
+    the 'signs' (0 for both signs) of each load type
+    """
+    others = np.delete(factors, idx, axis=0).T
+    target = factors[idx]
+    free = signs == 0
+    n_others = others.shape[1]
+    A_eq = np.vstack([others[free], np.ones((1, n_others))])
+    b_eq = np.append(target[free], 1.)
+    # sense * sign * (others @ weights - target) >= 0
+    scale = (sense * signs[~free])[:, None]
+    result = linprog(np.zeros(n_others), A_ub=-scale * others[~free], b_ub=-scale[:, 0] * target[~free],
+                     A_eq=A_eq, b_eq=b_eq, bounds=(0, None), method="highs")
+    return result.status == 0
+
+
+def prune_combos(load_combos: dict, load_signs: dict[str, int]) -> dict:
+    """
+    Returns the combos of 'load_combos' that can govern the maximum or the minimum
+    of a result for the load types in 'load_signs' ({load type: sign}), the load
+    types that are present. The sign is 1 or -1 when the effects of a load type
+    on the result always have that sign (e.g. the axial force of gravity loads on
+    a column) and 0 when they can have either sign.
+    Load types that are not present are ignored, so combos that only differ in
+    those are duplicates, of which the first is kept. A combo is pruned when, for
+    any effects with these signs, some mix of the other combos gives a larger (or
+    equal) effect and some mix gives a smaller (or equal) effect, as one of those
+    combos then governs instead.
+    """
+    load_types = list(load_signs.keys())
+    signs = np.sign([load_signs[load_type] for load_type in load_types])
+    factors = factor_matrix(
+        {combo_name: {load_type: factor for load_type, factor in combo.items() if load_type in load_signs}
+         for combo_name, combo in load_combos.items()},
+        load_types)
+    _, first = np.unique(factors, axis=0, return_index=True)
+    unique = np.sort(first)
+    factors = factors[unique]
+    if len(unique) < 2:
+        keep = unique
+    else:
+        keep = [combo_idx for idx, combo_idx in enumerate(unique)
+                if not (_is_dominated(factors, idx, signs, 1) and _is_dominated(factors, idx, signs, -1))]
+    combo_names = list(load_combos.keys())
+    return {combo_names[combo_idx]: load_combos[combo_names[combo_idx]] for combo_idx in keep}
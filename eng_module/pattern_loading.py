@@ -0,0 +1,115 @@
+from dataclasses import dataclass
+import numpy as np
+from eng_module import beam_solver
+
+PATTERN_RESULTS = ["shear", "moment", "deflection"]
+
+
+@dataclass
+class PatternEnvelope:
+    """
+    A data type to hold the envelope of the pattern (skip-span) loading of a beam.
+    'max' and 'min' have the extreme values (point) of each result at 'x' over all
+    arrangements of the pattern load on the 'spans' ((start, end) of each span).
+    'max_pattern' and 'min_pattern' (point, span) are True for the spans that are
+    loaded in the governing arrangement, and 'governing_patterns' lists the
+    distinct arrangements that govern anywhere: all other arrangements cannot
+    govern and never need to be analysed.
+    """
+    x: np.ndarray
+    spans: np.ndarray
+    max: dict[str, np.ndarray]
+    min: dict[str, np.ndarray]
+    max_pattern: dict[str, np.ndarray]
+    min_pattern: dict[str, np.ndarray]
+    governing_patterns: np.ndarray
+
+
+def beam_spans(beam_data: dict) -> np.ndarray:
+    """
+    Returns the (start, end) of each span of the beam: the parts between two
+    supports, and the cantilevers at the ends
+    """
+    bounds = np.unique([0., float(beam_data['L'])] + [float(x) for x in beam_data['Supports']
+                                                      if 0 <= x <= beam_data['L']])
+    return np.stack([bounds[:-1], bounds[1:]], axis=1)
+
+
+def split_by_span(loads: beam_solver.BeamLoads, case: str, spans: np.ndarray) -> beam_solver.BeamLoads:
+    """
+    Returns 'loads' with the loads of 'case' replaced by one load case per span,
+    named "{case} span {idx}". Distributed loads over more than one span are cut
+    at the supports, and a point load on a support goes to the span on its right.
+    The load cases of the other loads keep their index.
+    """
+    n_cases = len(loads.cases)
+    case_idx = loads.cases.index(case)
+
+    def span_case(x: np.ndarray) -> np.ndarray:
+        """
+        Returns the index of the load case of the span of each of 'x'
+        """
+        return n_cases + np.clip(np.searchsorted(spans[:, 0], x, side="right") - 1, 0, len(spans) - 1)
+
+    point_case = np.where(loads.point_case == case_idx, span_case(loads.point_x), loads.point_case)
+    couple_case = np.where(loads.couple_case == case_idx, span_case(loads.couple_x), loads.couple_case)
+
+    dists = []
+    for a, b, start_w, end_w, load_case in zip(loads.dist_a, loads.dist_b, loads.w1, loads.w2, loads.dist_case):
+        if load_case != case_idx:
+            dists.append((a, b, start_w, end_w, load_case))
+            continue
+        for span_idx, (start, end) in enumerate(spans):
+            cut_a, cut_b = max(a, start), min(b, end)
+            if cut_b > cut_a:
+                dists.append((cut_a, cut_b,
+                              start_w + (end_w - start_w) * (cut_a - a) / (b - a),
+                              start_w + (end_w - start_w) * (cut_b - a) / (b - a),
+                              n_cases + span_idx))
+    dists = np.array(dists, dtype=float).reshape(-1, 5)
+
+    return beam_solver.BeamLoads(
+        cases=loads.cases + [f"{case} span {idx}" for idx in range(len(spans))],
+        point_x=loads.point_x, P=loads.P, point_case=point_case,
+        couple_x=loads.couple_x, C=loads.C, couple_case=couple_case,
+        dist_a=dists[:, 0], dist_b=dists[:, 1], w1=dists[:, 2], w2=dists[:, 3],
+        dist_case=dists[:, 4].astype(int),
+    )
+
+
+def pattern_envelope(beam_data: dict, pattern_case: str, factors: dict[str, float],
+                     n_points: int = 301) -> PatternEnvelope:
+    """
+    Returns the envelope of the load combo with 'factors' ({load case: factor})
+    on the beam described by 'beam_data', with the loads of 'pattern_case'
+    (e.g. the live load) applied to any arrangement of the spans.
+    The loads of 'pattern_case' are split in one load case per span, and all
+    cases are solved at once. As the results are linear, the envelope of all
+    2**n arrangements follows from adding, at each point, all positive (for the
+    maximum) or negative (for the minimum) contributions of the spans, so its
+    cost grows with the number of spans and not with the number of arrangements.
+    """
+    spans = beam_spans(beam_data)
+    loads = split_by_span(beam_solver.BeamLoads.from_beam_data(beam_data), pattern_case, spans)
+    solution = beam_solver.solve_beam(beam_data, loads=loads)
+    x = np.linspace(0, float(beam_data['L']), n_points)
+    results = solution.case_results(x)
+
+    n_spans = len(spans)
+    case_factors = np.array([factors.get(case, 0.) for case in loads.cases[:-n_spans]])
+    case_factors[loads.cases.index(pattern_case)] = 0.
+    pattern_factor = factors.get(pattern_case, 0.)
+
+    envelope = PatternEnvelope(x=x, spans=spans, max={}, min={}, max_pattern={}, min_pattern={},
+                               governing_patterns=np.zeros((0, n_spans), dtype=bool))
+    patterns = []
+    for result in PATTERN_RESULTS:
+        fixed = case_factors @ results[result][:-n_spans]
+        span_effects = pattern_factor * results[result][-n_spans:]
+        envelope.max[result] = fixed + np.maximum(span_effects, 0.).sum(axis=0)
+        envelope.min[result] = fixed + np.minimum(span_effects, 0.).sum(axis=0)
+        envelope.max_pattern[result] = (span_effects > 0).T
+        envelope.min_pattern[result] = (span_effects < 0).T
+        patterns.extend([envelope.max_pattern[result], envelope.min_pattern[result]])
+    envelope.governing_patterns = np.unique(np.concatenate(patterns), axis=0)
+    return envelope
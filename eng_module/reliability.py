@@ -0,0 +1,197 @@
+from dataclasses import dataclass
+import math
+import numpy as np
+from scipy import stats
+from eng_module import SFRC
+
+SHEAR_INPUTS = ["fc", "daggmax", "fy", "As", "phibar", "ns",
+                "rhof", "Vf", "df", "lf", "b", "d", "h"]
+SFRC_MPHI_INPUTS = ["fc", "daggmax", "fy", "As", "rhof", "Vf", "df", "lf", "b", "d", "h"]
+
+
+@dataclass
+class RandomVariable:
+    """
+    A data type to describe a random variable by its distribution, mean
+    and coefficient of variation.
+    The distribution can be "normal", "lognormal" or "gumbel" (maximum).
+    """
+    distribution: str
+    mean: float
+    cov: float
+
+    def sample(self, rng: np.random.Generator, size: int) -> np.ndarray:
+        """
+        Returns 'size' samples of the random variable drawn with 'rng'
+        """
+        std = self.mean * self.cov
+        if self.distribution == "normal":
+            return rng.normal(self.mean, std, size)
+        elif self.distribution == "lognormal":
+            sigma_ln = math.sqrt(math.log(1 + self.cov**2))
+            mu_ln = math.log(self.mean) - sigma_ln**2 / 2
+            return rng.lognormal(mu_ln, sigma_ln, size)
+        elif self.distribution == "gumbel":
+            scale = math.sqrt(6) * std / math.pi
+            loc = self.mean - np.euler_gamma * scale
+            return rng.gumbel(loc, scale, size)
+        raise ValueError(f"The distribution should be normal, lognormal or gumbel, not {self.distribution}")
+
+
+@dataclass
+class ReliabilityResults:
+    """
+    A data type to report the results of a Monte Carlo reliability analysis.
+    'n_unchecked' samples fall outside the range of the capacity model and are
+    not part of the failure probability, so 'pf' is conditional on the model
+    applying, which it does for the fraction 'fraction_checked' of the samples.
+    'pf_ci' and 'beta_ci' are the (lower, upper) bounds of the confidence
+    interval, and 'gamma_R' is the partial factor on the shear capacity for
+    the target reliability index of the analysis. The capacity statistics are
+    from the 'n_valid' samples for which the model applies at the mean demand,
+    and are NaN when there are none.
+    """
+    n_samples: int
+    n_unchecked: int
+    fraction_checked: float
+    n_valid: int
+    n_failures: int
+    n_invalid: int
+    pf: float
+    pf_ci: tuple[float, float]
+    beta: float
+    beta_ci: tuple[float, float]
+    capacity_mean: float
+    capacity_cov: float
+    gamma_R: float
+
+
+def reliability_index(pf: float) -> float:
+    """
+    Returns the reliability index beta for the failure probability 'pf'
+    """
+    return float(-stats.norm.ppf(pf))
+
+
+def wilson_interval(n_failures: int, n_samples: int, confidence: float = 0.95) -> tuple[float, float]:
+    """
+    Returns the Wilson score interval of the failure probability for
+    'n_failures' out of 'n_samples'
+    """
+    z = stats.norm.ppf(0.5 + confidence / 2)
+    p = n_failures / n_samples
+    center = (p + z**2 / (2 * n_samples)) / (1 + z**2 / n_samples)
+    half_width = (z * math.sqrt(p * (1 - p) / n_samples + z**2 / (4 * n_samples**2))
+                  / (1 + z**2 / n_samples))
+    return max(center - half_width, 0.), min(center + half_width, 1.)
+
+
+def partial_factor(capacity_cov: float, target_beta: float = 3.8,
+                   alpha_R: float = 0.8, k_characteristic: float = 1.645) -> float:
+    """
+    Returns the partial factor on the capacity for 'target_beta', for a
+    lognormal capacity with coefficient of variation 'capacity_cov'
+    (design value method of EN 1990 Annex C, with the sensitivity
+    factor 'alpha_R' and the characteristic value at the 5% fractile)
+    """
+    sigma_ln = math.sqrt(math.log(1 + capacity_cov**2))
+    return math.exp((alpha_R * target_beta - k_characteristic) * sigma_ln)
+
+
+def monte_carlo_shearcap(section: dict, random_variables: dict[str, RandomVariable],
+                         demand: RandomVariable, shear_span: float,
+                         model_uncertainty: RandomVariable = RandomVariable("lognormal", 1.0, 0.2),
+                         n_samples: int = 1_000_000, chunk_size: int = 100_000, seed: int = 0,
+                         confidence: float = 0.95, target_beta: float = 3.8) -> ReliabilityResults:
+    """
+    Returns the failure probability and reliability index of the shear capacity
+    of the CSDT model (SFRC.shearcap) by Monte Carlo simulation.
+    'section' has the nominal values of the inputs of shearcap (without V and M),
+    and 'random_variables' replaces some of them by random variables.
+    'demand' is the random shear force (kN), and the moment at the section
+    follows from the 'shear_span' (mm) as M = V*shear_span/1000 (kNm).
+    The limit state is theta*VCSDT(V, M) - V, with theta the 'model_uncertainty'.
+    The samples are drawn and evaluated in chunks of 'chunk_size', so the memory
+    use does not depend on 'n_samples'. For the same 'seed' and 'chunk_size'
+    the results are the same.
+    Samples for which the CSDT does not apply (the section is not cracked in
+    flexure, or the crack is too narrow, see SFRC.shearcap_applicable) have a
+    meaningless capacity. They are reported in 'n_unchecked' and left out, so
+    the failure probability is conditional on the model applying (for the 
+    fraction 'fraction_checked' of the samples), and a ValueError is raised 
+    when it applies to none of them.
+    Other samples for which the capacity cannot be calculated count as failures
+    and are reported in 'n_invalid'.
+    The capacity statistics (theta*VCSDT) and the partial factor gamma_R for
+    'target_beta' are for the mean demand, so that they describe the scatter of
+    the capacity and not that of the demand (VCSDT depends on V and M). When
+    the model does not apply at the mean demand for any sample, they are NaN.
+    """
+    seeds = np.random.SeedSequence(seed).spawn(math.ceil(n_samples / chunk_size))
+    M_mean = demand.mean*shear_span/1000
+    n_failures = 0
+    n_invalid = 0
+    n_unchecked = 0
+    n_valid = 0
+    sum_ln = 0.
+    sum_ln2 = 0.
+    sum_R = 0.
+    sum_R2 = 0.
+    for chunk_idx, chunk_seed in enumerate(seeds):
+        size = min(chunk_size, n_samples - chunk_idx * chunk_size)
+        rng = np.random.default_rng(chunk_seed)
+        inputs = {name: section[name] for name in SHEAR_INPUTS}
+        for name, random_variable in random_variables.items():
+            inputs[name] = random_variable.sample(rng, size)
+        V = demand.sample(rng, size)
+        theta = model_uncertainty.sample(rng, size)
+        M = V*shear_span/1000
+        Mphi = SFRC.momentcurvatureSFRC_batch(*[inputs[name] for name in SFRC_MPHI_INPUTS])
+        checked = SFRC.shearcap_applicable(**inputs, M=M, Mphi=Mphi)
+        n_unchecked += int(np.sum(~checked))
+        VCSDT = SFRC.shearcap_batch(**inputs, V=V, M=M, Mphi=Mphi)["VCSDT"]
+        R = (theta * VCSDT)[checked]
+        V = V[checked]
+
+        invalid = ~np.isfinite(R) | (R <= 0)
+        n_invalid += int(invalid.sum())
+        n_failures += int(np.sum(invalid | (R < V)))
+
+        # The capacity at the mean demand, where the model applies
+        nominal = np.broadcast_to(SFRC.shearcap_applicable(**inputs, M=M_mean, Mphi=Mphi), size)
+        VCSDT = SFRC.shearcap_batch(**inputs, V=demand.mean, M=M_mean, Mphi=Mphi)["VCSDT"]
+        R = (theta * VCSDT)[nominal]
+        R = R[np.isfinite(R) & (R > 0)]
+        n_valid += len(R)
+        sum_R += R.sum()
+        sum_R2 += np.sum(R**2)
+        sum_ln += np.log(R).sum()
+        sum_ln2 += np.sum(np.log(R)**2)
+
+    n_checked = n_samples - n_unchecked
+    if n_checked == 0:
+        raise ValueError("The shear capacity model does not apply to any of the samples")
+    pf = n_failures / n_checked
+    pf_ci = wilson_interval(n_failures, n_checked, confidence)
+    if n_valid > 0:
+        capacity_mean = sum_R / n_valid
+        capacity_cov = math.sqrt(max(sum_R2 / n_valid - capacity_mean**2, 0.)) / capacity_mean
+        sigma_ln = math.sqrt(max(sum_ln2 / n_valid - (sum_ln / n_valid)**2, 0.))
+        gamma_R = partial_factor(math.sqrt(math.exp(sigma_ln**2) - 1), target_beta)
+    else:
+        capacity_mean = capacity_cov = gamma_R = math.nan
+    return ReliabilityResults(
+        n_samples=n_samples,
+        n_unchecked=n_unchecked,
+        fraction_checked=n_checked / n_samples,
+        n_valid=n_valid,
+        n_failures=n_failures,
+        n_invalid=n_invalid,
+        pf=pf,
+        pf_ci=pf_ci,
+        beta=reliability_index(pf),
+        beta_ci=(reliability_index(pf_ci[1]), reliability_index(pf_ci[0])),
+        capacity_mean=capacity_mean,
+        capacity_cov=capacity_cov,
+        gamma_R=gamma_R,
+    )
@@ -0,0 +1,81 @@
+from dataclasses import dataclass
+import numpy as np
+from PyNite import FEModel3D
+from eng_module import beam_solver
+from eng_module import checks
+
+RESULT_DIRECTIONS = {"shear": "Fy", "moment": "Mz", "deflection": "dy"}
+
+
+def combo_matrix(combos: dict[str, dict[str, float]], cases: list[str]) -> np.ndarray:
+    """
+    Returns the factors (combo, case) of the load 'combos' on the load 'cases'.
+    Load cases that are not in a combo get a factor 0, and factors on load cases
+    that are not in 'cases' (no loads of that type on the beam) are ignored.
+    """
+    factors = np.zeros((len(combos), len(cases)))
+    for combo_idx, combo_factors in enumerate(combos.values()):
+        for case_idx, case in enumerate(cases):
+            factors[combo_idx, case_idx] = combo_factors.get(case, 0.)
+    return factors
+
+
+@dataclass
+class LoadCaseResults:
+    """
+    A data type to hold the shear, moment and deflection of each load case of a
+    linear beam model, solved once. 'results' has an array (case, point) for
+    each result type, at the coordinates 'x'.
+    The results of any load combo follow from superposition, so adding load
+    combos does not need another analysis.
+    """
+    cases: list[str]
+    x: np.ndarray
+    results: dict[str, np.ndarray]
+
+    def combine(self, combos: dict[str, dict[str, float]]) -> dict[str, np.ndarray]:
+        """
+        Returns the results (combo, point) of the load 'combos' for each result
+        type, as one (combo, case) @ (case, point) product per result type
+        """
+        factors = combo_matrix(combos, self.cases)
+        return {result_type: factors @ values for result_type, values in self.results.items()}
+
+    def extract_arrays_all_combos(self, combos: dict[str, dict[str, float]],
+                                  result_type: str) -> dict[str, list[np.ndarray]]:
+        """
+        Returns the results of 'result_type' for the load 'combos' in the form of
+        beams.extract_arrays_all_combos, for a beam with one member
+        """
+        values = self.combine(combos)[result_type]
+        return {combo: [np.array([self.x, value])] for combo, value in zip(combos, values)}
+
+
+def solve_load_cases(beam_data: dict, n_points: int = 300) -> LoadCaseResults:
+    """
+    Returns the results of each load case in 'beam_data' (the input of
+    beams.build_beam) at 'n_points', solved with beam_solver for all cases at once
+    """
+    solution = beam_solver.solve_beam(beam_data)
+    x = np.linspace(0, solution.L, n_points)
+    results = solution.case_results(x)
+    return LoadCaseResults(
+        cases=solution.loads.cases,
+        x=x,
+        results={result_type: results[result_type] for result_type in RESULT_DIRECTIONS},
+    )
+
+
+def load_case_results(solved_beam_model: FEModel3D, n_points: int = 300) -> LoadCaseResults:
+    """
+    Returns the results of each load case of 'solved_beam_model' at 'n_points'
+    along every member. The load cases are the combos with a factor 1 on a
+    single load case of the same name, as added by beams.build_beam, so the
+    model only has to be analysed for those.
+    """
+    cases = [combo_name for combo_name, load_combo in solved_beam_model.LoadCombos.items()
+             if load_combo.factors == {combo_name: 1.0}]
+    results = {}
+    for result_type, direction in RESULT_DIRECTIONS.items():
+        x, results[result_type] = checks.member_results(solved_beam_model, result_type, direction, n_points, cases)
+    return LoadCaseResults(cases=cases, x=x, results=results)
@@ -0,0 +1,193 @@
+from dataclasses import dataclass
+import itertools
+import numpy as np
+from eng_module import SFRC
+from eng_module import sweeps
+
+# Factor on the estimated interpolation error, to cover the variation of the
+# second derivatives within a cell that the samples of the table do not see
+ERROR_SAFETY_FACTOR = 2.
+
+
+@dataclass
+class ShearSurrogate:
+    """
+    A data type to hold a lookup table of the shear capacity VCSDT of SFRC.shearcap.
+    The table is tabulated on the grid 'axes' (a sorted array of values for each
+    input that varies) with the other inputs of shearcap fixed at 'fixed'.
+    'applicable' is True at the grid points where the CSDT applies (see 
+    SFRC.shearcap_applicable), and the table is NaN at the other points.
+    'cell_error' is the estimated maximum interpolation error of each grid cell,
+    which is infinite for the cells with a corner where the CSDT does not apply.
+
+    Assumptions:
+        - The error estimate is ERROR_SAFETY_FACTOR times the largest of the error 
+          at the center of the cell and the multilinear error bound h**2/8*|f''| 
+          along each axis, with the second derivatives from finite differences
+          of the table. It is an estimate from samples of the function, not a 
+          strict bound.
+    """
+    axes: dict[str, np.ndarray]
+    fixed: dict[str, float]
+    table: np.ndarray
+    applicable: np.ndarray
+    cell_error: np.ndarray
+
+    @classmethod
+    def build(cls, axes: dict[str, list], fixed: dict[str, float], chunk_size: int = 100_000) -> "ShearSurrogate":
+        """
+        Returns a surrogate with VCSDT tabulated on the grid 'axes', with the other
+        inputs of shearcap set to 'fixed'. The table is evaluated in chunks
+        of 'chunk_size' grid points.
+        Raises a ValueError when an axis does not have at least 2 strictly
+        increasing values.
+        """
+        axes = {name: np.asarray(values, dtype=float) for name, values in axes.items()}
+        missing = set(sweeps.SHEAR_INPUTS) - set(axes) - set(fixed)
+        if missing:
+            raise KeyError(f"The surrogate inputs are missing {sorted(missing)}")
+        for name, values in axes.items():
+            if values.ndim != 1 or len(values) < 2 or np.any(np.diff(values) <= 0):
+                raise ValueError(f"The axis {name} should have at least 2 strictly increasing values")
+        table, applicable = _tabulate(axes, fixed, chunk_size)
+
+        # Error at the cell centers
+        centers = {name: (values[:-1] + values[1:]) / 2 for name, values in axes.items()}
+        exact, _ = _tabulate(centers, fixed, chunk_size)
+        grid = np.meshgrid(*centers.values(), indexing="ij")
+        interpolated = _interpolate(axes, table, [g.ravel() for g in grid]).reshape(exact.shape)
+        cell_error = np.abs(exact - interpolated)
+
+        # Error bound from the second differences along each axis
+        for axis, values in enumerate(axes.values()):
+            if len(values) < 3:
+                continue
+            step = np.diff(values)
+            slope = np.diff(table, axis=axis) / _along(step, axis, table.ndim)
+            curvature = np.abs(np.diff(slope, axis=axis)) / _along((step[:-1] + step[1:]) / 2, axis, table.ndim)
+            # The curvature of a cell is the largest of its neighbouring nodes, on all its corners
+            curvature = np.maximum(_pad_edge(curvature, axis, before=True), _pad_edge(curvature, axis, before=False))
+            for other in range(table.ndim):
+                if other != axis:
+                    curvature = np.maximum(np.take(curvature, range(curvature.shape[other] - 1), axis=other),
+                                           np.take(curvature, range(1, curvature.shape[other]), axis=other))
+            cell_error = np.maximum(cell_error, _along(step, axis, table.ndim)**2 / 8 * curvature)
+
+        cell_error = np.where(np.isfinite(cell_error), ERROR_SAFETY_FACTOR * cell_error, np.inf)
+        return cls(axes=axes, fixed=dict(fixed), table=table.astype(np.float32),
+                   applicable=applicable, cell_error=cell_error.astype(np.float32))
+
+    def save(self, filename: str) -> None:
+        """
+        Writes the surrogate to a compressed NumPy file at 'filename'
+        """
+        arrays = {f"axis_{name}": values for name, values in self.axes.items()}
+        arrays.update({f"fixed_{name}": np.asarray(value) for name, value in self.fixed.items()})
+        np.savez_compressed(filename, table=self.table, applicable=self.applicable, 
+                            cell_error=self.cell_error,
+                            axes_order=np.array(list(self.axes.keys())), **arrays)
+
+    @classmethod
+    def load(cls, filename: str) -> "ShearSurrogate":
+        """
+        Returns the surrogate saved at 'filename'
+        """
+        with np.load(filename) as data:
+            axes = {name: data[f"axis_{name}"] for name in data["axes_order"]}
+            fixed = {key.removeprefix("fixed_"): float(data[key]) for key in data.files if key.startswith("fixed_")}
+            return cls(axes=axes, fixed=fixed, table=data["table"], applicable=data["applicable"],
+                       cell_error=data["cell_error"])
+
+    def query(self, max_error: float = 0.1, **inputs) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns VCSDT (kN) for the values of the grid inputs in 'inputs' (floats or
+        arrays), by multilinear interpolation in the table.
+        Points outside the grid, or in a cell with an estimated error larger than
+        'max_error' (kN), are calculated with SFRC.shearcap_batch instead. This
+        includes the cells with a corner where the CSDT does not apply, and the
+        exact VCSDT is NaN where the CSDT does not apply at the point itself.
+        Also returns a boolean array that is True where the exact function was used.
+        """
+        values = np.broadcast_arrays(*[np.asarray(inputs[name], dtype=float) for name in self.axes])
+        shape = values[0].shape
+        points = [value.ravel() for value in values]
+
+        cells = [np.clip(np.searchsorted(axis, point, side="right") - 1, 0, len(axis) - 2)
+                 for axis, point in zip(self.axes.values(), points)]
+        inside = np.all([(point >= axis[0]) & (point <= axis[-1])
+                         for axis, point in zip(self.axes.values(), points)], axis=0)
+        error = self.cell_error[tuple(cells)]
+        exact = ~inside | (error > max_error)
+
+        result = _interpolate(self.axes, self.table, points, cells).astype(float)
+        if exact.any():
+            exact_inputs = dict(self.fixed)
+            exact_inputs.update({name: point[exact] for name, point in zip(self.axes, points)})
+            result[exact] = _shear_capacity(exact_inputs)
+        return result.reshape(shape), exact.reshape(shape)
+
+
+def _shear_capacity(inputs: dict) -> np.ndarray:
+    """
+    Returns VCSDT for 'inputs' (the inputs of SFRC.shearcap_batch), with NaN
+    where the CSDT does not apply (see SFRC.shearcap_applicable)
+    """
+    Mphi = SFRC.momentcurvatureSFRC_batch(*[inputs[name] for name in sweeps.MPHI_INPUTS])
+    VCSDT = SFRC.shearcap_batch(**inputs, Mphi=Mphi)["VCSDT"]
+    applicable = SFRC.shearcap_applicable(**{name: value for name, value in inputs.items() if name != "V"},
+                                          Mphi=Mphi)
+    return np.where(applicable, VCSDT, np.nan)
+
+
+def _tabulate(axes: dict[str, np.ndarray], fixed: dict[str, float], chunk_size: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Returns VCSDT on the grid 'axes' with the other inputs at 'fixed', with NaN
+    where the CSDT does not apply, and the mask of the points where it applies
+    """
+    shape = [len(values) for values in axes.values()]
+    size = int(np.prod(shape))
+    table = np.empty(size)
+    for start in range(0, size, chunk_size):
+        stop = min(start + chunk_size, size)
+        inputs = dict(fixed)
+        inputs.update(sweeps.grid_chunk(axes, start, stop))
+        table[start:stop] = _shear_capacity(inputs)
+    table = table.reshape(shape)
+    return table, ~np.isnan(table)
+
+
+def _interpolate(axes: dict[str, np.ndarray], table: np.ndarray, points: list[np.ndarray],
+                 cells: list[np.ndarray] = None) -> np.ndarray:
+    """
+    Returns the multilinear interpolation of 'table' on the grid 'axes' at 'points'
+    """
+    if cells is None:
+        cells = [np.clip(np.searchsorted(axis, point, side="right") - 1, 0, len(axis) - 2)
+                 for axis, point in zip(axes.values(), points)]
+    weights = [(point - axis[cell]) / (axis[cell + 1] - axis[cell])
+               for axis, point, cell in zip(axes.values(), points, cells)]
+    result = np.zeros(len(points[0]))
+    for corner in itertools.product([0, 1], repeat=len(points)):
+        weight = np.ones(len(points[0]))
+        for offset, w in zip(corner, weights):
+            weight = weight * (w if offset else 1 - w)
+        result += weight * table[tuple(cell + offset for cell, offset in zip(cells, corner))]
+    return result
+
+
+def _along(values: np.ndarray, axis: int, ndim: int) -> np.ndarray:
+    """
+    Returns 'values' reshaped to broadcast along 'axis' of an array with 'ndim' dimensions
+    """
+    shape = [1] * ndim
+    shape[axis] = len(values)
+    return values.reshape(shape)
+
+
+def _pad_edge(values: np.ndarray, axis: int, before: bool) -> np.ndarray:
+    """
+    Returns 'values' with its first (before) or last slice along 'axis' repeated
+    """
+    pad = [(0, 0)] * values.ndim
+    pad[axis] = (1, 0) if before else (0, 1)
+    return np.pad(values, pad, mode="edge")
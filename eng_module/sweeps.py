@@ -0,0 +1,222 @@
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+import os
+import time
+import numpy as np
+import pandas as pd
+from eng_module import SFRC
+
+MPHI_INPUTS = ["fc", "daggmax", "fy", "As", "rhof", "Vf", "df", "lf", "b", "d", "h"]
+SHEAR_INPUTS = ["fc", "daggmax", "fy", "As", "phibar", "ns",
+                "rhof", "Vf", "df", "lf", "b", "d", "h", "V", "M"]
+
+
+@dataclass
+class SweepStats:
+    """
+    A data type to report the size and the throughput of a sweep
+    """
+    n_total: int
+    n_evaluated: int
+    n_skipped: int
+    elapsed: float
+
+    @property
+    def rate(self) -> float:
+        """
+        Returns the number of evaluations per second
+        """
+        if self.elapsed == 0:
+            return 0.
+        return self.n_evaluated / self.elapsed
+
+
+def grid_size(params: dict[str, list] | list[dict]) -> int:
+    """
+    Returns the number of parameter sets in 'params', which is either
+    a grid (a dict with a list of values for each parameter) or a list
+    of parameter dicts
+    """
+    if isinstance(params, dict):
+        return int(np.prod([len(values) for values in params.values()]))
+    return len(params)
+
+
+def grid_chunk(params: dict[str, list] | list[dict], start: int, stop: int) -> dict[str, np.ndarray]:
+    """
+    Returns the parameter sets 'start' to 'stop' of 'params' as a dict of arrays.
+    For a grid, the parameter sets are generated from their index, so the full
+    grid is never built in memory.
+    """
+    if isinstance(params, dict):
+        names = list(params.keys())
+        shape = [len(values) for values in params.values()]
+        indices = np.unravel_index(np.arange(start, stop), shape)
+        return {name: np.asarray(params[name])[idx] for name, idx in zip(names, indices)}
+    records = params[start:stop]
+    return {name: np.array([record[name] for record in records]) for name in records[0].keys()}
+
+
+def evaluate_chunk(inputs: dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Returns a DataFrame with the inputs and the results of momentcurvatureSFRC_batch
+    for all parameter sets in 'inputs'. When 'inputs' also has V and M, the results
+    of shearcap_batch are added.
+    """
+    missing = [name for name in MPHI_INPUTS if name not in inputs]
+    if missing:
+        raise KeyError(f"The sweep parameters are missing {missing}")
+    results = dict(inputs)
+    Mphi = SFRC.momentcurvatureSFRC_batch(*[inputs[name] for name in MPHI_INPUTS])
+    results.update({name: Mphi[name] for name in SFRC.MPHI_RESULTS})
+    if all(name in inputs for name in SHEAR_INPUTS):
+        shear = SFRC.shearcap_batch(*[inputs[name] for name in SHEAR_INPUTS], Mphi=Mphi)
+        results.update({name: shear[name] for name in SFRC.SHEAR_RESULTS})
+    size = len(next(iter(inputs.values())))
+    return pd.DataFrame({key: np.broadcast_to(value, size) for key, value in results.items()})
+
+
+def completed_runs(output: Path, n_total: int, block_size: int = 1_000_000) -> np.ndarray:
+    """
+    Returns a mask (run id) that is True for the runs of the 'n_total' runs that
+    are already in the results at 'output' (a CSV file or a directory of Parquet
+    files). The run ids are read in blocks of 'block_size' rows, so only the mask
+    (one byte per run) is kept in memory.
+    """
+    output = Path(output)
+    done = np.zeros(n_total, dtype=bool)
+    if not output.exists():
+        return done
+    if output.is_dir():
+        for part in sorted(output.glob("part-*.parquet")):
+            _mark_done(done, pd.read_parquet(part, columns=["run_id"])["run_id"].to_numpy())
+        return done
+    _drop_incomplete_last_line(output)
+    if output.stat().st_size == 0:
+        return done
+    for block in pd.read_csv(output, usecols=["run_id"], chunksize=block_size):
+        _mark_done(done, block["run_id"].to_numpy())
+    return done
+
+
+def _mark_done(done: np.ndarray, run_ids: np.ndarray) -> None:
+    """
+    Sets 'done' to True for the 'run_ids' that are in the sweep
+    """
+    done[run_ids[(run_ids >= 0) & (run_ids < len(done))]] = True
+
+
+def _drop_incomplete_last_line(filename: Path, block_size: int = 65536) -> None:
+    """
+    Removes a partly written last line, as left behind by an interrupted run.
+    The file is read backwards from the end in blocks of 'block_size' bytes
+    up to the last newline.
+    """
+    with open(filename, "rb+") as file:
+        end = file.seek(0, os.SEEK_END)
+        if end == 0:
+            return
+        file.seek(end - 1)
+        if file.read(1) == b"\n":
+            return
+        position = end
+        while position > 0:
+            start = max(0, position - block_size)
+            file.seek(start)
+            newline = file.read(position - start).rfind(b"\n")
+            if newline >= 0:
+                file.truncate(start + newline + 1)
+                return
+            position = start
+        file.truncate(0)
+
+
+def append_results(results: pd.DataFrame, output: Path, chunk_id: int) -> None:
+    """
+    Writes 'results' to 'output'. A CSV file gets the rows appended,
+    and a directory gets a new Parquet file for the chunk.
+    """
+    output = Path(output)
+    if output.suffix == ".csv":
+        header = not output.exists() or output.stat().st_size == 0
+        results.to_csv(output, mode="a", header=header, index=False)
+    else:
+        output.mkdir(parents=True, exist_ok=True)
+        part = output / f"part-{chunk_id:06d}.parquet"
+        temp = output / f".part-{chunk_id:06d}.parquet.tmp"
+        results.to_parquet(temp, index=False)
+        os.replace(temp, part)
+
+
+def _run_chunk(inputs: dict[str, np.ndarray], start: int) -> pd.DataFrame:
+    """
+    Evaluates a chunk of parameter sets that starts at run id 'start' in a worker
+    """
+    results = evaluate_chunk(inputs)
+    results.insert(0, "run_id", np.arange(start, start + len(results)))
+    return results
+
+
+def run_sweep(params: dict[str, list] | list[dict], output: str,
+              chunk_size: int = 10000, max_workers: Optional[int] = None,
+              resume: bool = True, verbose: bool = False) -> SweepStats:
+    """
+    Runs momentcurvatureSFRC (and shearcap, when V and M are given) for all
+    parameter sets in 'params' and writes the results to 'output'.
+    'params' is either a grid (a dict with a list of values for each input
+    of shearcap) or a list of parameter dicts.
+    The parameter sets are split in chunks of 'chunk_size' that are evaluated
+    as arrays on a pool of 'max_workers' processes (max_workers=1 runs in this
+    process). Each chunk is written as soon as it is done: 'output' ending in
+    ".csv" gets the rows appended, any other 'output' is used as a directory
+    with one Parquet file per chunk.
+    With 'resume', the run ids already in 'output' are not evaluated again, so
+    an interrupted sweep continues where it stopped.
+    With 'verbose', the throughput of each chunk is printed.
+    """
+    output = Path(output)
+    if not resume and output.exists():
+        raise FileExistsError(f"{output} already exists, use resume=True to continue the sweep")
+    n_total = grid_size(params)
+    done = completed_runs(output, n_total) if resume else np.zeros(n_total, dtype=bool)
+    chunks = [(start, min(start + chunk_size, n_total)) for start in range(0, n_total, chunk_size)]
+    chunks = [(idx, start, stop) for idx, (start, stop) in enumerate(chunks)
+              if not done[start:stop].all()]
+    n_skipped = int(done.sum())
+
+    n_evaluated = 0
+    start_time = time.perf_counter()
+
+    def write(chunk_id, results):
+        nonlocal n_evaluated
+        results = results[~done[results["run_id"].to_numpy()]]
+        append_results(results, output, chunk_id)
+        n_evaluated += len(results)
+        if verbose:
+            elapsed = time.perf_counter() - start_time
+            print(f"chunk {chunk_id}: {n_evaluated + n_skipped}/{n_total} done, "
+                  f"{n_evaluated/elapsed:.0f} evaluations/s")
+
+    if max_workers == 1:
+        for chunk_id, start, stop in chunks:
+            write(chunk_id, _run_chunk(grid_chunk(params, start, stop), start))
+    else:
+        # Only a few chunks are queued at a time, so that the memory use
+        # does not grow with the size of the sweep
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            max_pending = 2 * (max_workers or os.cpu_count() or 1)
+            pending = {}
+            for chunk_id, start, stop in chunks:
+                if len(pending) >= max_pending:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        write(pending.pop(future), future.result())
+                future = executor.submit(_run_chunk, grid_chunk(params, start, stop), start)
+                pending[future] = chunk_id
+            for future in wait(pending).done:
+                write(pending[future], future.result())
+
+    return SweepStats(n_total=n_total, n_evaluated=n_evaluated, n_skipped=n_skipped,
+                      elapsed=time.perf_counter() - start_time)
@@ -1,5 +1,8 @@
 import SFRC
 import math
+import itertools
+import numpy as np
+import pandas as pd
 
 def test_momentcurvatureSFRC():
 
@@ -20,4 +23,160 @@ def test_shearcap():
                              M = 48.16, V = 81.08)
     VCSDT = shearcap[0]
 
-    assert math.isclose(VCSDT, 32.08540659227059)
\ No newline at end of file
+    assert math.isclose(VCSDT, 32.08540659227059)
+
+def test_momentcurvatureSFRC_batch():
+    fcs = [18, 23, 28, 33, 38, 43, 50]
+    hs = [100, 500, 700]
+    for h, As in itertools.product(hs, [226, 6000]):
+        batch = SFRC.momentcurvatureSFRC_batch(fc= fcs, daggmax= 16, 
+                                               fy = 400, As= As, 
+                                               rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                                               b = 120, d = 0.87*h, h = h)
+        for idx, fc in enumerate(fcs):
+            outcome = SFRC.momentcurvatureSFRC(fc= fc, daggmax= 16, 
+                                               fy = 400, As= As, 
+                                               rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                                               b = 120, d = 0.87*h, h = h)
+            assert math.isclose(batch["Mcr"][idx], outcome[0][0])
+            assert math.isclose(batch["My"][idx], outcome[0][1])
+            assert math.isclose(batch["Mult"][idx], outcome[0][2])
+            assert math.isclose(batch["phiult"][idx], outcome[1][2])
+            assert math.isclose(batch["k2y"][idx], outcome[3][1])
+            assert math.isclose(batch["k3u"][idx], outcome[3][2])
+
+
+def test_momentcurvatureSFRC_table():
+    data = pd.DataFrame({"fc": [28, 28], "daggmax": [16, 16], "fy": [400, 400], "As": [226, 452], 
+                         "rhof": [1, 1], "Vf": [0.005, 0.005], "df": [0.55, 0.55], "lf": [35, 35], 
+                         "b": [120, 120], "d": [435, 435], "h": [500, 500]})
+    outcome = SFRC.momentcurvatureSFRC_table(data)
+    assert math.isclose(outcome["My"][0], 45.86742947733356)
+    assert outcome["My"][1] > outcome["My"][0]
+
+
+def test_shearcap_batch():
+    Ms = [5, 30, 46.5, 48.16]
+    Vs = [60, 70, 75, 81.08]
+    batch = SFRC.shearcap_batch(fc= 28, daggmax= 16, 
+                                fy = 400, As= 226, phibar = 12, ns = [2, 2, 2, 20], 
+                                rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                                b = 120, d = 435, h = 500, 
+                                M = Ms, V = Vs)
+    for idx, (M, V, ns) in enumerate(zip(Ms, Vs, [2, 2, 2, 20])):
+        outcome = SFRC.shearcap(fc= 28, daggmax= 16, 
+                                fy = 400, As= 226, phibar = 12, ns = ns, 
+                                rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                                b = 120, d = 435, h = 500, 
+                                M = M, V = V)
+        for key, value in zip(SFRC.SHEAR_RESULTS, outcome):
+            assert math.isclose(batch[key][idx], value)
+
+
+def test_SFRCSection():
+    section = SFRC.SFRCSection(fc= 28, daggmax= 16, 
+                               fy = 400, As= 226, phibar = 12, ns = 2, 
+                               rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                               b = 120, d = 435, h = 500)
+    assert math.isclose(section.momentcurvature().My, 45.86742947733356)
+    shearcap = section.shearcap(M = [48.16, 48.16], V = [81.08, 81.08])
+    assert math.isclose(shearcap["VCSDT"][1], 32.08540659227059)
+
+
+def test_shearcap_applicable():
+    # Without fibers the interlock is 165 kN at M = 20 kNm (wb = 0.07 mm)
+    section = SFRC.SFRCSection(fc= 28, daggmax= 16, 
+                               fy = 400, As= 226, phibar = 12, ns = 2, 
+                               rhof = 1, Vf = 0, df = 0.55, lf = 35, 
+                               b = 120, d = 435, h = 500)
+    assert not section.shearcap_applicable(M = 20)
+    assert section.shearcap_applicable(M = 35)
+    assert not section.shearcap_applicable(M = section.Mphi["Mcr"] * 0.9)
+    assert section.shearcap_applicable(M = section.Mphi["Mult"])
+    assert not section.shearcap_applicable(M = section.Mphi["Mult"] * 1.01)
+
+    # A deep section cracks with wb < 0.01 mm, so the interlock goes through the singularity
+    section = SFRC.SFRCSection(fc= 28, daggmax= 16, 
+                               fy = 400, As= 226, phibar = 12, ns = 2, 
+                               rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                               b = 120, d = 935, h = 1000)
+    M = np.linspace(section.Mphi["Mcr"], section.Mphi["Mult"], 20001)
+    _, _, wb = SFRC._crack_width(16, 226, 12, 0.005, 0.55, 35, 120, 935, 1000, M, section.Mphi)
+    Vai = section.shearcap(V = 50, M = M)["Vai"]
+    applicable = section.shearcap_applicable(M)
+    assert wb[0] < 0.01 and Vai[0] < 0
+    # One boundary, at the crack width WB_MIN
+    boundary = np.argmax(applicable)
+    assert applicable[boundary:].all() and not applicable[:boundary].any()
+    assert wb[boundary - 1] < SFRC.WB_MIN <= wb[boundary]
+    # where the 0.01 mm offset adds 10% to the interlock, and the interlock is largest
+    assert math.isclose(wb[boundary] / (wb[boundary] - 0.01), 1.1, rel_tol = 1e-3)
+    assert np.all(Vai[applicable] <= Vai[boundary])
+    assert np.all(Vai[:boundary][Vai[:boundary] > 0] > Vai[boundary])
+
+
+def test_momentcurvature_curve():
+    outcome = SFRC.momentcurvatureSFRC(fc= 28, daggmax= 16, 
+                                       fy = 400, As= 226, 
+                                       rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                                       b = 120, d = 435, h = 500)
+    curve = SFRC.momentcurvature_curve(fc= 28, daggmax= 16, 
+                                       fy = 400, As= 226, 
+                                       rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                                       b = 120, d = 435, h = 500, n_points = 300)
+    assert len(curve["M"]) >= 300
+    # The cracked solution at lambdar1 is a little above the gross-section Mcr
+    assert curve["lambda"][1] == outcome[2][0]
+    assert math.isclose(curve["k"][1], outcome[3][0])
+    assert math.isclose(curve["M"][1], outcome[0][0], rel_tol = 0.1)
+    assert math.isclose(curve["M"][-1], outcome[0][2])
+    assert math.isclose(curve["phi"][-1], outcome[1][2])
+    idx = list(curve["lambda"]).index(outcome[2][1])
+    assert math.isclose(curve["M"][idx], outcome[0][1])
+    assert math.isclose(curve["phi"][idx], outcome[1][1])
+
+
+def test_momentcurvature_curve_continuous():
+    # Steel yield at lambda = 5.7, and concrete yield below (fc = 28) and above (fc = 60) OMEGA
+    for fc in [28, 60]:
+        curve = SFRC.momentcurvature_curve(fc= fc, daggmax= 16, 
+                                           fy = 400, As= 226, 
+                                           rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                                           b = 120, d = 435, h = 500, n_points = 2000)
+        assert np.all(np.diff(curve["phi"]) > 0)
+        assert np.all(np.diff(curve["lambda"]) > 0)
+        # After the linear branch up to cracking
+        assert np.max(np.abs(np.diff(curve["M"][1:]))) < 0.01 * np.max(curve["M"])
+
+
+def test_result_types():
+    outcome = SFRC.momentcurvatureSFRC(fc= 28, daggmax= 16, 
+                                       fy = 400, As= 226, 
+                                       rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                                       b = 120, d = 435, h = 500)
+    result = SFRC.MomentCurvatureResult.from_list(outcome)
+    assert result.My == outcome[0][1]
+    assert result.to_list() == outcome
+    batch = SFRC.momentcurvatureSFRC_batch(fc= [28, 28], daggmax= 16, 
+                                           fy = 400, As= [226, 452], 
+                                           rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                                           b = 120, d = 435, h = 500)
+    assert batch.dtype == SFRC.MPHI_DTYPE
+    assert math.isclose(SFRC.MomentCurvatureResult.from_record(batch[0]).My, result.My)
+    shear = SFRC.shearcap_batch(fc= 28, daggmax= 16, 
+                                fy = 400, As= 226, phibar = 12, ns = 2, 
+                                rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                                b = 120, d = 435, h = 500, 
+                                M = 48.16, V = 81.08)
+    assert shear.dtype == SFRC.SHEAR_DTYPE
+    assert math.isclose(SFRC.ShearResult.from_record(shear).to_list()[0], 32.08540659227059)
+
+
+def test_result_arrays_save(tmp_path):
+    batch = SFRC.momentcurvatureSFRC_batch(fc= [28, 28, 40], daggmax= 16, 
+                                           fy = 400, As= [226, 452, 452], 
+                                           rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                                           b = 120, d = 435, h = 500)
+    np.save(tmp_path / "Mphi.npy", batch)
+    loaded = np.load(tmp_path / "Mphi.npy", mmap_mode="r")
+    assert np.array_equal(loaded["Mult"][1:], batch["Mult"][1:])
@@ -0,0 +1,58 @@
+import beam_batch
+import beams
+import math
+import pytest
+import shutil
+import pandas as pd
+
+
+def test_summarize_beam():
+    roof_beam, continuous_beam = beams.read_beams('eng_module/test_data/beams_bulk.txt')
+    summary = beam_batch.summarize_beam(continuous_beam, add_combos="ACI_31819")
+    assert list(summary["combo"][:4]) == ["D", "L", "LC1", "LC2a"]
+    # Gravity loads on all spans: 1.2D + 1.6L governs everything
+    governing = summary.set_index("combo")["governs"]
+    assert governing["LC2a"] == "max shear; min shear; max moment; min moment; max deflection; min deflection"
+    lc2a = summary.iloc[3]
+    assert math.isclose(lc2a["max_moment"], 1.2*summary["max_moment"][0] + 1.6*summary["max_moment"][1])
+
+    # The live load on the cantilever lifts the backspan, so 1.4D governs one extreme
+    summary = beam_batch.summarize_beam(roof_beam, add_combos="ACI_31819")
+    governing = summary.set_index("combo")["governs"]
+    assert governing["LC1"] == "min moment"
+    assert governing["LC2a"] == "max shear; min shear; max moment; max deflection; min deflection"
+
+
+def test_run_beam_batch(tmp_path):
+    output = tmp_path / "summary.csv"
+    stats = beam_batch.run_beam_batch('eng_module/test_data/beams_bulk.txt', output, max_workers=1)
+    assert stats.n_evaluated == 2
+    summary = pd.read_csv(output)
+    assert list(summary["beam"].unique()) == ["Roof beam", "My new beam"]
+    assert list(summary["combo"][:2]) == ["D", "L"]
+
+    beam_dir = tmp_path / "beams"
+    beam_dir.mkdir()
+    for idx in range(3):
+        shutil.copy('eng_module/test_data/beam_5.txt', beam_dir / f"beam_{idx}.txt")
+    stats = beam_batch.run_beam_batch(beam_dir, tmp_path / "summary", batch_size=2, max_workers=2)
+    assert stats.n_evaluated == 3
+    summary = pd.read_parquet(tmp_path / "summary")
+    assert sorted(summary["source"]) == ["beam_0.txt", "beam_1.txt", "beam_2.txt"]
+    assert all(math.isclose(value, -68.12405, abs_tol=1e-2) for value in summary["min_deflection"])
+
+    # The default case "Live" of the UDL lines of beam_5 is live load "L"
+    stats = beam_batch.run_beam_batch(beam_dir, tmp_path / "combos.csv", add_combos="ACI_31819", max_workers=1)
+    summary = pd.read_csv(tmp_path / "combos.csv", keep_default_na=False)
+    lc2a = summary[summary["combo"] == "LC2a"]
+    assert len(lc2a) == 3
+    assert all(math.isclose(value, 1.6*-68.12405, abs_tol=1e-2) for value in lc2a["min_deflection"])
+    assert (lc2a["governs"].str.contains("min deflection")).all()
+    assert (summary[summary["combo"] == "Live"]["governs"] == "").all()
+
+
+def test_summarize_beam_unknown_case():
+    beam_data = beams.get_structured_beam_data(beams.read_beam_file('eng_module/test_data/beam_5.txt'))
+    beam_data['Loads'][0]['Case'] = "Crane"
+    with pytest.raises(ValueError, match="Crane"):
+        beam_batch.summarize_beam(beam_data, add_combos="ACI_31819")
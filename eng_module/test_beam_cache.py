@@ -0,0 +1,51 @@
+import beam_cache
+import checks
+import SFRC
+import numpy as np
+from eng_module import beams
+
+beam_data = {'Name': 'SFRC-RC beam', 'L': 1200, 'E': 25000, 'Iz': 1.25e9, 'Iy': 1.0,
+             'A': 60000, 'J': 1, 'nu': 1, 'rho': 25, 
+             'Supports': {0: 'P', 1200: 'R'},
+             'Loads': [{'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -100, 
+                        'Location': 400, 'Case': 'Live'}]}
+
+
+def test_beam_hash():
+    same_beam = dict(reversed(list(beam_data.items())))
+    same_beam['L'] = 1200.0
+    other_beam = dict(beam_data, L=1300)
+    assert beam_cache.beam_hash(beam_data) == beam_cache.beam_hash(same_beam)
+    assert beam_cache.beam_hash(beam_data) != beam_cache.beam_hash(other_beam)
+    assert beam_cache.beam_hash(beam_data) != beam_cache.beam_hash(beam_data, {"Factored": {"Live": 1.6}})
+
+
+def test_solve_beam(tmp_path, monkeypatch):
+    cache = beam_cache.BeamCache(tmp_path)
+    results = beam_cache.solve_beam(beam_data, n_points=101, cache=cache)
+    beam_model = beams.build_beam(dict(beam_data))
+    beam_model.analyze()
+    moments = beams.extract_arrays_all_combos(beam_model, "moment", "Mz", 101)
+    assert np.allclose(results.arrays["moment"]["Live"][0], moments["Live"][0])
+    assert "Nodes" not in beam_data
+
+    # A cache hit does not build the model
+    monkeypatch.setattr(beams, "build_beam", None)
+    cached = beam_cache.solve_beam(beam_data, n_points=101, cache=cache)
+    assert np.array_equal(cached.arrays["shear"]["Live"][0], results.arrays["shear"]["Live"][0])
+
+    section = SFRC.SFRCSection(fc= 28, daggmax= 16, 
+                               fy = 400, As= 226, phibar = 12, ns = 2, 
+                               rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                               b = 120, d = 435, h = 500)
+    diagram = checks.shear_capacity_diagram(cached, section, moment_scale=1/1000)
+    assert diagram.VCSDT.shape == (1, 101)
+
+
+def test_evict(tmp_path):
+    cache = beam_cache.BeamCache(tmp_path, max_bytes=0)
+    beam_cache.solve_beam(beam_data, n_points=11, cache=cache)
+    assert cache.size() == 0
+    cache.max_bytes = 10_000_000
+    beam_cache.solve_beam(beam_data, n_points=11, cache=cache)
+    assert cache.get(beam_cache.beam_hash(beam_data, n_points=11)) is not None
@@ -0,0 +1,95 @@
+import beam_solver
+import math
+import numpy as np
+import pytest
+
+beam_data = {'Name': 'SFRC-RC beam', 'L': 6000, 'E': 25000, 'Iz': 1.25e9, 'Iy': 1.0,
+             'A': 60000, 'J': 1, 'nu': 1, 'rho': 25, 
+             'Supports': {1000: 'P', 4500: 'F'},
+             'Loads': [{'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -50, 
+                        'Location': 0, 'Case': 'Live'},
+                       {'Type': 'Point', 'Direction': 'Mz', 'Magnitude': 20000, 
+                        'Location': 5500, 'Case': 'Live'},
+                       {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -3, 'End Magnitude': -3, 
+                        'Start Location': 500, 'End Location': 6000, 'Case': 'Dead'}]}
+
+
+def test_cross_check():
+    report = beam_solver.cross_check(beam_data, n_points=101, repeat=1)
+    assert report["shear_error"] < 1e-9
+    assert report["moment_error"] < 1e-9
+    assert report["deflection_error"] < 1e-9
+
+    continuous_beam = dict(beam_data, L=10000, Supports={0: 'P', 3000: 'R', 7000: 'R', 10000: 'R'})
+    report = beam_solver.cross_check(continuous_beam, n_points=101, repeat=1)
+    assert report["moment_error"] < 1e-9
+
+
+def test_solve_beam():
+    # Simply supported beam with a triangular load: R = wL/6 and wL/3, M = wL**2/(9*sqrt(3))
+    triangle = dict(beam_data, L=3000, Supports={0: 'P', 3000: 'R'}, 
+                    Loads=[{'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': 0, 'End Magnitude': -2, 
+                            'Start Location': 0, 'End Location': 3000, 'Case': 'Dead'}])
+    solution = beam_solver.solve_beam(triangle, combos={"Factored": {"Dead": 1.2}})
+    assert np.allclose(solution.R, [[1000, 2000]])
+    x = 3000 / math.sqrt(3)
+    results = solution.combo_results(np.array([x]))
+    # Sagging moments are negative, as in PyNite
+    assert math.isclose(results["moment"][0][0], -2*3000**2/(9*math.sqrt(3)))
+    assert math.isclose(results["moment"][1][0], -1.2*2*3000**2/(9*math.sqrt(3)))
+    arrays = solution.extract_arrays_all_combos("shear", "Fy", 11)
+    assert list(arrays.keys()) == ["Dead", "Factored"]
+    assert math.isclose(arrays["Dead"][0][1][0], 1000)
+
+    with pytest.raises(ValueError):
+        beam_solver.solve_beam(dict(triangle, Supports={0: 'P'}))
+    with pytest.raises(ValueError, match="outside the beam"):
+        beam_solver.solve_beam(dict(triangle, Supports={0: 'P', 3000: 'R', 3500: 'R'}))
+
+    # The same load given from right to left, and a load of zero length
+    reversed_load = dict(triangle['Loads'][0], **{'Start Magnitude': -2, 'End Magnitude': 0,
+                                                 'Start Location': 3000, 'End Location': 0})
+    solution = beam_solver.solve_beam(dict(triangle, Loads=[reversed_load]))
+    assert np.allclose(solution.R, [[1000, 2000]])
+    with pytest.raises(ValueError):
+        beam_solver.solve_beam(dict(triangle, Loads=[dict(reversed_load, **{'Start Location': 0})]))
+
+
+def test_extrema():
+    overhang = dict(beam_data, Supports={0: 'P', 4000: 'R'}, 
+                    Loads=[{'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -20000, 
+                            'Location': 2000, 'Case': 'Live'},
+                           {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -3, 'End Magnitude': -3, 
+                            'Start Location': 0, 'End Location': 6000, 'Case': 'Dead'}])
+    solution = beam_solver.solve_beam(overhang)
+    moments = solution.extrema("moment")
+    assert moments.combos == ["Live", "Dead"]
+    # Peak under the point load and the hogging moment over the support
+    assert math.isclose(moments.min[0], -20000*4000/4)
+    assert moments.x_min[0] == 2000
+    assert math.isclose(moments.max[1], 3*2000**2/2)
+    assert moments.x_max[1] == 4000
+    # Sagging peak of the dead load at the point of zero shear
+    assert math.isclose(moments.min[1], -3375000)
+    assert math.isclose(moments.x_min[1], 1500)
+
+    shears = solution.extrema("shear")
+    assert math.isclose(shears.min[1], -7500)
+    assert math.isclose(shears.max[1], 6000)
+
+    x = solution.sample_points(n_points=11)
+    assert np.isclose(x, 1500).any() and 2000 in x and len(x) < 40
+
+
+def test_beam_analysis():
+    analysis = beam_solver.BeamAnalysis(beam_data)
+    heavier = dict(beam_data, Loads=[dict(load, Magnitude=-80) if load['Type'] == 'Point' else load
+                                     for load in beam_data['Loads']])
+    solution = analysis.solve(heavier)
+    assert analysis.n_factorizations == 1
+    assert np.allclose(solution.R, beam_solver.solve_beam(heavier).R)
+
+    stiffer = dict(heavier, Iz=2.5e9)
+    solution = analysis.solve(stiffer)
+    assert analysis.n_factorizations == 2
+    assert np.allclose(solution.w0, beam_solver.solve_beam(stiffer).w0)
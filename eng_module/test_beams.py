@@ -1,5 +1,6 @@
 import beams
 import math
+import pytest
 
 
 
@@ -96,6 +97,21 @@ def test_load_beam_model():
     assert math.isclose(res5, -68.12405, abs_tol = 1e-2)
 
 
+def test_add_load_combos():
+    # The UDL lines of beam_5 get the default case "Live", which is live load "L"
+    model5 = beams.load_beam_model('eng_module/test_data/beam_5.txt', add_combos="ACI_31819", prune_combos=True)
+    assert model5.LoadCases == ["Live"]
+    assert model5.LoadCombos["LC2a"].factors == {"Live": 1.6}
+    model5.analyze_linear(check_statics=True)
+    res5 = model5.Members['My new beam'].min_deflection(Direction="dy", combo_name="LC2a")
+    assert math.isclose(res5, 1.6*-68.12405, abs_tol = 1e-2)
+
+    beam_data = beams.get_structured_beam_data(beams.read_beam_file('eng_module/test_data/beam_5.txt'))
+    beam_data['Loads'][0]['Case'] = "Crane"
+    with pytest.raises(ValueError, match="Crane"):
+        beams.add_load_combos(beams.build_beam(beam_data), "ACI_31819")
+
+
 def test_separate_data():
 
     input = ['Roof beam', '4800, 19200, 1000000000', '0, 3000', '100, 500, 4800', '200, 3600, 4800']
@@ -186,3 +202,43 @@ def test_parse_beam_attributes():
     input2 = [4800, 24500, 1200000000, 10]
     assert beams.parse_beam_attributes(input1) == {"L": 20e3, "E": 200e3, "Iz": 6480e6, "Iy": 390e6, "A": 43900, "J": 11900e3, "nu": 0.3, "rho": 1}
     assert beams.parse_beam_attributes(input2) == {"L": 4800, "E": 24500, "Iz": 1200000000, "Iy": 10, "A": 1, "J": 1, "nu": 1, "rho": 1}
+
+
+def test_extract_results():
+
+    model5 = beams.load_beam_model('eng_module/test_data/beam_5.txt')
+    model5.analyze_linear()
+    results = beams.extract_results(model5, 51)
+    assert results.values.shape == (5, 1, 1, 51)
+    moments = beams.extract_arrays_all_combos(model5, "moment", "Mz", 51)
+    assert (results.x[0] == moments["Live"][0][0]).all()
+    assert (results.result("moment", "Live")[0] == moments["Live"][0][1]).all()
+    deflections = beams.extract_arrays_all_combos(model5, "deflection", "dy", 51)
+    assert (results.result("deflection")[0][0] == deflections["Live"][0][1]).all()
+
+
+def test_read_beams(tmp_path):
+
+    beams_data = list(beams.read_beams('eng_module/test_data/beams_bulk.txt'))
+    assert [beam_data['Name'] for beam_data in beams_data] == ["Roof beam", "My new beam"]
+    assert beams_data[0]['Supports'] == {0.0: 'P', 3000.0: 'R'}
+    assert beams_data[0]['Loads'][1] == {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -10000.0, 
+                                         'Location': 4800.0, 'Case': 'L'}
+    assert beams_data[1]['Supports'] == {0.0: 'P', 5000.0: 'P', 11230.0: 'P'}
+
+    beams.write_beams(beams_data, tmp_path / "beams.txt")
+    assert list(beams.read_beams(tmp_path / "beams.txt")) == beams_data
+
+    with open(tmp_path / "wrong.txt", "w") as file:
+        file.write("BEAM: Wrong beam\n4800, 19200, 1e9\n0:P, 3000:R\nPOINT:Fy, -10000, x, case:Live\n")
+    with pytest.raises(ValueError, match="line 4"):
+        list(beams.read_beams(tmp_path / "wrong.txt"))
+
+    # A load line with only the magnitude is a UDL over the whole beam, as in the one-beam format
+    with open(tmp_path / "udl.txt", "w") as file:
+        file.write("BEAM: UDL beam\n4800, 19200, 1e9\n0:P, 3000:R\n-10\n")
+    beam_data, = beams.read_beams(tmp_path / "udl.txt")
+    assert beam_data['Loads'] == [{'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -10.0, 'End Magnitude': -10.0,
+                                   'Start Location': 0.0, 'End Location': 4800.0, 'Case': 'Live'}]
+    single = beams.get_structured_beam_data([["UDL beam"], ["4800", "19200", "1e9"], ["0:P", "3000:R"], ["-10"]])
+    assert single['Loads'] == beam_data['Loads']
@@ -0,0 +1,36 @@
+import checks
+import SFRC
+import math
+from eng_module import beams
+
+
+def test_shear_capacity_diagram():
+    beam_data = {'Name': 'SFRC-RC beam', 'L': 1200, 'E': 25000, 'Iz': 1.25e9, 'Iy': 1.0,
+                 'A': 60000, 'J': 1, 'nu': 1, 'rho': 25, 
+                 'Supports': {0: 'P', 1200: 'R'},
+                 'Loads': [{'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -150, 
+                            'Location': 400, 'Case': 'Live'}]}
+    beam_model = beams.build_beam(beam_data)
+    beam_model.analyze()
+    section = SFRC.SFRCSection(fc= 28, daggmax= 16, 
+                               fy = 400, As= 226, phibar = 12, ns = 2, 
+                               rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                               b = 120, d = 435, h = 500)
+    diagram = checks.shear_capacity_diagram(beam_model, section, n_points=301, moment_scale=1/1000)
+    assert diagram.VCSDT.shape == (1, 301)
+    assert diagram.min_ratio_combo == "Live"
+    assert 300 < diagram.min_ratio_x < 400
+    idx = list(diagram.x).index(diagram.min_ratio_x)
+    shearcap = SFRC.shearcap(fc= 28, daggmax= 16, 
+                             fy = 400, As= 226, phibar = 12, ns = 2, 
+                             rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                             b = 120, d = 435, h = 500, 
+                             M = abs(diagram.M[0][idx]), V = abs(diagram.V[0][idx]))
+    assert math.isclose(diagram.min_ratio, shearcap[0]/abs(diagram.V[0][idx]))
+    assert math.isnan(diagram.VCSDT[0][0])
+    # The zones next to the supports, with high shear and low moment, are not checked
+    assert not diagram.checked[0][0] and math.isnan(diagram.ratio[0][0])
+    assert math.isclose(diagram.max_unchecked_V, 100) and diagram.max_unchecked_V_x == 0
+    regions = diagram.unchecked_regions()
+    assert len(regions) == 2
+    assert regions[0][0] == 0 and regions[0][1] < 400 < regions[1][0] and regions[1][1] == 1200
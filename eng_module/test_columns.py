@@ -1,5 +1,6 @@
 import columns
 import math
+import utils
 
 def test_column_critical_buckling_load():
     column1 = columns.Column(
@@ -68,4 +69,29 @@ def test_run_all_columns():
     assert math.isclose(input[1].demand_capacity_ratio,0.38045493534695746, abs_tol = 1e-3)
 
 
+def test_run_all_columns_streaming(tmp_path):
+    columns.export_steelcolumn_results(
+        columns.run_all_columns('eng_module/test_data/test_column_data.csv'), tmp_path / "all.csv")
+    n_columns = columns.run_all_columns_streaming(
+        'eng_module/test_data/test_column_data.csv', tmp_path / "streamed.csv", chunk_size=1)
+    assert n_columns == len(utils.read_csv_file('eng_module/test_data/test_column_data.csv')) - 1
+    assert (tmp_path / "streamed.csv").read_text() == (tmp_path / "all.csv").read_text()
 
+
+
+
+
+def test_column_batch():
+    steel_columns = columns.convert_csv_data_to_steelcolumns(
+        utils.read_csv_file('eng_module/test_data/test_column_data.csv')[1:], phic=0.9)
+    # A slender column, governed by 0.877 Pe
+    steel_columns.append(columns.SteelColumn(h=12000, A=2000, Ix=4e6, Iy=2e6, kx=2, ky=2, E=200e3, fy=345, phic=0.9))
+    batch = columns.ColumnBatch.from_columns(steel_columns)
+    assert len(batch) == len(steel_columns)
+    resistance = batch.factored_compressive_resistance()
+    crushing = batch.factored_crushing_load()
+    for idx, column in enumerate(steel_columns):
+        assert resistance[idx] == column.factored_compressive_resistance()
+        assert crushing[idx] == column.factored_crushing_load()
+        assert batch.critical_buckling_load("y")[idx] == column.critical_buckling_load("y")
+        assert batch.radius_of_gyration("x")[idx] == column.radius_of_gyration("x")
@@ -0,0 +1,46 @@
+import design
+import math
+import pytest
+
+SECTION = {"fc": 28, "daggmax": 16, "fy": 400, "As": 226, "phibar": 12, "ns": 2, 
+           "rhof": 1, "Vf": 0.005, "df": 0.55, "lf": 35, "b": 120, "d": 435, "h": 500}
+
+
+def test_section_with():
+    section = design.section_with(SECTION, "h", 600)
+    assert section["d"] == 535
+    assert SECTION["h"] == 500
+
+
+def test_minimum_design():
+    result = design.minimum_design(SECTION, "As", Md=60, Vd=45, lower=100, upper=2000)
+    assert result.Mult >= 60
+    assert result.VCSDT >= 45
+    assert result.n_evaluations < 40
+    Mult, VCSDT = design.capacities(design.section_with(SECTION, "As", 0.99*result.value), 60, 45)
+    assert Mult < 60 or VCSDT < 45
+
+
+def test_minimum_design_not_possible():
+    with pytest.raises(ValueError):
+        design.minimum_design(SECTION, "Vf", Md=500, Vd=45, lower=0, upper=0.02)
+
+
+def test_minimum_design_outside_csdt():
+    # At Md = 20 kNm the cracks are too narrow for the CSDT for any Vf, where
+    # the interlock gives VCSDT = 213 kN without fibers
+    Mult, VCSDT = design.capacities(design.section_with(SECTION, "Vf", 0), 20, 100)
+    assert Mult >= 20 and math.isnan(VCSDT)
+    with pytest.raises(ValueError, match="CSDT"):
+        design.minimum_design(SECTION, "Vf", Md=20, Vd=100, lower=0, upper=0.02)
+    # Deeper sections are uncracked at Md = 20 kNm or crack through the singularity
+    for h in [500, 600, 800, 1000]:
+        Mult, VCSDT = design.capacities(design.section_with(SECTION, "h", h), 20, 100)
+        assert math.isnan(VCSDT)
+
+
+def test_capacities_unsolvable_section():
+    # momentcurvatureSFRC raises a math domain error for this section
+    section = dict(SECTION, fc=5, As=1, Vf=0, h=2000, d=1935)
+    Mult, VCSDT = design.capacities(section, 60, 45)
+    assert math.isnan(Mult)
@@ -0,0 +1,34 @@
+import influence
+import beam_solver
+import math
+import numpy as np
+
+beam_data = {'Name': 'SFRC-RC beam', 'L': 10000, 'E': 25000, 'Iz': 1.25e9, 'Iy': 1.0,
+             'A': 60000, 'J': 1, 'nu': 1, 'rho': 25, 
+             'Supports': {0: 'P', 4000: 'R', 10000: 'R'},
+             'Loads': []}
+
+
+def test_influence_lines():
+    positions = np.linspace(0, 10000, 41)
+    lines = influence.influence_lines(beam_data, [2000, 4000], positions)
+    assert lines.moment.shape == (2, 41)
+    assert list(lines.support_x) == [0, 4000, 10000]
+    # Each column is the solution for a unit load at that position
+    load_data = dict(beam_data, Loads=[{'Type': 'Point', 'Direction': 'Fy', 'Magnitude': 1, 
+                                        'Location': positions[7], 'Case': 'Live'}])
+    solution = beam_solver.solve_beam(load_data)
+    results = solution.case_results(np.array([2000, 4000]))
+    assert np.allclose(lines.moment[:, 7], results["moment"][0])
+    assert np.allclose(lines.reactions[:, 7], solution.R[0])
+    assert np.allclose(lines.reactions.sum(axis=0), -1)
+
+
+def test_moving_load():
+    simple_beam = dict(beam_data, Supports={0: 'P', 10000: 'R'})
+    envelope = influence.moving_load(simple_beam, [-100, -100], [0, 2000])
+    # Absolute maximum moment of two equal axles at a distance d: 2P/L*(L/2 - d/4)**2
+    assert math.isclose(envelope.min["moment"].min(), -2*100/10000*(5000 - 500)**2)
+    assert math.isclose(envelope.max["reactions"][0], 180)
+    assert math.isclose(envelope.max["shear"][0], 180)
+    assert envelope.max_position["reactions"][0] == 0
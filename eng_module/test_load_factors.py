@@ -0,0 +1,84 @@
+import load_factors
+import math
+import numpy as np
+
+
+def test_factor_load():
+    assert math.isclose(load_factors.factor_load(D_load=10, D=1.2, R_load=5, R=1.6, E_load=2, E=1.0), 22)
+
+
+def test_combine_loads():
+    combos = load_factors.ACI_31819_COMBOS()
+    factors = load_factors.factor_matrix(combos)
+    assert factors.shape == (13, 7)
+    assert list(factors[10]) == [1.2, 1.0, 0., 0.2, 0., 0., 1.0]
+
+    loads = np.random.default_rng(1).uniform(-100, 100, (1000, 7))
+    combined = load_factors.combine_loads(loads, combos)
+    for idx in [0, 500, 999]:
+        item_loads = dict(zip(load_factors.LOAD_TYPES, loads[idx]))
+        expected = [load_factors.factor_load(**{f"{load_type}_load": load for load_type, load in item_loads.items()}, **combo)
+                    for combo in combos.values()]
+        assert np.allclose(combined.factored[idx], expected)
+        assert math.isclose(combined.max[idx], max(expected))
+        assert combined.combos[combined.min_combo[idx]] == list(combos)[int(np.argmin(expected))]
+
+
+def test_max_factored_load():
+    combos = load_factors.ACI_31819_COMBOS()
+    loads = {"D_load": 100, "R_load": 50}
+    assert math.isclose(load_factors.max_factored_load(loads, combos), 1.2*100 + 1.6*50)
+    assert math.isclose(load_factors.min_factored_load(loads, combos), 0.9*100)
+
+
+def test_envelope():
+    x = np.linspace(0, 1000, 5)
+    results_arrays = {
+        "LC1": [np.array([x, [0., 2., 5., 2., 0.]]), np.array([x, [1., 1., 1., 1., 1.]])],
+        "LC2": [np.array([x, [0., 3., 4., -1., 0.]]), np.array([x, [2., 0., 1., 1., 1.]])],
+    }
+    results_envelope = load_factors.envelope(results_arrays)
+    assert list(results_envelope.max) == [0., 3., 5., 2., 0., 2., 1., 1., 1., 1.]
+    assert list(results_envelope.min) == [0., 2., 4., -1., 0., 1., 0., 1., 1., 1.]
+    assert list(results_envelope.max_combo[:6]) == ["LC1", "LC2", "LC1", "LC1", "LC1", "LC2"]
+    assert list(results_envelope.member) == [0] * 5 + [1] * 5
+
+    x_values, max_values = load_factors.envelope_max(results_arrays)
+    assert list(x_values[:5]) == list(x) and list(max_values) == list(results_envelope.max)
+
+    accumulator = load_factors.EnvelopeAccumulator()
+    for combo_name, result_array in results_arrays.items():
+        accumulator.add(combo_name, result_array)
+    accumulated = accumulator.envelope()
+    assert list(accumulated.min) == list(results_envelope.min)
+    assert list(accumulated.min_combo) == list(results_envelope.min_combo)
+
+
+def test_load_combos():
+    assert load_factors.ACI_31819_COMBOS()["LC2a"] == {"D": 1.2, "L": 1.6, "Lr": 0.5}
+    asce = load_factors.load_combos("ASCE7_16")
+    assert asce["5 -W"] == {"D": 0.9, "W": -1.0}
+    en = load_factors.load_combos("EN1990")
+    assert en["6.10 Gsup + L + psi0 S + psi0 -W"] == {"D": 1.35, "L": 1.5, "S": 0.75, "W": -0.9}
+    assert list(load_factors.load_combos("EN1990", {"D": 0, "L": 0})) == [
+        "6.10 Gsup", "6.10 Gsup + L", "6.10 Ginf", "6.10 Ginf + L"]
+    # Gravity loads on a column
+    assert list(load_factors.load_combos("ACI_31819", {"D": 1, "L": 1})) == ["LC1", "LC2a", "LC5"]
+
+
+def test_prune_combos():
+    rng = np.random.default_rng(2)
+    for code in load_factors.COMBO_CODES:
+        load_signs = {"D": 0, "L": 0, "S": 1, "W": 0}
+        combos = load_factors.load_combos(code)
+        pruned = load_factors.load_combos(code, load_signs)
+        assert len(pruned) < len(combos)
+        # Effects of each load type (point, load type), with a positive effect of "S"
+        effects = np.zeros((2000, len(load_factors.LOAD_TYPES)))
+        for load_type, sign in load_signs.items():
+            load_effects = rng.normal(size=2000)
+            effects[:, load_factors.LOAD_TYPES.index(load_type)] = np.abs(load_effects) if sign else load_effects
+        all_results = load_factors.combine_loads(effects, combos)
+        pruned_results = load_factors.combine_loads(effects, pruned)
+        assert np.allclose(all_results.max, pruned_results.max)
+        assert np.allclose(all_results.min, pruned_results.min)
@@ -0,0 +1,40 @@
+import pattern_loading
+import beam_solver
+import itertools
+import numpy as np
+
+beam_data = {'Name': 'SFRC-RC beam', 'L': 16000, 'E': 25000, 'Iz': 1.25e9, 'Iy': 1.0,
+             'A': 60000, 'J': 1, 'nu': 1, 'rho': 25, 
+             'Supports': {0: 'P', 5000: 'R', 10000: 'R', 15000: 'R'},
+             'Loads': [{'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -3, 'End Magnitude': -3, 
+                        'Start Location': 0, 'End Location': 16000, 'Case': 'D'},
+                       {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -5, 'End Magnitude': -5, 
+                        'Start Location': 0, 'End Location': 16000, 'Case': 'L'},
+                       {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -10000, 
+                        'Location': 7000, 'Case': 'L'}]}
+
+
+def test_beam_spans():
+    assert pattern_loading.beam_spans(beam_data).tolist() == [[0, 5000], [5000, 10000], [10000, 15000], [15000, 16000]]
+
+
+def test_pattern_envelope():
+    factors = {"D": 1.2, "L": 1.6}
+    envelope = pattern_loading.pattern_envelope(beam_data, "L", factors, n_points=161)
+
+    # All 2**4 arrangements of the live load on the spans
+    spans = pattern_loading.beam_spans(beam_data)
+    moments = []
+    for pattern in itertools.product([False, True], repeat=len(spans)):
+        loads = [load for load in beam_data['Loads'] if load['Case'] == 'D']
+        for loaded, (start, end) in zip(pattern, spans):
+            if loaded:
+                loads.append({'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -5, 'End Magnitude': -5, 
+                              'Start Location': start, 'End Location': end, 'Case': 'L'})
+                if start <= 7000 < end:
+                    loads.append(beam_data['Loads'][2])
+        solution = beam_solver.solve_beam(dict(beam_data, Loads=loads), combos={"ULS": factors})
+        moments.append(solution.combo_results(envelope.x)["moment"][-1])
+    assert np.allclose(envelope.max["moment"], np.max(moments, axis=0), atol=1e-3)
+    assert np.allclose(envelope.min["moment"], np.min(moments, axis=0), atol=1e-3)
+    assert len(envelope.governing_patterns) < 2**len(spans)
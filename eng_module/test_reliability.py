@@ -0,0 +1,65 @@
+import reliability
+import math
+import numpy as np
+import pytest
+
+SECTION = {"fc": 28, "daggmax": 16, "fy": 400, "As": 226, "phibar": 12, "ns": 2, 
+           "rhof": 1, "Vf": 0.005, "df": 0.55, "lf": 35, "b": 120, "d": 435, "h": 500}
+
+
+def test_random_variable_sample():
+    rng = np.random.default_rng(1)
+    samples = reliability.RandomVariable("lognormal", 28, 0.1).sample(rng, 200_000)
+    assert math.isclose(samples.mean(), 28, rel_tol = 1e-2)
+    assert math.isclose(samples.std()/samples.mean(), 0.1, rel_tol = 2e-2)
+    samples = reliability.RandomVariable("gumbel", 20, 0.2).sample(rng, 200_000)
+    assert math.isclose(samples.mean(), 20, rel_tol = 1e-2)
+
+
+def test_wilson_interval():
+    lower, upper = reliability.wilson_interval(10, 1000)
+    assert lower < 0.01 < upper
+    assert math.isclose(reliability.reliability_index(0.5), 0, abs_tol = 1e-12)
+
+
+def test_monte_carlo_shearcap():
+    random_variables = {"fc": reliability.RandomVariable("lognormal", 28, 0.15),
+                        "Vf": reliability.RandomVariable("lognormal", 0.005, 0.1)}
+    # M = 36 kNm on average: inside the range of the CSDT (cracks of at least WB_MIN
+    # from about 27 kNm, My = 45.9 kNm)
+    demand = reliability.RandomVariable("gumbel", 18, 0.1)
+    results1 = reliability.monte_carlo_shearcap(SECTION, random_variables, demand, shear_span=2000, 
+                                                n_samples=50_000, chunk_size=10_000, seed=3)
+    results2 = reliability.monte_carlo_shearcap(SECTION, random_variables, demand, shear_span=2000, 
+                                                n_samples=50_000, chunk_size=10_000, seed=3)
+    assert results1 == results2
+    assert results1.n_unchecked < 0.1 * results1.n_samples
+    assert results1.fraction_checked > 0.9 and results1.n_valid > 0
+    assert results1.n_invalid == 0
+    assert 0 < results1.pf < 0.01
+    assert results1.pf_ci[0] <= results1.pf <= results1.pf_ci[1]
+    assert results1.beta_ci[0] <= results1.beta <= results1.beta_ci[1]
+    # The model uncertainty (CoV 0.2) and the concrete and fibers add up to about 0.2 - 0.25
+    assert 0.2 < results1.capacity_cov < 0.3
+    assert 40 < results1.capacity_mean < 60
+    assert 1.2 < results1.gamma_R < 1.5
+
+
+def test_monte_carlo_shearcap_uncracked():
+    # M = 7.5 kNm < Mcr: the CSDT does not apply to any sample
+    demand = reliability.RandomVariable("normal", 5, 0.05)
+    with pytest.raises(ValueError):
+        reliability.monte_carlo_shearcap(SECTION, {}, demand, shear_span=1500, n_samples=1000)
+
+
+def test_monte_carlo_shearcap_below_range_at_mean():
+    # M = 24 kNm on average, where the cracks are too narrow for the CSDT: only
+    # the larger demands are checked, and there are no capacity statistics
+    demand = reliability.RandomVariable("gumbel", 12, 0.3)
+    results = reliability.monte_carlo_shearcap(SECTION, {}, demand, shear_span=2000, 
+                                               n_samples=20_000, chunk_size=5_000)
+    assert results.n_valid == 0
+    assert 0 < results.fraction_checked < 0.5
+    assert math.isclose(results.fraction_checked, 1 - results.n_unchecked / results.n_samples)
+    assert 0 < results.pf < 0.01
+    assert math.isnan(results.capacity_mean) and math.isnan(results.gamma_R)
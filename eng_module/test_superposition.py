@@ -0,0 +1,36 @@
+import superposition
+import load_factors
+import numpy as np
+from eng_module import beams
+
+beam_data = {'Name': 'SFRC-RC beam', 'L': 8000, 'E': 25000, 'Iz': 1.25e9, 'Iy': 1.0,
+             'A': 60000, 'J': 1, 'nu': 1, 'rho': 25, 
+             'Supports': {0: 'P', 5000: 'R'},
+             'Loads': [{'Type': 'Point', 'Direction': 'Fy', 'Magnitude': -50, 
+                        'Location': 2000, 'Case': 'L'},
+                       {'Type': 'Dist', 'Direction': 'Fy', 'Start Magnitude': -3, 'End Magnitude': -3, 
+                        'Start Location': 0, 'End Location': 8000, 'Case': 'D'},
+                       {'Type': 'Point', 'Direction': 'Fy', 'Magnitude': 10, 
+                        'Location': 8000, 'Case': 'W'}]}
+
+
+def test_combo_matrix():
+    factors = superposition.combo_matrix({"LC1": {"D": 1.4}, "LC2a": {"D": 1.2, "L": 1.6, "Lr": 0.5}}, ["D", "L"])
+    assert np.array_equal(factors, [[1.4, 0], [1.2, 1.6]])
+
+
+def test_load_case_superposition():
+    combos = load_factors.ACI_31819_COMBOS()
+    beam_model = beams.build_beam(dict(beam_data))
+    for combo_name, combo_factors in combos.items():
+        beam_model.add_load_combo(combo_name, combo_factors)
+    beam_model.analyze()
+    moments = beams.extract_arrays_all_combos(beam_model, "moment", "Mz", 101)
+
+    native = superposition.solve_load_cases(beam_data, n_points=101)
+    pynite = superposition.load_case_results(beam_model, n_points=101)
+    assert pynite.cases == ["L", "D", "W"]
+    for case_results in [native, pynite]:
+        superposed = case_results.extract_arrays_all_combos(combos, "moment")
+        for combo_name in combos:
+            assert np.allclose(superposed[combo_name][0], moments[combo_name][0], atol=1e-3)
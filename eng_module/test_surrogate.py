@@ -0,0 +1,60 @@
+import surrogate
+import SFRC
+import math
+import numpy as np
+import pytest
+
+FIXED = {"fc": 28, "daggmax": 16, "fy": 400, "phibar": 12, "ns": 2, 
+         "rhof": 1, "df": 0.55, "lf": 35, "b": 120, "d": 435, "h": 500, "V": 81.08}
+AXES = {"As": np.linspace(200, 800, 13), "Vf": np.linspace(0, 0.01, 11), "M": np.linspace(40, 120, 17)}
+
+
+def test_shear_surrogate_query():
+    table = surrogate.ShearSurrogate.build(AXES, FIXED)
+    VCSDT, exact = table.query(max_error=1.0, As=[226, 300, 1000], Vf=0.005, M=[45, 70, 70])
+    shearcap = SFRC.shearcap(fc= 28, daggmax= 16, 
+                             fy = 400, As= 226, phibar = 12, ns = 2, 
+                             rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                             b = 120, d = 435, h = 500, 
+                             M = 45, V = 81.08)
+    assert math.isclose(VCSDT[0], shearcap[0], abs_tol = 1.0)
+    # Outside the grid, and with cracks too narrow for the CSDT
+    assert exact[2] and math.isnan(VCSDT[2])
+    inputs = {key: value for key, value in FIXED.items() if key != "V"}
+    assert not SFRC.shearcap_applicable(**inputs | {"As": 1000, "Vf": 0.005, "M": 70})
+    assert table.applicable.shape == table.table.shape
+    assert not table.applicable.all() and table.applicable.any()
+    assert np.array_equal(np.isnan(table.table), ~table.applicable)
+
+
+def test_shear_surrogate_error_estimate():
+    table = surrogate.ShearSurrogate.build(AXES, FIXED)
+    rng = np.random.default_rng(0)
+    As = rng.uniform(200, 800, 2000)
+    Vf = rng.uniform(0, 0.01, 2000)
+    M = rng.uniform(40, 120, 2000)
+    VCSDT, exact = table.query(max_error=0.5, As=As, Vf=Vf, M=M)
+    reference = SFRC.shearcap_batch(**FIXED | {"As": As, "Vf": Vf, "M": M})["VCSDT"]
+    inputs = {key: value for key, value in FIXED.items() if key != "V"}
+    applicable = SFRC.shearcap_applicable(**inputs | {"As": As, "Vf": Vf, "M": M})
+    # The cells that touch a grid point outside the range of the CSDT are evaluated exactly
+    assert np.array_equal(np.isnan(VCSDT), ~applicable)
+    assert np.all(np.abs(VCSDT - reference)[applicable] <= 0.5)
+    assert np.all(exact[~applicable])
+
+
+def test_shear_surrogate_axes():
+    with pytest.raises(ValueError, match="Vf"):
+        surrogate.ShearSurrogate.build(AXES | {"Vf": [0.005]}, FIXED)
+    with pytest.raises(ValueError, match="M"):
+        surrogate.ShearSurrogate.build(AXES | {"M": [40, 80, 60]}, FIXED)
+
+
+def test_shear_surrogate_save_load(tmp_path):
+    table = surrogate.ShearSurrogate.build(AXES, FIXED)
+    table.save(tmp_path / "table.npz")
+    loaded = surrogate.ShearSurrogate.load(tmp_path / "table.npz")
+    assert list(loaded.axes) == ["As", "Vf", "M"]
+    assert loaded.fixed == FIXED
+    assert np.array_equal(loaded.table, table.table, equal_nan=True)
+    assert np.array_equal(loaded.applicable, table.applicable)
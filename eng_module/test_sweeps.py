@@ -0,0 +1,72 @@
+import sweeps
+import SFRC
+import math
+import pandas as pd
+
+GRID = {"fc": [28, 40], "daggmax": [16], "fy": [400], "As": [226, 452, 678], 
+        "phibar": [12], "ns": [2], "rhof": [1], "Vf": [0.0, 0.005, 0.01], 
+        "df": [0.55], "lf": [35, 60], "b": [120], "d": [435], "h": [500], 
+        "V": [81.08], "M": [48.16]}
+
+
+def test_grid_chunk():
+    assert sweeps.grid_size(GRID) == 36
+    chunk = sweeps.grid_chunk(GRID, 34, 36)
+    assert list(chunk["fc"]) == [40, 40]
+    assert list(chunk["lf"]) == [35, 60]
+    assert list(chunk["Vf"]) == [0.01, 0.01]
+
+
+def test_run_sweep(tmp_path):
+    output = tmp_path / "sweep.csv"
+    stats = sweeps.run_sweep(GRID, output, chunk_size=10, max_workers=1)
+    assert stats.n_evaluated == 36
+    results = pd.read_csv(output)
+    assert list(results["run_id"]) == list(range(36))
+    shearcap = SFRC.shearcap(fc= 28, daggmax= 16, 
+                             fy = 400, As= 226, phibar = 12, ns = 2, 
+                             rhof = 1, Vf = 0.005, df = 0.55, lf = 35, 
+                             b = 120, d = 435, h = 500, 
+                             M = 48.16, V = 81.08)
+    assert math.isclose(results["VCSDT"][2], shearcap[0])
+
+
+def test_run_sweep_resume(tmp_path):
+    output = tmp_path / "sweep.csv"
+    sweeps.run_sweep(GRID, output, chunk_size=10, max_workers=1)
+    lines = output.read_text().splitlines(keepends=True)
+    # An interrupted run: the last chunk is missing and a row is cut off
+    output.write_text("".join(lines[:25]) + lines[25][:10])
+    stats = sweeps.run_sweep(GRID, output, chunk_size=10, max_workers=2)
+    assert stats.n_skipped == 24
+    assert stats.n_evaluated == 12
+    results = pd.read_csv(output)
+    assert sorted(results["run_id"]) == list(range(36))
+
+
+def test_run_sweep_parquet(tmp_path):
+    output = tmp_path / "sweep"
+    sweeps.run_sweep(GRID, output, chunk_size=10, max_workers=2)
+    results = pd.read_parquet(output)
+    assert sorted(results["run_id"]) == list(range(36))
+
+
+def test_drop_incomplete_last_line(tmp_path):
+    filename = tmp_path / "sweep.csv"
+    lines = "".join(f"{idx},{idx*2}\n" for idx in range(1000))
+    filename.write_text(lines + "1000,20")
+    sweeps._drop_incomplete_last_line(filename, block_size=16)
+    assert filename.read_text() == lines
+    sweeps._drop_incomplete_last_line(filename, block_size=16)
+    assert filename.read_text() == lines
+    filename.write_text("run_id,VCSDT")
+    sweeps._drop_incomplete_last_line(filename, block_size=4)
+    assert filename.read_text() == ""
+
+
+def test_completed_runs(tmp_path):
+    output = tmp_path / "sweep.csv"
+    sweeps.run_sweep(GRID, output, chunk_size=10, max_workers=1)
+    done = sweeps.completed_runs(output, 40, block_size=7)
+    assert done.dtype == bool
+    assert done[:36].all() and not done[36:].any()
@@ -0,0 +1,30 @@
+import validation
+import SFRC
+import json
+import math
+
+
+def test_run_benchmark(tmp_path):
+    report = validation.run_benchmark('eng_module/test_data/test_sfrc_shear_db.csv', 
+                                      report_filename=tmp_path / "report.json")
+    shearcap = SFRC.shearcap(fc= 25, daggmax= 16, 
+                             fy = 420, As= 402, phibar = 16, ns = 2, 
+                             rhof = 1, Vf = 0, df = 0.55, lf = 35, 
+                             b = 200, d = 360, h = 400, 
+                             M = 40*1200/1000, V = 40)
+    assert report["n_specimens"] == 6
+    # The moment at failure of S1 - S3 is above Mult, outside the range of the CSDT
+    assert report["n_valid"] == 3
+    assert report["unchecked"] == ["S1", "S2", "S3"]
+    assert report["invalid"] == []
+    assert report["min"] <= 40/shearcap[0] <= report["max"]
+    assert report["evaluations_per_second"] > 0
+    with open(tmp_path / "report.json") as file:
+        assert json.load(file)["mean"] == report["mean"]
+
+
+def test_check_regression():
+    baseline = {"mean": 1.10, "cov": 0.20, "evaluations_per_second": 1000}
+    assert validation.check_regression(baseline, baseline) == []
+    report = {"mean": 1.20, "cov": 0.20, "evaluations_per_second": 100}
+    assert len(validation.check_regression(report, baseline)) == 2
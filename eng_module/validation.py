@@ -0,0 +1,117 @@
+import json
+import time
+from typing import Optional
+import numpy as np
+import pandas as pd
+from eng_module import SFRC
+
+SPECIMEN_COLUMNS = ["fc", "daggmax", "fy", "As", "phibar", "ns", "rhof", "Vf",
+                    "df", "lf", "b", "d", "h", "a", "Vtest"]
+PERCENTILES = [5, 50, 95]
+
+
+def read_specimens(filename: str) -> pd.DataFrame:
+    """
+    Returns the test specimens in the CSV file at 'filename'. The file has a
+    column for each of the inputs of shearcap (without V and M), the shear
+    span 'a' (mm) and the shear force at failure 'Vtest' (kN).
+    """
+    specimens = pd.read_csv(filename)
+    missing = [column for column in SPECIMEN_COLUMNS if column not in specimens.columns]
+    if missing:
+        raise KeyError(f"The specimen file {filename} is missing the columns {missing}")
+    return specimens
+
+
+def _specimen_inputs(specimens: pd.DataFrame) -> tuple[dict[str, np.ndarray], np.ndarray, np.ndarray]:
+    """
+    Returns the section inputs of shearcap of all 'specimens', and the sectional
+    forces at failure: V = Vtest and M = Vtest*a/1000
+    """
+    inputs = {column: specimens[column].to_numpy(dtype=float) for column in SPECIMEN_COLUMNS}
+    V = inputs.pop("Vtest")
+    M = V * inputs.pop("a") / 1000
+    return inputs, V, M
+
+
+def predict(specimens: pd.DataFrame) -> np.ndarray:
+    """
+    Returns the shear capacity VCSDT (kN) of all 'specimens', evaluated in one
+    batch at the sectional forces at failure: V = Vtest and M = Vtest*a/1000
+    """
+    inputs, V, M = _specimen_inputs(specimens)
+    return SFRC.shearcap_batch(**inputs, V=V, M=M)["VCSDT"]
+
+
+def applicable(specimens: pd.DataFrame) -> np.ndarray:
+    """
+    Returns True for the 'specimens' to which the CSDT applies at the moment
+    at failure (see SFRC.shearcap_applicable)
+    """
+    inputs, _, M = _specimen_inputs(specimens)
+    return SFRC.shearcap_applicable(**inputs, M=M)
+
+
+def run_benchmark(filename: str, report_filename: Optional[str] = None, repeat: int = 3) -> dict:
+    """
+    Runs the CSDT model (SFRC.shearcap) on the test specimens in 'filename' and
+    returns a report with the statistics of the tested/predicted ratio (mean,
+    standard deviation, COV, minimum, maximum and percentiles) and the
+    wall-clock time and evaluations per second (best of 'repeat' runs).
+    Specimens outside the range of the CSDT (see applicable) are not part of
+    the statistics and are listed under "unchecked", as are the specimens with
+    a prediction that is not a positive number, which are listed under "invalid".
+    Raises a ValueError when no specimen is left for the statistics.
+    When 'report_filename' is given, the report is also written there as JSON.
+    """
+    specimens = read_specimens(filename)
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        predicted = predict(specimens)
+        timings.append(time.perf_counter() - start)
+    elapsed = min(timings)
+
+    checked = applicable(specimens)
+    valid = checked & np.isfinite(predicted) & (predicted > 0)
+    if not valid.any():
+        raise ValueError(f"The CSDT does not give a prediction for any of the specimens in {filename}")
+    ratio = specimens["Vtest"].to_numpy(dtype=float)[valid] / predicted[valid]
+    names = specimens["Specimen"] if "Specimen" in specimens.columns else specimens.index
+    report = {
+        "n_specimens": len(specimens),
+        "n_valid": int(valid.sum()),
+        "unchecked": [str(name) for name in np.asarray(names)[~checked]],
+        "invalid": [str(name) for name in np.asarray(names)[checked & ~valid]],
+        "mean": float(np.mean(ratio)),
+        "std": float(np.std(ratio, ddof=1)),
+        "cov": float(np.std(ratio, ddof=1) / np.mean(ratio)),
+        "min": float(np.min(ratio)),
+        "max": float(np.max(ratio)),
+        "percentiles": {str(p): float(value) for p, value in zip(PERCENTILES, np.percentile(ratio, PERCENTILES))},
+        "elapsed": elapsed,
+        "evaluations_per_second": len(specimens) / elapsed,
+    }
+    if report_filename is not None:
+        with open(report_filename, "w") as file:
+            json.dump(report, file, indent=2)
+    return report
+
+
+def check_regression(report: dict, baseline: dict, max_mean_change: float = 0.01,
+                     max_cov_change: float = 0.01, min_speed_ratio: float = 0.5) -> list[str]:
+    """
+    Compares a benchmark 'report' with a 'baseline' report and returns a list
+    of the regressions found (an empty list when there are none): a change of the
+    mean or COV of the tested/predicted ratio by more than 'max_mean_change' or
+    'max_cov_change', or a throughput below 'min_speed_ratio' times the baseline
+    """
+    regressions = []
+    if abs(report["mean"] - baseline["mean"]) > max_mean_change:
+        regressions.append(f"mean changed from {baseline['mean']:.3f} to {report['mean']:.3f}")
+    if abs(report["cov"] - baseline["cov"]) > max_cov_change:
+        regressions.append(f"COV changed from {baseline['cov']:.3f} to {report['cov']:.3f}")
+    if report["evaluations_per_second"] < min_speed_ratio * baseline["evaluations_per_second"]:
+        regressions.append(f"throughput dropped from {baseline['evaluations_per_second']:.0f} "
+                           f"to {report['evaluations_per_second']:.0f} evaluations/s")
+    return regressions